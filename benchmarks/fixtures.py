@@ -0,0 +1,79 @@
+# --- BENCHMARK FIXTURES ---
+# Shared by the benchmark scripts: an offscreen Qt environment, the browser module loaded from
+# z-orbit.py, and a local HTTP server so no measurement depends on the network.
+import os
+import sys
+import time
+import threading
+import importlib.util
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("QTWEBENGINE_CHROMIUM_FLAGS", "--disable-gpu")
+
+from PyQt6.QtCore import QEventLoop, QTimer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAGE = """<html><head><title>Fixture {number}</title>
+<style>body {{ font-family: sans-serif; max-width: 800px; margin: auto; }} .card {{ border: 1px solid #ccc; padding: 8px; }}</style>
+</head><body><h1>Fixture page {number}</h1>{cards}<a href="/page/{next}">Next</a></body></html>"""
+CARD = '<div class="card"><h2>Section {index}</h2><p>{text}</p><img src="/pixel.gif" alt=""></div>'
+PIXEL = b"GIF89a\x01\x00\x01\x00\x80\x00\x00\x00\x00\x00\xff\xff\xff!\xf9\x04\x01\x00\x00\x00\x00,\x00\x00\x00\x00\x01\x00\x01\x00\x00\x02\x02D\x01\x00;"
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    # /page/<n> is a styled article of 20 sections linking to page n + 1
+    def do_GET(self):
+        if self.path == "/pixel.gif":
+            self.reply(PIXEL, "image/gif")
+            return
+        number = int(self.path.rsplit("/", 1)[-1]) if self.path.rsplit("/", 1)[-1].isdigit() else 0
+        cards = "".join(CARD.format(index=index, text="Lorem ipsum dolor sit amet. " * 20) for index in range(20))
+        self.reply(PAGE.format(number=number, next=number + 1, cards=cards).encode("utf-8"), "text/html; charset=utf-8")
+
+    def reply(self, body, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def start_fixture_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+def load_browser():
+    # z-orbit.py isn't importable by name; its __main__ block is skipped, so the schemes it
+    # registers there are registered here instead (before the caller creates QApplication).
+    # Its directory goes on the path for the modules next to it, as when it runs as a script
+    if ROOT not in sys.path: sys.path.insert(0, ROOT)
+    spec = importlib.util.spec_from_file_location("zorbit", os.path.join(ROOT, "z-orbit.py"))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["zorbit"] = module
+    spec.loader.exec_module(module)
+    module.InternalSchemeHandler.register_scheme()
+    module.HybridSchemeHandler.register_scheme()
+    return module
+
+def wait(ms):
+    loop = QEventLoop()
+    QTimer.singleShot(ms, loop.quit)
+    loop.exec()
+
+def wait_for_signal(signal, timeout_ms, accept=lambda *args: True):
+    # perf_counter() at the moment an accepted emission arrived, or None on timeout
+    loop = QEventLoop()
+    arrived = []
+    def on_signal(*args):
+        if not arrived and accept(*args):
+            arrived.append(time.perf_counter())
+            loop.quit()
+    signal.connect(on_signal)
+    QTimer.singleShot(timeout_ms, loop.quit)
+    loop.exec()
+    signal.disconnect(on_signal)
+    return arrived[0] if arrived else None
@@ -0,0 +1,248 @@
+# --- MEMORY REGRESSION BENCHMARK ---
+# Boots Z-Orbit offscreen against a local fixture server, then opens and closes thousands of tabs
+# across every engine, flips engines inside tabs and opens/closes incognito windows, sampling RSS,
+# live Qt objects and thread counts. Whatever a closed tab or window owned has to be gone again, so
+# growth past the budgets in memory_baseline.json fails the run (exit code 1). It also reports what
+# several incognito windows open at once cost; they must share a single off-the-record profile.
+#
+#   python benchmarks/memory_benchmark.py [--tabs 2000] [--incognito 40] [--open-incognito 5] [--json results.json]
+#   python benchmarks/memory_benchmark.py --update-baseline    # record a new baseline from this run
+#
+# Browser data goes to Qt's test-mode locations, never the real profile. Settings are read as-is,
+# so run it with default preferences for comparable numbers.
+import os
+import sys
+import gc
+import json
+import math
+import time
+import argparse
+import threading
+
+from fixtures import start_fixture_server, load_browser, wait
+from PyQt6 import sip
+from PyQt6.QtCore import QObject, QStandardPaths, QCoreApplication, QEvent
+from PyQt6.QtWidgets import QApplication
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "memory_baseline.json")
+TRACKED_CLASSES = ["ZOrbitWindow", "EngineTab", "ChromiumView", "LiteOrbitView", "LiteOrbitWorker",
+                   "SecurityManager", "PageRequestFilter", "QWebEngineProfile"]
+WARMUP_TABS = 30 # One-time allocations (spare pool, caches, the first renderer) happen before the baseline sample
+BATCH_SIZE = 10
+
+class MemoryBenchmark:
+    def __init__(self, browser, base_url, settle_ms):
+        self.browser = browser
+        self.base_url = base_url
+        self.settle_ms = settle_ms
+        self.pages = 0
+
+    def settle(self, timeout=20.0):
+        # Lets pending fetches finish and deleteLater() run, so only real leaks remain
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            wait(self.settle_ms)
+            QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+            gc.collect()
+            if not any(worker.isRunning() for worker in self.live_instances(self.browser.LiteOrbitWorker)): break
+
+    @staticmethod
+    def live_instances(cls):
+        return [obj for obj in gc.get_objects() if isinstance(obj, cls) and not sip.isdeleted(obj)]
+
+    def thread_count(self):
+        psutil = self.browser.psutil
+        if psutil: return psutil.Process().num_threads()
+        try:
+            with open("/proc/self/status") as status:
+                for line in status:
+                    if line.startswith("Threads:"): return int(line.split()[1])
+        except OSError:
+            pass
+        return threading.active_count()
+
+    def renderer_rss(self):
+        # WebEngine renderers are child processes; only measurable with psutil
+        psutil = self.browser.psutil
+        if not psutil: return 0
+        total = 0
+        for child in psutil.Process().children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except psutil.Error:
+                pass
+        return total
+
+    def snapshot(self):
+        self.settle()
+        objects = {name: len(self.live_instances(getattr(self.browser, name))) for name in TRACKED_CLASSES}
+        objects["QObject wrappers"] = len(self.live_instances(QObject))
+        return {"rss": self.browser.ProcessProbe.rss_bytes(os.getpid()), "renderer_rss": self.renderer_rss(),
+                "threads": self.thread_count(), "widgets": len(QApplication.allWidgets()), "objects": objects}
+
+    def next_url(self):
+        self.pages += 1
+        return f"{self.base_url}/page/{self.pages}"
+
+    def open_window(self, incognito=False):
+        window = self.browser.ZOrbitWindow(incognito=incognito)
+        window.get_start_url = self.next_url # Keeps the first tab and new tabs off the network
+        window.show()
+        wait(self.settle_ms)
+        return window
+
+    def churn_tabs(self, window, count):
+        engines = self.browser.ENGINES
+        opened = 0
+        while opened < count:
+            tabs = []
+            for offset in range(min(BATCH_SIZE, count - opened)):
+                # New tabs open in the selected engine; signals are blocked so the current tab isn't switched too
+                window.engine_selector.blockSignals(True)
+                window.engine_selector.setCurrentIndex((opened + offset) % len(engines))
+                window.engine_selector.blockSignals(False)
+                tabs.append(window.add_new_tab(self.next_url()))
+            wait(self.settle_ms)
+            # Every other tab flips to the next engine, so closing it has to free two engine views
+            for tab in tabs[::2]:
+                window.tab_manager.setCurrentWidget(tab)
+                tab.show_engine(engines[(engines.index(tab.engine) + 1) % len(engines)])
+            wait(self.settle_ms)
+            for tab in tabs:
+                window.remove_tab(window.tab_manager.indexOf(tab))
+            opened += len(tabs)
+
+    def churn_incognito(self, count):
+        for _ in range(count):
+            window = self.open_window(incognito=True)
+            for _ in range(2):
+                window.add_new_tab(self.next_url())
+            wait(self.settle_ms)
+            window.close()
+            wait(self.settle_ms)
+
+    def off_the_record_profiles(self):
+        return len([profile for profile in self.live_instances(self.browser.QWebEngineProfile) if profile.isOffTheRecord()])
+
+    def measure_open_incognito(self, count):
+        # Memory of incognito windows open side by side, each with a loaded Chromium tab
+        before = self.snapshot()
+        windows = []
+        for _ in range(count):
+            window = self.open_window(incognito=True)
+            window.engine_selector.blockSignals(True)
+            window.engine_selector.setCurrentIndex(self.browser.ENGINES.index("Chromium"))
+            window.engine_selector.blockSignals(False)
+            window.add_new_tab(self.next_url())
+            windows.append(window)
+        wait(self.settle_ms * 4)
+        during = self.snapshot()
+        during["profiles"] = self.off_the_record_profiles()
+        for window in windows:
+            window.close()
+        after = self.snapshot()
+        after["profiles"] = self.off_the_record_profiles()
+        return {"windows": count, "profiles_open": during["profiles"], "profiles_after": after["profiles"],
+                "rss_mb": (during["rss"] - before["rss"]) / (1024 * 1024),
+                "renderer_rss_mb": (during["renderer_rss"] - before["renderer_rss"]) / (1024 * 1024),
+                "released_mb": (during["rss"] + during["renderer_rss"] - after["rss"] - after["renderer_rss"]) / (1024 * 1024)}
+
+    def run(self, tabs, incognito, open_incognito):
+        window = self.open_window()
+        self.churn_tabs(window, WARMUP_TABS)
+        self.churn_incognito(1)
+        samples = {"baseline": self.snapshot()}
+        started = time.perf_counter()
+        self.churn_tabs(window, tabs)
+        samples["after tabs"] = self.snapshot()
+        self.churn_incognito(incognito)
+        open_incognito = self.measure_open_incognito(open_incognito) if open_incognito else None
+        samples["after incognito"] = self.snapshot()
+        duration = time.perf_counter() - started
+        window.close()
+        return samples, open_incognito, duration
+
+def growth(samples):
+    first, last = samples["baseline"], samples["after incognito"]
+    return {"rss_mb": (last["rss"] - first["rss"]) / (1024 * 1024),
+            "renderer_rss_mb": (last["renderer_rss"] - first["renderer_rss"]) / (1024 * 1024),
+            "threads": last["threads"] - first["threads"], "widgets": last["widgets"] - first["widgets"],
+            "objects": {name: last["objects"][name] - first["objects"][name] for name in first["objects"]}}
+
+def check(measured, budget, open_incognito):
+    failures = []
+    if open_incognito and open_incognito["profiles_open"] > 1:
+        failures.append(f"{open_incognito['windows']} incognito windows used {open_incognito['profiles_open']} off-the-record profiles")
+    if open_incognito and open_incognito["profiles_after"]:
+        failures.append(f"{open_incognito['profiles_after']} off-the-record profiles outlived their windows")
+    for key in ("rss_mb", "threads", "widgets"):
+        if measured[key] > budget[key]:
+            failures.append(f"{key} grew by {measured[key]:.1f} (budget {budget[key]})")
+    for name, allowed in budget["objects"].items():
+        if measured["objects"].get(name, 0) > allowed:
+            failures.append(f"{measured['objects'][name]} {name} leaked (budget {allowed})")
+    return failures
+
+def budget_from(measured):
+    # Object counts must come back exactly; RSS and threads get headroom for allocator and pool noise
+    return {"rss_mb": math.ceil(max(measured["rss_mb"], 0) * 1.5) + 32, "threads": max(measured["threads"], 0) + 4,
+            "widgets": max(measured["widgets"], 0) + 8,
+            "objects": {name: max(count, 0) for name, count in measured["objects"].items() if name != "QObject wrappers"}}
+
+def print_report(samples, measured, open_incognito, duration):
+    print(f"Z-Orbit memory benchmark ({duration:.1f} s)")
+    print(f"  {'sample':<18}{'RSS':>10}{'renderers':>12}{'threads':>9}{'widgets':>9}")
+    for name, sample in samples.items():
+        print(f"  {name:<18}{sample['rss'] / 1048576:>8.1f}MB{sample['renderer_rss'] / 1048576:>10.1f}MB"
+              f"{sample['threads']:>9}{sample['widgets']:>9}")
+    print("  live objects (baseline -> end):")
+    for name, count in samples["baseline"]["objects"].items():
+        print(f"    {name:<20}{count:>7} -> {samples['after incognito']['objects'][name]}")
+    print(f"  growth: {measured['rss_mb']:.1f} MB RSS, {measured['threads']} threads, {measured['widgets']} widgets")
+    if open_incognito:
+        windows = open_incognito["windows"]
+        total = open_incognito["rss_mb"] + open_incognito["renderer_rss_mb"]
+        print(f"  {windows} incognito windows open: +{open_incognito['rss_mb']:.1f} MB browser, "
+              f"+{open_incognito['renderer_rss_mb']:.1f} MB renderers ({total / windows:.1f} MB per window), "
+              f"{open_incognito['profiles_open']} off-the-record profile(s); {open_incognito['released_mb']:.1f} MB released on close")
+
+def main():
+    parser = argparse.ArgumentParser(description="Tab lifecycle memory regression benchmark")
+    parser.add_argument("--tabs", type=int, default=2000, help="tabs to open and close")
+    parser.add_argument("--incognito", type=int, default=40, help="incognito windows to open and close")
+    parser.add_argument("--open-incognito", type=int, default=5, help="incognito windows kept open together for the cost report")
+    parser.add_argument("--settle-ms", type=int, default=250, help="event loop time given to each batch")
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--update-baseline", action="store_true", help="store this run's budgets in memory_baseline.json")
+    args = parser.parse_args()
+
+    QStandardPaths.setTestModeEnabled(True)
+    browser = load_browser()
+    application = QApplication(sys.argv[:1])
+    server, base_url = start_fixture_server()
+    try:
+        samples, open_incognito, duration = MemoryBenchmark(browser, base_url, args.settle_ms).run(args.tabs, args.incognito, args.open_incognito)
+    finally:
+        server.shutdown()
+    measured = growth(samples)
+    print_report(samples, measured, open_incognito, duration)
+
+    if args.update_baseline:
+        with open(BASELINE_PATH, "w") as f:
+            json.dump({"tabs": args.tabs, "incognito": args.incognito, "budget": budget_from(measured)}, f, indent=2)
+        print(f"Baseline written to {BASELINE_PATH}")
+        failures = []
+    else:
+        with open(BASELINE_PATH) as f:
+            failures = check(measured, json.load(f)["budget"], open_incognito)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"samples": samples, "growth": measured, "open_incognito": open_incognito, "duration": duration,
+                       "failures": failures}, f, indent=2)
+    for failure in failures:
+        print(f"LEAK: {failure}")
+    application.quit()
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
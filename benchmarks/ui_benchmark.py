@@ -0,0 +1,243 @@
+# --- UI PERFORMANCE BENCHMARK ---
+# Boots ZOrbitWindow offscreen against a local fixture server and times the interactions users feel:
+# new tabs, navigation to first paint in every engine, engine switches, opening the history dialog
+# on a large database and rebuilding the bookmarks bar with thousands of bookmarks.
+# Results are printed as JSON for trend tracking; --compare fails the run (exit code 1) when a median
+# got slower than a previous result by more than --max-regression.
+#
+#   python benchmarks/ui_benchmark.py [--samples 10] [--output results.json] [--compare previous.json]
+#
+# Uses a throwaway database and Qt's test-mode locations, never the real profile.
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import statistics
+from datetime import datetime, timedelta
+
+from fixtures import start_fixture_server, load_browser, wait, wait_for_signal
+from PyQt6.QtCore import QUrl, QStandardPaths, QT_VERSION_STR, PYQT_VERSION_STR
+from PyQt6.QtWidgets import QApplication
+
+LOAD_TIMEOUT_MS = 30000
+
+def summarize(samples):
+    ordered = sorted(samples)
+    return {"median_ms": round(statistics.median(ordered), 2), "p95_ms": round(ordered[int(0.95 * (len(ordered) - 1))], 2),
+            "min_ms": round(ordered[0], 2), "samples": len(ordered)}
+
+class UIBenchmark:
+    def __init__(self, browser, base_url, samples):
+        self.browser = browser
+        self.base_url = base_url
+        self.samples = samples
+        self.pages = 0
+        self.results = {}
+
+    def next_url(self):
+        self.pages += 1
+        return f"{self.base_url}/page/{self.pages}"
+
+    def record(self, name, samples):
+        samples = [sample for sample in samples if sample is not None]
+        if samples:
+            self.results[name] = summarize(samples)
+            print(f"  {name:<44}{self.results[name]['median_ms']:>9.1f} ms median", file=sys.stderr)
+        else:
+            print(f"  {name:<44}     timed out", file=sys.stderr)
+
+    def select_engine(self, window, engine):
+        # Decides the engine of the next tab without switching the current one
+        window.engine_selector.blockSignals(True)
+        window.engine_selector.setCurrentIndex(self.browser.ENGINES.index(engine))
+        window.engine_selector.blockSignals(False)
+
+    def close_other_tabs(self, window):
+        while window.tab_manager.count() > 1:
+            window.remove_tab(window.tab_manager.count() - 1)
+        wait(50)
+
+    def settle_spares(self):
+        # New tabs claim a pre-warmed view; give the pool its idle time back before the next sample
+        wait(self.browser.SpareViewPool.REPLENISH_DELAY_MS + 300)
+
+    def first_paint(self, tab, started):
+        # Time from navigation start until the engine has painted the page
+        loaded = wait_for_signal(tab.load_progress, LOAD_TIMEOUT_MS, lambda progress: progress == 100)
+        if loaded is None: return None
+        view = tab.current_view()
+        if isinstance(view, self.browser.LiteOrbitView):
+            view.viewport().repaint() # Synchronous, so the document's layout and paint are included
+            return (time.perf_counter() - started) * 1000
+        # WebEngine paints in its own process; the Paint Timing API reports when that first happened
+        paint = []
+        view.page().runJavaScript("(performance.getEntriesByName('first-contentful-paint')[0] || {}).startTime || 0",
+                                  self.browser.QWebEngineScript.ScriptWorldId.ApplicationWorld, paint.append)
+        for _ in range(100):
+            if paint: break
+            wait(10)
+        if paint and paint[0]:
+            # Relative to the document's navigation start, which our timer started just before
+            return float(paint[0])
+        return (loaded - started) * 1000 # Paint timing unavailable, e.g. without a compositor
+
+    def measure_new_tab(self, window):
+        for engine in self.browser.ENGINES:
+            self.select_engine(window, engine)
+            samples = []
+            for _ in range(self.samples):
+                self.settle_spares()
+                started = time.perf_counter()
+                window.add_new_tab("about:blank")
+                wait(0) # One event loop turn: the new tab has been laid out and painted
+                samples.append((time.perf_counter() - started) * 1000)
+            self.close_other_tabs(window)
+            self.record(f"new_tab.{engine}", samples)
+
+    def measure_navigation(self, window):
+        for engine in self.browser.ENGINES:
+            self.select_engine(window, engine)
+            tab = window.add_new_tab("about:blank")
+            wait(200)
+            samples = []
+            for _ in range(self.samples):
+                started = time.perf_counter()
+                tab.show_engine(engine, QUrl(self.next_url()))
+                samples.append(self.first_paint(tab, started))
+            self.close_other_tabs(window)
+            self.record(f"navigation_first_paint.{engine}", samples)
+
+    def measure_engine_switch(self, window):
+        engines = self.browser.ENGINES
+        for engine in engines[1:]:
+            cold, warm = [], []
+            for _ in range(self.samples):
+                self.select_engine(window, "Chromium")
+                tab = window.add_new_tab(self.next_url())
+                wait_for_signal(tab.load_progress, LOAD_TIMEOUT_MS, lambda progress: progress == 100)
+                # Cold: the other engine's view is created and loads the page
+                started = time.perf_counter()
+                tab.show_engine(engine)
+                cold.append(self.first_paint(tab, started))
+                # Warm: both engines are alive and show the same URL, so switching is a stack flip
+                started = time.perf_counter()
+                tab.show_engine("Chromium")
+                wait(0)
+                warm.append((time.perf_counter() - started) * 1000)
+                self.close_other_tabs(window)
+            self.record(f"engine_switch_cold.Chromium_to_{engine}", cold)
+            self.record(f"engine_switch_warm.{engine}_to_Chromium", warm)
+
+    def seed_database(self, history_rows, bookmarks):
+        started = datetime.now() - timedelta(days=365)
+        records = (("history", (f"History page {index}", f"https://site{index % 5000}.example/path/{index}",
+                                started + timedelta(seconds=index * 30))) for index in range(history_rows))
+        self.browser.DB_CONTROLLER.bulk_import(records)
+        records = (("bookmark", (f"Bookmark {index}", f"https://bookmark{index}.example/", "Benchmark")) for index in range(bookmarks))
+        self.browser.DB_CONTROLLER.bulk_import(records)
+
+    def measure_history_dialog(self, window):
+        samples = []
+        for _ in range(self.samples):
+            started = time.perf_counter()
+            dialog = self.browser.HistoryDialog(window)
+            dialog.show()
+            wait(0)
+            samples.append((time.perf_counter() - started) * 1000)
+            dialog.close()
+            dialog.deleteLater()
+        self.record("history_dialog_open", samples)
+
+    def measure_bookmarks_bar(self, window):
+        store = self.browser.BOOKMARK_STORE
+        reload_samples, rebuild_samples, add_samples = [], [], []
+        for index in range(self.samples):
+            # Reload re-reads every bookmark and rebuilds the bar in every open window
+            started = time.perf_counter()
+            store.reload()
+            wait(0)
+            reload_samples.append((time.perf_counter() - started) * 1000)
+            started = time.perf_counter()
+            window.refresh_bookmarks_bar()
+            wait(0)
+            rebuild_samples.append((time.perf_counter() - started) * 1000)
+            url = f"https://added{index}.example/"
+            started = time.perf_counter()
+            store.add(f"Added {index}", url)
+            wait(0)
+            add_samples.append((time.perf_counter() - started) * 1000)
+            store.remove(url)
+        self.record("bookmarks_reload", reload_samples)
+        self.record("bookmarks_bar_rebuild", rebuild_samples)
+        self.record("bookmark_add", add_samples)
+
+    def run(self, history_rows, bookmarks):
+        window = self.browser.ZOrbitWindow()
+        window.get_start_url = self.next_url # Keeps the first tab and new tabs off the network
+        window.show()
+        wait(1000)
+        self.measure_new_tab(window)
+        self.measure_navigation(window)
+        self.measure_engine_switch(window)
+        started = time.perf_counter()
+        self.seed_database(history_rows, bookmarks)
+        print(f"  seeded {history_rows} history rows and {bookmarks} bookmarks in {time.perf_counter() - started:.1f} s", file=sys.stderr)
+        self.measure_history_dialog(window)
+        self.measure_bookmarks_bar(window)
+        window.close()
+        return self.results
+
+def compare(results, previous, max_regression):
+    regressions = []
+    for name, result in results.items():
+        before = previous.get("results", {}).get(name)
+        if before and before["median_ms"] > 0 and result["median_ms"] > before["median_ms"] * max_regression:
+            regressions.append(f"{name}: {before['median_ms']:.1f} ms -> {result['median_ms']:.1f} ms")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end UI performance benchmark")
+    parser.add_argument("--samples", type=int, default=10, help="repetitions of each measurement")
+    parser.add_argument("--history-rows", type=int, default=200000, help="history rows seeded before the history dialog is timed")
+    parser.add_argument("--bookmarks", type=int, default=5000, help="bookmarks seeded before the bookmarks bar is timed")
+    parser.add_argument("--output", help="write the JSON results here instead of stdout")
+    parser.add_argument("--compare", help="previous results to check for regressions")
+    parser.add_argument("--max-regression", type=float, default=1.25, help="allowed slowdown factor of a median")
+    args = parser.parse_args()
+
+    QStandardPaths.setTestModeEnabled(True)
+    browser = load_browser()
+    data_dir = tempfile.TemporaryDirectory(prefix="zorbit-benchmark-")
+    browser.DB_CONTROLLER.storage_path = os.path.join(data_dir.name, "zorbit_system_v9.db") # Nothing has connected yet
+    application = QApplication(sys.argv[:1])
+    server, base_url = start_fixture_server()
+    print("Z-Orbit UI benchmark", file=sys.stderr)
+    try:
+        results = UIBenchmark(browser, base_url, args.samples).run(args.history_rows, args.bookmarks)
+    finally:
+        server.shutdown()
+    report = {"timestamp": datetime.now().isoformat(timespec="seconds"), "version": browser.VERSION,
+              "python": platform.python_version(), "qt": QT_VERSION_STR, "pyqt": PYQT_VERSION_STR,
+              "platform": platform.platform(), "samples": args.samples, "history_rows": args.history_rows,
+              "bookmarks": args.bookmarks, "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    regressions = []
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.max_regression)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}", file=sys.stderr)
+    application.quit()
+    data_dir.cleanup()
+    sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# --- LITEORBIT TRANSFORM ---
+# The HTML transforms of the LiteOrbit and Hybrid engines. They only work on their arguments, so they
+# can run in a LiteOrbit thread or in a transform process. This module has no Qt imports, which keeps
+# transform processes down to the standard library. They take the undecoded body: bytes cross the
+# process boundary with a single copy.
+import sys
+import re
+import html
+import pickle
+import struct
+from urllib.parse import urlparse, urljoin
+
+# Hybrid output keeps the markup and stylesheets for Chromium; only what would need JavaScript,
+# frames or the original byte encoding is taken out
+HYBRID_STRIP_RE = re.compile(r'<script\b.*?</script\s*>|<iframe\b.*?</iframe\s*>|<(?:script|iframe|base|meta\s[^>]*charset)\b[^>]*>',
+                             re.DOTALL | re.IGNORECASE)
+HYBRID_POLICY = "script-src 'none'; object-src 'none'; frame-src 'none'"
+
+def lite_page_title(raw_html, url):
+    title_search = re.search('<title>(.*?)</title>', raw_html, re.IGNORECASE)
+    return title_search.group(1) if title_search else urlparse(url).netloc
+
+def transform_lite_html(raw, base_url):
+    raw_html = raw.decode('utf-8', errors='ignore')
+    page_title = lite_page_title(raw_html, base_url)
+
+    # Enhanced Asset Resolver
+    def fix_src(match):
+        tag = match.group(0)
+        src_match = re.search(r'src=["\'](.*?)["\']', tag)
+        if src_match:
+            original_src = src_match.group(1)
+            if original_src.startswith('data:'): return tag
+            full_src = urljoin(base_url, original_src)
+            return tag.replace(original_src, full_src)
+        return tag
+
+    processed_html = re.sub(r'<img.*?>', fix_src, raw_html, flags=re.IGNORECASE)
+    processed_html = re.sub(r'<video.*?>', fix_src, processed_html, flags=re.IGNORECASE)
+    processed_html = re.sub(r'<audio.*?>', fix_src, processed_html, flags=re.IGNORECASE)
+
+    # Add Controls to Media
+    processed_html = re.sub(r'<video', '<video controls style="max-width:100%; border-radius:8px;"', processed_html)
+    processed_html = re.sub(r'<audio', '<audio controls style="width:100%;"', processed_html)
+
+    # Convert Buttons
+    processed_html = re.sub(r'<button(.*?)>(.*?)</button>', 
+                          r'<a href="#" style="background:#0078d4;color:white;padding:6px 12px;border-radius:4px;text-decoration:none;display:inline-block;" \1>\2</a>', 
+                          processed_html, flags=re.IGNORECASE)
+
+    # CSS Grid/Flex Simulation
+    processed_html = processed_html.replace('<div', '<div class="block-element"')
+
+    # Clean Heavy Scripts
+    processed_html = re.sub(r'<script.*?>.*?</script>', '', processed_html, flags=re.DOTALL | re.IGNORECASE)
+    processed_html = re.sub(r'<style.*?>.*?</style>', '', processed_html, flags=re.DOTALL | re.IGNORECASE)
+    processed_html = re.sub(r'<iframe.*?>.*?</iframe>', '', processed_html, flags=re.DOTALL | re.IGNORECASE)
+
+    lite_css = """
+    <style>
+        body { font-family: 'Segoe UI', sans-serif; line-height: 1.6; color: #e0e0e0; background-color: #121212; padding: 20px; max-width: 1000px; margin: 0 auto; }
+        h1, h2, h3 { color: #0078d4; border-bottom: 1px solid #333; padding-bottom: 10px; }
+        a { color: #4da6ff; text-decoration: none; }
+        a:hover { text-decoration: underline; color: #80c1ff; }
+        img { max-width: 100%; border-radius: 4px; border: 1px solid #333; margin: 10px 0; }
+        pre { background: #1a1a1a; padding: 10px; border-radius: 4px; border: 1px solid #333; overflow-x: auto; }
+        blockquote { border-left: 4px solid #0078d4; padding-left: 15px; color: #999; }
+        .block-element { margin-bottom: 10px; }
+    </style>
+    """
+    return lite_css + processed_html, page_title
+
+def transform_hybrid_html(raw, url, final_url, plain=False):
+    raw_html = raw.decode('utf-8', errors='ignore')
+    page_title = lite_page_title(raw_html, url)
+    if plain: raw_html = f"<pre>{html.escape(raw_html)}</pre>"
+    # Relative links and assets resolve against the real address, not the lite-orbit: one
+    base = re.search(r'<base\s[^>]*href=["\']?([^"\'\s>]+)', raw_html, re.IGNORECASE)
+    base_url = urljoin(final_url, html.unescape(base.group(1))) if base else final_url
+    head = (f'<meta charset="utf-8"><base href="{html.escape(base_url)}">'
+            f'<meta http-equiv="Content-Security-Policy" content="{HYBRID_POLICY}">')
+    document = HYBRID_STRIP_RE.sub('', raw_html)
+    opening = re.search(r'<head\b[^>]*>', document, re.IGNORECASE)
+    if opening:
+        return document[:opening.end()] + head + document[opening.end():], page_title
+    return head + document, page_title
+
+# --- TRANSFORM PROCESS ---
+# Run as a script (or as the frozen browser with --lite-transform-worker), this module is a transform
+# process: it answers length-prefixed pickled (name, args) requests on stdin with (ok, result) on stdout
+# until stdin closes.
+TRANSFORMS = {"transform_lite_html": transform_lite_html, "transform_hybrid_html": transform_hybrid_html}
+
+def write_message(stream, message):
+    body = pickle.dumps(message, pickle.HIGHEST_PROTOCOL)
+    stream.write(struct.pack("<Q", len(body)) + body)
+    stream.flush()
+
+def read_message(stream):
+    header = stream.read(8)
+    if len(header) < 8: raise EOFError
+    size = struct.unpack("<Q", header)[0]
+    body = stream.read(size)
+    if len(body) < size: raise EOFError
+    return pickle.loads(body)
+
+def serve():
+    source, sink = sys.stdin.buffer, sys.stdout.buffer
+    sys.stdout = sys.stderr # A stray print must not end up in the reply stream
+    while True:
+        try:
+            name, args = read_message(source)
+        except EOFError:
+            return
+        try:
+            reply = (True, TRANSFORMS[name](*args))
+        except Exception as error:
+            reply = (False, repr(error))
+        write_message(sink, reply)
+
+if __name__ == "__main__":
+    serve()
@@ -13,23 +13,67 @@ import platform
 import io
 import contextlib
 import socket
+import signal
 import traceback
-from datetime import datetime
+import csv
+import html
+import hashlib
+import base64
+import heapq
+import itertools
+import importlib.util
+import mimetypes
+import pickle
+import shutil
+from collections import deque
+from datetime import datetime, timedelta
 from urllib.parse import urlparse, urljoin, unquote
+import lite_transform
+from lite_transform import transform_lite_html, transform_hybrid_html
+
+if __name__ == "__main__" and sys.argv[1:2] == ["--lite-transform-worker"]:
+    # Transform processes of a frozen build start through the browser executable; nothing below is needed
+    lite_transform.serve()
+    sys.exit(0)
+
+# --- STARTUP PROFILE ---
+class StartupProfile:
+    # Timeline of startup phases, printed with --startup-profile
+    def __init__(self):
+        self.enabled = "--startup-profile" in sys.argv
+        self.started = time.perf_counter()
+        self.last = self.started
+        self.phases = []
+        self.reported = False
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last, now - self.started))
+        self.last = now
+
+    def report(self):
+        if not self.enabled or self.reported: return
+        self.reported = True
+        print("Z-Orbit startup profile (phase / duration / elapsed):")
+        for phase, duration, elapsed in self.phases:
+            print(f"  {phase:<32}{duration * 1000:9.1f} ms{elapsed * 1000:10.1f} ms")
+
+STARTUP_PROFILE = StartupProfile()
+
+try:
+    import psutil # Optional: more accurate process metrics where available
+except ImportError:
+    psutil = None
 
 # --- SYSTEM INTEGRITY CHECK ---
 def verify_system_integrity():
     required_packages = ["PyQt6", "PyQt6-WebEngine"]
     missing_packages = []
     
-    try:
-        import PyQt6
-    except ImportError:
+    # find_spec only locates the packages; the real imports below happen once
+    if importlib.util.find_spec("PyQt6") is None:
         missing_packages.append("PyQt6")
-    
-    try:
-        from PyQt6 import QtWebEngineWidgets
-    except ImportError:
+    elif importlib.util.find_spec("PyQt6.QtWebEngineWidgets") is None:
         missing_packages.append("PyQt6-WebEngine")
 
     if missing_packages:
@@ -45,11 +89,48 @@ def verify_system_integrity():
             sys.exit(1)
 
 verify_system_integrity()
+STARTUP_PROFILE.mark("integrity check")
+
+# --- SINGLE INSTANCE ---
+# A second launch hands its URLs and flags to the running browser over a local socket and exits
+# before QtWebEngine or the database are touched. --new-instance starts a separate browser instead.
+from PyQt6.QtCore import QUrl
+from PyQt6.QtNetwork import QLocalServer, QLocalSocket
+
+INSTANCE_NAME = "z-orbit-" + hashlib.sha1(os.path.expanduser("~").encode("utf-8")).hexdigest()[:12] # One per user
+INSTANCE_TIMEOUT_MS = 1000
+LAUNCH_FLAGS = {"--incognito", "--lite", "--new-instance", "--restore-session", "--startup-profile"}
+
+def parse_launch(argv):
+    # URLs are resolved here, the running instance has a different working directory
+    urls, skipping = [], False
+    for arg in argv[1:]:
+        if arg.startswith("--"):
+            skipping = arg not in LAUNCH_FLAGS # Foreign flags (Qt, Chromium) may be followed by their values
+        elif not skipping:
+            urls.append(QUrl.fromUserInput(arg, os.getcwd()).toString())
+    return {"urls": urls, "incognito": "--incognito" in argv, "lite": "--lite" in argv}
+
+def forward_launch(launch):
+    socket = QLocalSocket()
+    socket.connectToServer(INSTANCE_NAME)
+    if not socket.waitForConnected(INSTANCE_TIMEOUT_MS): return False
+    socket.write(json.dumps(launch).encode("utf-8") + b"\n")
+    socket.waitForBytesWritten(INSTANCE_TIMEOUT_MS)
+    # A hung instance never answers; starting a fresh one beats losing the URLs
+    answered = socket.waitForReadyRead(INSTANCE_TIMEOUT_MS * 5) and socket.readLine().data() == b"ok\n"
+    socket.disconnectFromServer()
+    return answered
+
+if __name__ == "__main__" and "--new-instance" not in sys.argv:
+    if forward_launch(parse_launch(sys.argv)): sys.exit(0)
+    STARTUP_PROFILE.mark("instance check")
 
 from PyQt6.QtCore import (
     QUrl, Qt, QSize, QSettings, QStandardPaths, QTimer, QPoint, 
     QEvent, pyqtSignal, QObject, QUrlQuery, QByteArray, QBuffer, 
-    QThread, pyqtSlot, QDateTime, QRegularExpression
+    QThread, pyqtSlot, QDateTime, QRegularExpression, QAbstractListModel,
+    QModelIndex, QIODevice
 )
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QToolBar, QLineEdit, QTabWidget, QWidget, 
@@ -57,8 +138,9 @@ from PyQt6.QtWidgets import (
     QStatusBar, QProgressBar, QSystemTrayIcon, QStyle, QFileDialog, QCheckBox, 
     QComboBox, QSplitter, QFrame, QListWidget, QListWidgetItem, QGroupBox,
     QFormLayout, QTableWidget, QTableWidgetItem, QHeaderView, QDockWidget,
-    QToolButton, QScrollArea, QSizePolicy, QTextBrowser, QRadioButton, 
-    QButtonGroup, QPlainTextEdit, QStackedWidget, QAbstractItemView, QTextEdit
+    QToolButton, QScrollArea, QSizePolicy, QTextBrowser, QRadioButton, QSpinBox,
+    QButtonGroup, QPlainTextEdit, QStackedWidget, QAbstractItemView, QTextEdit,
+    QListView
 )
 from PyQt6.QtGui import (
     QAction, QIcon, QFont, QKeySequence, QShortcut, QColor, 
@@ -68,14 +150,104 @@ from PyQt6.QtGui import (
 from PyQt6.QtWebEngineWidgets import QWebEngineView
 from PyQt6.QtWebEngineCore import (
     QWebEngineProfile, QWebEnginePage, QWebEngineSettings, 
-    QWebEngineDownloadRequest
+    QWebEngineDownloadRequest, QWebEngineUrlScheme, QWebEngineUrlSchemeHandler,
+    QWebEngineUrlRequestJob, QWebEngineUrlRequestInterceptor, QWebEngineScript
 )
+# QtWebEngine has to be imported up front: the views below subclass its classes
+STARTUP_PROFILE.mark("qt imports")
 
 # --- CONFIGURATION ---
 APP_NAME = "Z-Orbit alpha"
 VERSION = "0.1.2a"
 DEFAULT_HOME = "https://www.google.com"
 DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+ENGINES = ["Chromium", "LiteOrbit", "Hybrid"] # Same order as the toolbar's engine selector
+BOOKMARK_BAR_LIMIT = 25
+BOOKMARK_FOLDER_SIZE = 40
+SEGMENTED_DOWNLOAD_THRESHOLD = 8 * 1024 * 1024
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+DOWNLOAD_UI_REFRESH_MS = 250
+DOWNLOAD_SPEED_WINDOW = 5.0
+
+# --- SETTINGS SERVICE ---
+class SettingsService(QObject):
+    # Preferences are read from QSettings once into typed in-memory values, so hot paths never go to the
+    # registry. Writes land in memory immediately and reach storage in one batch after a quiet period
+    # (and on exit); changed lets open windows and services follow along without re-reading anything.
+    changed = pyqtSignal(str, object)
+    FLUSH_DELAY_MS = 1000
+    DEFAULTS = {
+        "home_page": DEFAULT_HOME,
+        "new_tab_behavior": "Home Page",
+        "startup_behavior": "Restore Previous Session",
+        "default_engine": "Chromium",
+        "search_engine": "Google",
+        "show_bookmarks": True,
+        "show_home_button": True,
+        "download_path": "", # Empty means the system download folder
+        "segmented_downloads": True,
+        "download_segments": 4,
+        "max_concurrent_downloads": 3,
+        "download_rate_global_kb": 0,
+        "download_rate_per_item_kb": 0,
+        "block_3rd_party_cookies": False,
+        "content_blocking": True,
+        "data_saver_default": False,
+        "history_max_age_days": 0,
+        "history_max_rows": 0,
+        "history_max_db_mb": 0,
+        "custom_user_agent": DEFAULT_USER_AGENT,
+        "proxy_host": "",
+        "proxy_port": "",
+        "tab_freeze_minutes": 5,
+        "tab_discard_minutes": 30,
+        "tab_memory_limit_mb": 4096,
+        "spare_tab_count": 1,
+        "lite_transform_processes": 0,
+    }
+
+    def __init__(self):
+        super().__init__()
+        self.lock = threading.Lock() # LiteOrbit and download threads read settings too
+        self.values = None
+        self.pending = {}
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(self.FLUSH_DELAY_MS)
+        self.flush_timer.timeout.connect(self.flush)
+
+    def ensure_loaded(self):
+        with self.lock:
+            if self.values is None:
+                store = QSettings("ZOrbitCorp", "ProMax")
+                self.values = {key: store.value(key, default, type=type(default)) for key, default in self.DEFAULTS.items()}
+            return self.values
+
+    def value(self, key):
+        return self.ensure_loaded()[key]
+
+    def setValue(self, key, value):
+        values = self.ensure_loaded()
+        value = type(self.DEFAULTS[key])(value)
+        if values[key] == value: return
+        values[key] = value
+        self.pending[key] = value
+        self.flush_timer.start() # Restarted by every write, so typing in a field is stored once
+        self.changed.emit(key, value)
+
+    def download_path(self):
+        return self.value("download_path") or QStandardPaths.writableLocation(QStandardPaths.StandardLocation.DownloadLocation)
+
+    def flush(self):
+        self.flush_timer.stop()
+        if not self.pending: return
+        store = QSettings("ZOrbitCorp", "ProMax")
+        for key, value in self.pending.items():
+            store.setValue(key, value)
+        store.sync()
+        self.pending = {}
+
+SETTINGS = SettingsService()
 
 # --- GLOBAL STYLESHEET ---
 GLOBAL_STYLESHEET = """
@@ -226,17 +398,70 @@ QTabBar::tab:selected { background: #3d1f3d; border-top: 3px solid #b000b0; }
 class DatabaseController:
     def __init__(self):
         self.storage_path = os.path.join(QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation), "zorbit_system_v9.db")
-        self.connection = None
-        self.initialize_tables()
+        self.thread_state = threading.local()
+        # SQLite allows a single writer; serialising here avoids busy-retry loops
+        # while WAL lets every other thread keep reading its own snapshot.
+        self.write_lock = threading.RLock()
+        # Tables are created on first use rather than at import, keeping startup off the disk
+        self.setup_lock = threading.RLock()
+        self.tables_ready = False
+        self.tables_initializing = False
+
+    def open_connection(self):
+        os.makedirs(os.path.dirname(self.storage_path), exist_ok=True)
+        conn = sqlite3.connect(self.storage_path, timeout=10)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        return conn
 
     def get_connection(self):
-        if not self.connection:
-            self.connection = sqlite3.connect(self.storage_path, check_same_thread=False)
-        return self.connection
+        # One connection per thread: GUI, retention, import and export workers never share a cursor
+        conn = getattr(self.thread_state, "connection", None)
+        if conn is None:
+            conn = self.open_connection()
+            self.thread_state.connection = conn
+        if not self.tables_ready:
+            self.ensure_tables()
+        return conn
+
+    def ensure_tables(self):
+        # Other threads wait on the lock; the initializing thread re-enters via get_connection
+        with self.setup_lock:
+            if self.tables_ready or self.tables_initializing: return
+            self.tables_initializing = True
+            try:
+                self.initialize_tables()
+            finally:
+                self.tables_initializing = False
+            self.tables_ready = True
+            STARTUP_PROFILE.mark("database")
+
+    def release_connection(self):
+        # Worker threads call this before exiting so their connection does not outlive them
+        conn = getattr(self.thread_state, "connection", None)
+        if conn is not None:
+            conn.close()
+            self.thread_state.connection = None
+
+    @contextlib.contextmanager
+    def write_transaction(self):
+        conn = self.get_connection()
+        with self.write_lock:
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
 
     def initialize_tables(self):
         conn = self.get_connection()
         cursor = conn.cursor()
+
+        # Incremental auto-vacuum lets retention hand freed pages back to the OS. A new file picks it
+        # up right here; an existing one needs a full VACUUM, which the retention worker runs later.
+        if cursor.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
         
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS history (
@@ -246,6 +471,19 @@ class DatabaseController:
                 timestamp DATETIME
             )
         ''')
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_history_timestamp ON history (timestamp)")
+
+        # Rollups behind z-orbit://stats, maintained on every write so the page never scans history
+        needs_backfill = not cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'stats_daily'").fetchone()
+        cursor.execute("CREATE TABLE IF NOT EXISTS stats_daily (day TEXT PRIMARY KEY, visits INTEGER NOT NULL DEFAULT 0)")
+        cursor.execute("CREATE TABLE IF NOT EXISTS stats_hourly (hour INTEGER PRIMARY KEY, visits INTEGER NOT NULL DEFAULT 0)")
+        cursor.execute("CREATE TABLE IF NOT EXISTS stats_domains (domain TEXT PRIMARY KEY, visits INTEGER NOT NULL DEFAULT 0, seconds REAL NOT NULL DEFAULT 0)")
+        cursor.execute("CREATE TABLE IF NOT EXISTS stats_engines (engine TEXT PRIMARY KEY, visits INTEGER NOT NULL DEFAULT 0)")
+        cursor.execute("CREATE TABLE IF NOT EXISTS stats_backfill (done_id INTEGER NOT NULL, last_id INTEGER NOT NULL)")
+        if needs_backfill:
+            # History written before the rollups existed is counted later by StatsBackfillWorker
+            last_id = cursor.execute("SELECT MAX(id) FROM history").fetchone()[0]
+            if last_id: cursor.execute("INSERT INTO stats_backfill (done_id, last_id) VALUES (0, ?)", (last_id,))
         
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS bookmarks (
@@ -255,6 +493,7 @@ class DatabaseController:
                 category TEXT
             )
         ''')
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_bookmarks_url ON bookmarks (url)")
         
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS downloads (
@@ -266,21 +505,146 @@ class DatabaseController:
                 timestamp DATETIME
             )
         ''')
+
+        # Partial state of segmented downloads, so they survive restarts and crashes
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS download_jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT,
+                directory TEXT,
+                filename TEXT,
+                total INTEGER,
+                accepts_ranges INTEGER,
+                expected_digest TEXT,
+                checksum TEXT,
+                state TEXT,
+                timestamp DATETIME
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS download_segments (
+                job_id INTEGER,
+                start INTEGER,
+                end INTEGER,
+                received INTEGER,
+                PRIMARY KEY (job_id, start)
+            )
+        ''')
+
+        # Open tabs, kept current as tabs open, close and navigate so a crash loses at most a second
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS session_tabs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                window_id INTEGER,
+                position INTEGER,
+                url TEXT,
+                title TEXT,
+                engine TEXT,
+                scroll_x REAL DEFAULT 0,
+                scroll_y REAL DEFAULT 0,
+                active INTEGER DEFAULT 0,
+                pinned INTEGER DEFAULT 0
+            )
+        ''')
+        
+        cursor.execute("CREATE TABLE IF NOT EXISTS data_saver_rules (host TEXT PRIMARY KEY, flags INTEGER NOT NULL)")
         
         conn.commit()
 
-    def add_history_entry(self, title, url):
+    def add_history_entry(self, title, url, engine="Chromium"):
         if not url or url == "about:blank" or url.startswith("z-orbit://"): 
             return
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("INSERT INTO history (title, url, timestamp) VALUES (?, ?, ?)", 
-                          (title, url, datetime.now()))
-            conn.commit()
+            visited_at = datetime.now()
+            with self.write_transaction() as conn:
+                conn.execute("INSERT INTO history (title, url, timestamp) VALUES (?, ?, ?)", 
+                            (title, url, visited_at))
+                self.update_rollups(conn, [(url, visited_at)], engine)
         except Exception:
             pass
 
+    @staticmethod
+    def domain_of(url):
+        # String slicing instead of urlparse: this runs once per row during bulk imports
+        authority = url.partition("://")[2]
+        for separator in "/?#":
+            authority = authority.split(separator, 1)[0]
+        host = authority.rpartition("@")[2]
+        host = host[:host.find("]") + 1] if host.startswith("[") else host.split(":", 1)[0]
+        host = host.lower()
+        return host[4:] if host.startswith("www.") else host
+
+    def update_rollups(self, conn, visits, engine, sign=1):
+        # visits: iterable of (url, timestamp); timestamps may be datetimes or ISO strings.
+        # sign=-1 takes purged visits back out. Engines are not known per row, so they pass None.
+        days, hours, domains, origin_domains = {}, {}, {}, {}
+        total = 0
+        for url, visited_at in visits:
+            stamp = str(visited_at)
+            day = stamp[:10]
+            hour = int(stamp[11:13]) if stamp[11:13].isdigit() else 0
+            days[day] = days.get(day, 0) + sign
+            hours[hour] = hours.get(hour, 0) + sign
+            origin_end = url.find("/", url.find("://") + 3)
+            origin = url if origin_end == -1 else url[:origin_end]
+            domain = origin_domains.get(origin)
+            if domain is None:
+                domain = origin_domains[origin] = self.domain_of(origin)
+            if domain: domains[domain] = domains.get(domain, 0) + sign
+            total += 1
+        if not total: return
+        conn.executemany("INSERT INTO stats_daily (day, visits) VALUES (?, ?) ON CONFLICT(day) DO UPDATE SET visits = visits + excluded.visits", days.items())
+        conn.executemany("INSERT INTO stats_hourly (hour, visits) VALUES (?, ?) ON CONFLICT(hour) DO UPDATE SET visits = visits + excluded.visits", hours.items())
+        conn.executemany("INSERT INTO stats_domains (domain, visits) VALUES (?, ?) ON CONFLICT(domain) DO UPDATE SET visits = visits + excluded.visits", domains.items())
+        if engine is not None:
+            conn.execute("INSERT INTO stats_engines (engine, visits) VALUES (?, ?) ON CONFLICT(engine) DO UPDATE SET visits = visits + excluded.visits", (engine, total))
+        if sign < 0:
+            # Days, hours and domains without visits left are forgotten, time spent on the domain included
+            conn.executemany("DELETE FROM stats_daily WHERE day = ? AND visits <= 0", [(day,) for day in days])
+            conn.executemany("DELETE FROM stats_hourly WHERE hour = ? AND visits <= 0", [(hour,) for hour in hours])
+            conn.executemany("DELETE FROM stats_domains WHERE domain = ? AND visits <= 0", [(domain,) for domain in domains])
+
+    def rollup_backfill(self, conn):
+        # (done_id, last_id) while history rows in (done_id, last_id] are still missing from the rollups
+        return conn.execute("SELECT done_id, last_id FROM stats_backfill").fetchone()
+
+    def backfill_rollups(self, batch_size=5000, should_stop=lambda: False):
+        # Counts pre-rollup history in id order. Progress commits with each batch, so a pass cut short
+        # by quitting resumes on the next start and retention knows which rows are already counted.
+        while not should_stop():
+            with self.write_transaction() as conn:
+                pending = self.rollup_backfill(conn)
+                if pending is None: return
+                done_id, last_id = pending
+                rows = conn.execute("SELECT id, url, timestamp FROM history WHERE id > ? AND id <= ? ORDER BY id LIMIT ?",
+                                    (done_id, last_id, batch_size)).fetchall()
+                self.update_rollups(conn, ((url, timestamp) for row_id, url, timestamp in rows), "Unknown")
+                if rows and rows[-1][0] < last_id:
+                    conn.execute("UPDATE stats_backfill SET done_id = ?", (rows[-1][0],))
+                else:
+                    conn.execute("DELETE FROM stats_backfill")
+            time.sleep(0.005) # Let waiting writers in between batches
+
+    def add_domain_time(self, domain, seconds):
+        if not domain or seconds <= 0: return
+        try:
+            with self.write_transaction() as conn:
+                conn.execute("INSERT INTO stats_domains (domain, seconds) VALUES (?, ?) ON CONFLICT(domain) DO UPDATE SET seconds = seconds + excluded.seconds", (domain, seconds))
+        except sqlite3.Error:
+            pass
+
+    def fetch_stats(self, top=10, days=30):
+        conn = self.get_connection()
+        since = (datetime.now() - timedelta(days=days - 1)).strftime("%Y-%m-%d")
+        return {
+            "top_sites": conn.execute("SELECT domain, visits FROM stats_domains WHERE visits > 0 ORDER BY visits DESC LIMIT ?", (top,)).fetchall(),
+            "top_time": conn.execute("SELECT domain, seconds FROM stats_domains WHERE seconds > 0 ORDER BY seconds DESC LIMIT ?", (top,)).fetchall(),
+            "daily": conn.execute("SELECT day, visits FROM stats_daily WHERE day >= ? ORDER BY day", (since,)).fetchall(),
+            "hourly": dict(conn.execute("SELECT hour, visits FROM stats_hourly").fetchall()),
+            "engines": conn.execute("SELECT engine, visits FROM stats_engines ORDER BY visits DESC").fetchall(),
+            "building": self.rollup_backfill(conn) is not None,
+        }
+
     def fetch_history(self, limit=200):
         try:
             conn = self.get_connection()
@@ -289,38 +653,586 @@ class DatabaseController:
             return []
 
     def wipe_history(self):
+        with self.write_transaction() as conn:
+            conn.execute("DELETE FROM history")
+            for table in ("stats_daily", "stats_hourly", "stats_domains", "stats_engines", "stats_backfill"):
+                conn.execute(f"DELETE FROM {table}")
+
+    def enforce_retention(self, max_age_days=0, max_rows=0, max_size_mb=0, batch_size=500):
+        # Each batch is its own short write transaction so GUI writes interleave freely
         conn = self.get_connection()
-        conn.cursor().execute("DELETE FROM history")
-        conn.commit()
+        self.enable_incremental_vacuum()
+        deleted = 0
+        if max_age_days > 0:
+            deleted += self.purge_oldest_history(batch_size, cutoff=datetime.now() - timedelta(days=max_age_days))
+
+        if max_rows > 0:
+            excess = conn.execute("SELECT COUNT(*) FROM history").fetchone()[0] - max_rows
+            if excess > 0:
+                deleted += self.purge_oldest_history(batch_size, count=excess)
+
+        self.compact()
+
+        if max_size_mb > 0:
+            budget = max_size_mb * 1024 * 1024
+            while self.get_storage_stats()["size_bytes"] > budget:
+                removed = self.purge_oldest_history(batch_size, count=batch_size)
+                if removed <= 0: break
+                deleted += removed
+                self.compact()
+        return deleted
+
+    def purge_oldest_history(self, batch_size, cutoff=None, count=None):
+        # Oldest by timestamp, not id: imported history gets new ids however old it is.
+        # The stats rollups lose the same visits, so purged domains drop out of z-orbit://stats too.
+        deleted = 0
+        while count is None or deleted < count:
+            limit = batch_size if count is None else min(batch_size, count - deleted)
+            with self.write_transaction() as conn:
+                if cutoff is None:
+                    rows = conn.execute("SELECT id, url, timestamp FROM history ORDER BY timestamp LIMIT ?", (limit,)).fetchall()
+                else:
+                    rows = conn.execute("SELECT id, url, timestamp FROM history WHERE timestamp < ? ORDER BY timestamp LIMIT ?", (cutoff, limit)).fetchall()
+                conn.executemany("DELETE FROM history WHERE id = ?", [(row_id,) for row_id, url, timestamp in rows])
+                pending = self.rollup_backfill(conn) # Rows the backfill hasn't reached were never counted
+                self.update_rollups(conn, ((url, timestamp) for row_id, url, timestamp in rows
+                                           if pending is None or not pending[0] < row_id <= pending[1]), None, sign=-1)
+            removed = len(rows)
+            if removed <= 0: break
+            deleted += removed
+            time.sleep(0.005) # Let waiting writers in between batches
+        return deleted
+
+    def enable_incremental_vacuum(self):
+        # One-time conversion of databases created before incremental auto-vacuum; runs on the retention worker
+        conn = self.get_connection()
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2: return
+        with self.write_lock:
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
 
-    def save_bookmark(self, title, url):
+    def compact(self):
+        with self.write_lock:
+            # executescript steps the pragma to completion; execute() would free a single page
+            self.get_connection().executescript("PRAGMA incremental_vacuum; PRAGMA wal_checkpoint(TRUNCATE);")
+
+    def get_storage_stats(self):
         conn = self.get_connection()
-        exists = conn.cursor().execute("SELECT id FROM bookmarks WHERE url = ?", (url,)).fetchone()
-        if not exists:
-            conn.cursor().execute("INSERT INTO bookmarks (title, url, category) VALUES (?, ?, ?)", (title, url, "General"))
-            conn.commit()
-            return True
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+        freelist_count = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        stats = {
+            "size_bytes": page_size * page_count,
+            "page_size": page_size,
+            "page_count": page_count,
+            "freelist_count": freelist_count,
+            "fragmentation": (freelist_count / page_count * 100) if page_count else 0.0,
+        }
+        for table in ("history", "bookmarks", "downloads"):
+            stats[f"{table}_rows"] = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        return stats
+
+    def save_bookmark(self, title, url):
+        with self.write_transaction() as conn:
+            exists = conn.execute("SELECT id FROM bookmarks WHERE url = ?", (url,)).fetchone()
+            if not exists:
+                conn.execute("INSERT INTO bookmarks (title, url, category) VALUES (?, ?, ?)", (title, url, "General"))
+                return True
         return False
 
     def delete_bookmark(self, url):
-        conn = self.get_connection()
-        conn.cursor().execute("DELETE FROM bookmarks WHERE url = ?", (url,))
-        conn.commit()
+        with self.write_transaction() as conn:
+            conn.execute("DELETE FROM bookmarks WHERE url = ?", (url,))
 
     def fetch_bookmarks(self):
         try:
-            return self.get_connection().cursor().execute("SELECT title, url FROM bookmarks").fetchall()
+            return self.get_connection().cursor().execute("SELECT title, url FROM bookmarks ORDER BY id").fetchall()
         except: 
             return []
 
-    def record_download(self, filename, path, url, size):
+    def bulk_import(self, records, batch_size=5000, progress=None):
+        # records yields ("bookmark", (title, url, category)) or ("history", (title, url, timestamp)).
+        # Records are parsed outside the write lock and each batch is its own transaction, so GUI
+        # writes wait for one executemany at most. A failure keeps the batches already committed.
+        pending = {"bookmark": [], "history": []}
+        counts = {"bookmark": 0, "history": 0}
+        statements = {
+            "bookmark": "INSERT INTO bookmarks (title, url, category) SELECT ?, ?, ? WHERE NOT EXISTS (SELECT 1 FROM bookmarks WHERE url = ?)",
+            "history": "INSERT INTO history (title, url, timestamp) VALUES (?, ?, ?)",
+        }
+
+        def flush(kind):
+            rows = pending[kind]
+            if not rows: return
+            if kind == "bookmark":
+                rows = [(title, url, category, url) for title, url, category in rows]
+            with self.write_transaction() as conn:
+                conn.executemany(statements[kind], rows)
+                if kind == "history":
+                    self.update_rollups(conn, ((url, timestamp) for title, url, timestamp in rows), "Imported")
+            counts[kind] += len(rows)
+            pending[kind] = []
+            if progress: progress(counts["bookmark"] + counts["history"])
+
+        for kind, row in records:
+            pending[kind].append(row)
+            if len(pending[kind]) >= batch_size: flush(kind)
+        flush("bookmark")
+        flush("history")
+        return counts
+
+    def iter_history(self, batch_size=5000):
+        cursor = self.get_connection().execute("SELECT title, url, timestamp FROM history ORDER BY id")
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows: break
+            yield from rows
+
+    def iter_bookmarks(self, batch_size=5000):
+        cursor = self.get_connection().execute("SELECT title, url, category FROM bookmarks ORDER BY category, id")
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows: break
+            yield from rows
+
+    def create_download_job(self, url, directory, filename, total, accepts_ranges, expected_digest, segments):
+        with self.write_transaction() as conn:
+            job_id = conn.execute("INSERT INTO download_jobs (url, directory, filename, total, accepts_ranges, expected_digest, state, timestamp) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                  (url, directory, filename, total, int(accepts_ranges), expected_digest, "in_progress", datetime.now())).lastrowid
+            conn.executemany("INSERT INTO download_segments (job_id, start, end, received) VALUES (?, ?, ?, ?)",
+                             [(job_id, seg["start"], seg["end"], seg["received"]) for seg in segments])
+        return job_id
+
+    def update_download_job(self, job_id, segments=None, state=None, checksum=None, filename=None):
+        with self.write_transaction() as conn:
+            if segments:
+                conn.executemany("UPDATE download_segments SET received = ? WHERE job_id = ? AND start = ?",
+                                 [(seg["received"], job_id, seg["start"]) for seg in segments])
+            if state:
+                conn.execute("UPDATE download_jobs SET state = ? WHERE id = ?", (state, job_id))
+            if checksum:
+                conn.execute("UPDATE download_jobs SET checksum = ? WHERE id = ?", (checksum, job_id))
+            if filename:
+                conn.execute("UPDATE download_jobs SET filename = ? WHERE id = ?", (filename, job_id))
+
+    def reset_download_job(self, job_id, accepts_ranges, segments):
+        with self.write_transaction() as conn:
+            conn.execute("UPDATE download_jobs SET accepts_ranges = ? WHERE id = ?", (int(accepts_ranges), job_id))
+            conn.execute("DELETE FROM download_segments WHERE job_id = ?", (job_id,))
+            conn.executemany("INSERT INTO download_segments (job_id, start, end, received) VALUES (?, ?, ?, ?)",
+                             [(job_id, seg["start"], seg["end"], seg["received"]) for seg in segments])
+
+    def delete_download_job(self, job_id):
+        with self.write_transaction() as conn:
+            conn.execute("DELETE FROM download_segments WHERE job_id = ?", (job_id,))
+            conn.execute("DELETE FROM download_jobs WHERE id = ?", (job_id,))
+
+    def fetch_resumable_downloads(self):
         conn = self.get_connection()
-        conn.cursor().execute("INSERT INTO downloads (filename, path, url, size, timestamp) VALUES (?, ?, ?, ?, ?)",
-                             (filename, path, url, size, datetime.now()))
-        conn.commit()
+        jobs = conn.execute("SELECT id, url, directory, filename, total, accepts_ranges, expected_digest FROM download_jobs WHERE state IN ('in_progress', 'paused') ORDER BY id").fetchall()
+        return [(job, conn.execute("SELECT start, end, received FROM download_segments WHERE job_id = ? ORDER BY start", (job[0],)).fetchall()) for job in jobs]
+
+    def record_download(self, filename, path, url, size):
+        with self.write_transaction() as conn:
+            return conn.execute("INSERT INTO downloads (filename, path, url, size, timestamp) VALUES (?, ?, ?, ?, ?)",
+                        (filename, path, url, size, datetime.now())).lastrowid
+
+    def fetch_downloads(self, query="", limit=100, before_id=None):
+        # Keyset paging on id keeps every page an index range scan, however deep the list is scrolled
+        clauses, params = [], []
+        if query:
+            clauses.append("(filename LIKE ? OR url LIKE ?)")
+            params += [f"%{query}%"] * 2
+        if before_id is not None:
+            clauses.append("id < ?")
+            params.append(before_id)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self.get_connection().execute(f"SELECT id, filename, path, url, size, timestamp FROM downloads {where} ORDER BY id DESC LIMIT ?",
+                                              params + [limit]).fetchall()
+
+    def delete_download_record(self, record_id):
+        with self.write_transaction() as conn:
+            conn.execute("DELETE FROM downloads WHERE id = ?", (record_id,))
+
+    def clear_downloads(self):
+        with self.write_transaction() as conn:
+            conn.execute("DELETE FROM downloads")
+
+    def fetch_session(self):
+        return self.get_connection().execute(
+            "SELECT id, window_id, url, title, engine, scroll_x, scroll_y, active, pinned FROM session_tabs ORDER BY window_id, position, id").fetchall()
+
+    def max_session_window(self):
+        return self.get_connection().execute("SELECT COALESCE(MAX(window_id), 0) FROM session_tabs").fetchone()[0]
+
+    def insert_session_tabs(self, rows):
+        with self.write_transaction() as conn:
+            return [conn.execute("INSERT INTO session_tabs (window_id, position, url, title, engine) VALUES (?, ?, ?, ?, ?)", row).lastrowid
+                    for row in rows]
+
+    def update_session(self, tabs, layout, closed):
+        # tabs: (url, title, engine, scroll_x, scroll_y, id); layout: (position, active, pinned, id); closed: ids
+        with self.write_transaction() as conn:
+            conn.executemany("UPDATE session_tabs SET url = ?, title = ?, engine = ?, scroll_x = ?, scroll_y = ? WHERE id = ?", tabs)
+            conn.executemany("UPDATE session_tabs SET position = ?, active = ?, pinned = ? WHERE id = ?", layout)
+            conn.executemany("DELETE FROM session_tabs WHERE id = ?", [(tab_id,) for tab_id in closed])
+
+    def delete_session_window(self, window_id):
+        with self.write_transaction() as conn:
+            conn.execute("DELETE FROM session_tabs WHERE window_id = ?", (window_id,))
+
+    def clear_session(self):
+        with self.write_transaction() as conn:
+            conn.execute("DELETE FROM session_tabs")
+
+    def fetch_data_saver_rules(self):
+        return self.get_connection().execute("SELECT host, flags FROM data_saver_rules").fetchall()
+
+    def set_data_saver_rule(self, host, flags):
+        with self.write_transaction() as conn:
+            conn.execute("INSERT OR REPLACE INTO data_saver_rules (host, flags) VALUES (?, ?)", (host, flags))
+
+    def delete_data_saver_rule(self, host):
+        with self.write_transaction() as conn:
+            conn.execute("DELETE FROM data_saver_rules WHERE host = ?", (host,))
 
 DB_CONTROLLER = DatabaseController()
 
+class HistoryRetentionWorker(QThread):
+    retention_done = pyqtSignal(int)
+
+    def __init__(self, max_age_days, max_rows, max_size_mb):
+        super().__init__()
+        self.policy = (max_age_days, max_rows, max_size_mb)
+
+    def run(self):
+        try:
+            deleted = DB_CONTROLLER.enforce_retention(*self.policy)
+        except sqlite3.Error:
+            deleted = 0
+        finally:
+            DB_CONTROLLER.release_connection()
+        self.retention_done.emit(deleted)
+
+class HistoryRetentionJob(QObject):
+    INTERVAL_MS = 30 * 60 * 1000
+    STARTUP_DELAY_MS = 15 * 1000
+
+    def __init__(self):
+        super().__init__()
+        self.worker = None
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.run_now)
+
+    def start(self):
+        self.timer.start(self.INTERVAL_MS)
+        QTimer.singleShot(self.STARTUP_DELAY_MS, self.run_now)
+
+    def run_now(self):
+        if self.worker and self.worker.isRunning(): return
+        policy = (
+            SETTINGS.value("history_max_age_days"),
+            SETTINGS.value("history_max_rows"),
+            SETTINGS.value("history_max_db_mb"),
+        )
+        if not any(policy): return
+        self.worker = HistoryRetentionWorker(*policy)
+        self.worker.start()
+
+RETENTION_JOB = HistoryRetentionJob()
+
+class StatsBackfillWorker(QThread):
+    def __init__(self):
+        super().__init__()
+        self.stop_requested = False
+
+    def run(self):
+        try:
+            DB_CONTROLLER.backfill_rollups(should_stop=lambda: self.stop_requested)
+        except sqlite3.Error:
+            pass
+        finally:
+            DB_CONTROLLER.release_connection()
+
+    def stop(self):
+        self.stop_requested = True
+        self.wait()
+
+STATS_BACKFILL = StatsBackfillWorker()
+
+# --- BOOKMARK STORE ---
+class BookmarkStore(QObject):
+    # Every window listens to these, so a change made anywhere shows up everywhere
+    bookmark_added = pyqtSignal(str, str)
+    bookmark_removed = pyqtSignal(str)
+    bookmarks_reset = pyqtSignal()
+
+    def __init__(self):
+        super().__init__()
+        self.entries = None # url -> title, in insertion order
+
+    def ensure_loaded(self):
+        if self.entries is None:
+            self.entries = {url: title for title, url in DB_CONTROLLER.fetch_bookmarks()}
+        return self.entries
+
+    def all(self):
+        return [(title, url) for url, title in self.ensure_loaded().items()]
+
+    def count(self):
+        return len(self.ensure_loaded())
+
+    def contains(self, url):
+        return url in self.ensure_loaded()
+
+    def add(self, title, url):
+        entries = self.ensure_loaded()
+        if url in entries or not DB_CONTROLLER.save_bookmark(title, url):
+            return False
+        entries[url] = title
+        self.bookmark_added.emit(title, url)
+        return True
+
+    def remove(self, url):
+        DB_CONTROLLER.delete_bookmark(url)
+        if self.ensure_loaded().pop(url, None) is not None:
+            self.bookmark_removed.emit(url)
+
+    def reload(self):
+        self.entries = None
+        self.ensure_loaded()
+        self.bookmarks_reset.emit()
+
+BOOKMARK_STORE = BookmarkStore()
+
+# --- BOOKMARK & HISTORY TRANSFER ---
+class StreamingJsonReader:
+    # Walks a {"section": [item, ...], ...} document one item at a time, so
+    # exports with millions of rows never have to fit in memory.
+    def __init__(self, stream, chunk_size=1 << 16):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def next_char(self):
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos].isspace():
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                raise ValueError("Unexpected end of JSON document")
+
+    def expect(self, char):
+        if self.next_char() != char:
+            raise ValueError(f"Expected '{char}' at offset {self.pos}")
+        self.pos += 1
+
+    def decode_value(self):
+        self.next_char()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A number at the very end of the buffer may continue in the next chunk
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof: raise
+            if not self.fill():
+                continue
+
+    def iter_sections(self):
+        self.expect("{")
+        if self.next_char() == "}": return
+        while True:
+            section = self.decode_value()
+            self.expect(":")
+            if self.next_char() == "[":
+                self.pos += 1
+                if self.next_char() == "]":
+                    self.pos += 1
+                else:
+                    while True:
+                        yield section, self.decode_value()
+                        if self.next_char() == ",":
+                            self.pos += 1
+                            continue
+                        self.expect("]")
+                        break
+            else:
+                self.decode_value()
+            if self.next_char() == ",":
+                self.pos += 1
+                continue
+            self.expect("}")
+            return
+
+class DataTransferWorker(QThread):
+    progress_changed = pyqtSignal(int)
+    transfer_finished = pyqtSignal(str)
+    transfer_failed = pyqtSignal(str)
+
+    NETSCAPE_FOLDER = re.compile(r'<H3[^>]*>(.*?)</H3>', re.IGNORECASE)
+    NETSCAPE_LINK = re.compile(r'<A\s[^>]*HREF="([^"]*)"[^>]*>(.*?)</A>', re.IGNORECASE)
+
+    def __init__(self, mode, path):
+        super().__init__()
+        self.mode = mode # "import" or "export"
+        self.path = path
+        self.format = os.path.splitext(path)[1].lower().lstrip(".")
+        self.imported = 0
+
+    def on_import_progress(self, count):
+        self.imported = count
+        self.progress_changed.emit(count)
+
+    def run(self):
+        try:
+            if self.mode == "import":
+                counts = DB_CONTROLLER.bulk_import(self.read_records(), progress=self.on_import_progress)
+                self.transfer_finished.emit(f"Imported {counts['bookmark']:,} bookmarks and {counts['history']:,} history entries.")
+            else:
+                total = self.write_records()
+                self.transfer_finished.emit(f"Exported {total:,} rows to {os.path.basename(self.path)}.")
+        except Exception as e:
+            if self.imported: # Earlier batches are committed and stay in the database
+                self.transfer_failed.emit(f"{e}\n\nThe first {self.imported:,} rows were imported before the error and have been kept.")
+            else:
+                self.transfer_failed.emit(str(e))
+        finally:
+            DB_CONTROLLER.release_connection()
+
+    @staticmethod
+    def normalize_timestamp(value):
+        if value in (None, ""): return datetime.now()
+        if isinstance(value, (int, float)) or str(value).replace(".", "", 1).isdigit():
+            seconds = float(value)
+            if seconds > 1e14: seconds /= 1e6 # microsecond epochs from other browsers
+            elif seconds > 1e11: seconds /= 1e3
+            return datetime.fromtimestamp(seconds).isoformat(" ") # Same text sqlite3 stores for a datetime
+        return str(value)
+
+    # Import
+    def read_records(self):
+        with open(self.path, "r", encoding="utf-8", errors="replace", newline="") as stream:
+            if self.format in ("html", "htm"):
+                yield from self.read_netscape(stream)
+            elif self.format == "json":
+                yield from self.read_json(stream)
+            elif self.format == "csv":
+                yield from self.read_csv(stream)
+            else:
+                raise ValueError(f"Unsupported format: .{self.format}")
+
+    def read_netscape(self, stream):
+        folders = []
+        for line in stream:
+            folder = self.NETSCAPE_FOLDER.search(line)
+            if folder:
+                folders.append(html.unescape(folder.group(1)))
+            for url, title in self.NETSCAPE_LINK.findall(line):
+                yield "bookmark", (html.unescape(title), html.unescape(url), folders[-1] if folders else "General")
+            if "</DL>" in line.upper() and folders:
+                folders.pop()
+
+    def read_json(self, stream):
+        for section, item in StreamingJsonReader(stream).iter_sections():
+            if not isinstance(item, dict) or not item.get("url"): continue
+            if section == "bookmarks":
+                yield "bookmark", (item.get("title", ""), item["url"], item.get("category") or "General")
+            elif section == "history":
+                yield "history", (item.get("title", ""), item["url"], self.normalize_timestamp(item.get("timestamp")))
+
+    def read_csv(self, stream):
+        reader = csv.reader(stream)
+        header = [name.strip().lower() for name in next(reader, [])]
+        if "url" not in header: raise ValueError("CSV file needs a 'url' column")
+        # Plain reader plus column indexes is roughly twice as fast as DictReader on big files
+        columns = {name: header.index(name) if name in header else None for name in ("type", "title", "url", "category", "timestamp")}
+        def column(row, name, default=""):
+            index = columns[name]
+            return row[index] if index is not None and index < len(row) else default
+        for row in reader:
+            url = column(row, "url")
+            if not url: continue
+            if column(row, "type", "history").lower() == "bookmark":
+                yield "bookmark", (column(row, "title"), url, column(row, "category") or "General")
+            else:
+                yield "history", (column(row, "title"), url, self.normalize_timestamp(column(row, "timestamp")))
+
+    # Export
+    def write_records(self):
+        with open(self.path, "w", encoding="utf-8", newline="") as stream:
+            if self.format in ("html", "htm"):
+                return self.write_netscape(stream)
+            elif self.format == "json":
+                return self.write_json(stream)
+            elif self.format == "csv":
+                return self.write_csv(stream)
+            raise ValueError(f"Unsupported format: .{self.format}")
+
+    def report(self, total):
+        if total % 5000 == 0: self.progress_changed.emit(total)
+
+    def write_netscape(self, stream):
+        stream.write("<!DOCTYPE NETSCAPE-Bookmark-file-1>\n<META HTTP-EQUIV=\"Content-Type\" CONTENT=\"text/html; charset=UTF-8\">\n<TITLE>Bookmarks</TITLE>\n<H1>Bookmarks</H1>\n<DL><p>\n")
+        total = 0
+        current_folder = None
+        for title, url, category in DB_CONTROLLER.iter_bookmarks():
+            category = category or "General"
+            if category != current_folder:
+                if current_folder is not None: stream.write("    </DL><p>\n")
+                stream.write(f"    <DT><H3>{html.escape(category)}</H3>\n    <DL><p>\n")
+                current_folder = category
+            stream.write(f'        <DT><A HREF="{html.escape(url or "")}">{html.escape(title or "")}</A>\n')
+            total += 1
+            self.report(total)
+        if current_folder is not None: stream.write("    </DL><p>\n")
+        stream.write("</DL><p>\n")
+        return total
+
+    def write_json(self, stream):
+        total = 0
+        stream.write('{"bookmarks": [')
+        for i, (title, url, category) in enumerate(DB_CONTROLLER.iter_bookmarks()):
+            stream.write(("," if i else "") + "\n" + json.dumps({"title": title, "url": url, "category": category}))
+            total += 1
+            self.report(total)
+        stream.write('\n], "history": [')
+        for i, (title, url, timestamp) in enumerate(DB_CONTROLLER.iter_history()):
+            stream.write(("," if i else "") + "\n" + json.dumps({"title": title, "url": url, "timestamp": str(timestamp)}))
+            total += 1
+            self.report(total)
+        stream.write("\n]}\n")
+        return total
+
+    def write_csv(self, stream):
+        writer = csv.writer(stream)
+        writer.writerow(["type", "title", "url", "category", "timestamp"])
+        total = 0
+        for title, url, category in DB_CONTROLLER.iter_bookmarks():
+            writer.writerow(["bookmark", title, url, category, ""])
+            total += 1
+            self.report(total)
+        for title, url, timestamp in DB_CONTROLLER.iter_history():
+            writer.writerow(["history", title, url, "", timestamp])
+            total += 1
+            self.report(total)
+        return total
+
 # --- PYTHON IDE WINDOW ---
 class PythonWorker(QThread):
     output_signal = pyqtSignal(str)
@@ -791,6 +1703,7 @@ class InternalPages:
         faqs = [
             ("How do I switch Search Engines?", "Go to Settings > General > Search Engine. This will also update your Home Page automatically."),
             ("What is LiteOrbit?", "A text-first rendering engine built in Python that strips ads/trackers for speed."),
+            ("What is Hybrid mode?", "LiteOrbit fetches and strips the page, then Chromium lays it out with the site's CSS and JavaScript off."),
             ("Where are downloads saved?", "Check Settings > Downloads. You can change the default folder there."),
             ("How to enable Dark Mode?", "Z-Orbit is Dark Mode native. It is always enabled."),
             ("Is my data private?", "Yes. History/Bookmarks are stored in a local SQLite DB on your machine."),
@@ -798,14 +1711,14 @@ class InternalPages:
             ("Keyboard Shortcuts?", "Ctrl+T (New Tab), Ctrl+W (Close Tab), Ctrl+R / F5 (Reload), F11 (Fullscreen)."),
             ("How to play Snake?", "Type z-orbit://snake in the address bar."),
             ("Does it support Video?", "Yes, LiteOrbit parses video tags, and Chromium supports full HTML5 media."),
-            ("How to clear history?", "Ctrl+H > Clear History."),
-            ("Import Bookmarks?", "Currently manual addition only via the Star icon."),
+            ("How to clear history?", "Ctrl+H > Clear History. Settings > Privacy can also expire old history automatically."),
+            ("Import Bookmarks?", "Menu > Import Bookmarks & History. Netscape HTML, JSON and CSV files are supported."),
             ("User Agent?", "Spoofs Chrome 120 on Windows 10 for maximum compatibility."),
             ("SSL Errors?", "LiteOrbit ignores SSL errors for broader compatibility."),
             ("Memory Usage?", "Chromium uses multi-process architecture. Use LiteOrbit to save RAM."),
             ("Offline Mode?", "Automatically detects offline state and offers a game."),
             ("Developer API?", "Use z-orbit://internals."),
-            ("Internal Protocols?", "snake, calc, help, internals, dependencies."),
+            ("Internal Protocols?", "snake, calc, help, internals, dependencies, storage, stats, tasks."),
             ("Updates?", "The browser is self-installing and verifies integrity on boot."),
             ("Why Z-Orbit?", "Because you needed a pro browser built in 30 minutes."),
             ("Easter Egg?", "Try typing 'z-orbit://snake' when offline.")
@@ -839,6 +1752,9 @@ class InternalPages:
                 <div class="faq-item"><code>z-orbit://calc</code><br>Pro Scientific Calculator.</div>
                 <div class="faq-item"><code>z-orbit://internals</code><br>Developer Python IDE.</div>
                 <div class="faq-item"><code>z-orbit://dependencies</code><br>System Info & Libs.</div>
+                <div class="faq-item"><code>z-orbit://storage</code><br>Database Size & Retention.</div>
+                <div class="faq-item"><code>z-orbit://stats</code><br>Browsing Statistics.</div>
+                <div class="faq-item"><code>z-orbit://tasks</code><br>Per-Tab Memory & CPU.</div>
                 <div class="faq-item"><code>z-orbit://help</code><br>This page.</div>
             </div>
 
@@ -876,7 +1792,698 @@ class InternalPages:
         </body>
         </html>
         """
+
+    @staticmethod
+    def get_storage_report():
+        stats = DB_CONTROLLER.get_storage_stats()
+        max_age = SETTINGS.value("history_max_age_days")
+        max_rows = SETTINGS.value("history_max_rows")
+        max_mb = SETTINGS.value("history_max_db_mb")
+        rows_html = ""
+        for label, value in [
+            ("Database File", DB_CONTROLLER.storage_path),
+            ("Database Size", f"{stats['size_bytes'] / (1024 * 1024):.2f} MB"),
+            ("Pages", f"{stats['page_count']} x {stats['page_size']} B"),
+            ("Free Pages", stats["freelist_count"]),
+            ("Fragmentation", f"{stats['fragmentation']:.1f}%"),
+            ("History Rows", stats["history_rows"]),
+            ("Bookmark Rows", stats["bookmarks_rows"]),
+            ("Download Rows", stats["downloads_rows"]),
+            ("Retention: Max Age", f"{max_age} days" if max_age else "Forever"),
+            ("Retention: Max Rows", max_rows or "Unlimited"),
+            ("Retention: Size Budget", f"{max_mb} MB" if max_mb else "Unlimited"),
+        ]:
+            rows_html += f"<tr><td>{label}</td><td>{value}</td></tr>"
+        return f"""
+        <html>
+        <head><title>Storage Diagnostics</title>
+        <style>body {{ background: #121212; color: #ddd; font-family: monospace; padding: 40px; }} h1 {{ color: #0078d4; }} td {{ padding: 6px 20px 6px 0; border-bottom: 1px solid #333; }} td:last-child {{ color: #0f0; }}</style>
+        </head>
+        <body>
+            <h1>Storage Diagnostics</h1>
+            <table>{rows_html}</table>
+        </body>
+        </html>
+        """
     
+    @staticmethod
+    def get_tasks_page():
+        rows = RESOURCE_MONITOR.snapshot()
+        rows_html = ""
+        for row in rows:
+            memory = DownloadEntryWidget.format_bytes(row["rss"]) if row["rss"] else "—"
+            if row["shared"] > 1: memory += f" (shared ×{row['shared']})"
+            cpu = "—" if row["cpu"] is None else f"{row['cpu']:.1f}%"
+            rows_html += (f"<tr class='{row['kind']}'><td>{html.escape(row['title'])}</td><td>{row['engine']}</td>"
+                          f"<td>{row['pid'] or '—'}</td><td>{memory}</td><td>{cpu}</td><td>{html.escape(row['state'])}</td></tr>")
+        return f"""
+        <html>
+        <head><title>Task Manager</title>
+        <style>
+            body {{ background: #121212; color: #ddd; font-family: 'Segoe UI', sans-serif; padding: 40px; }}
+            h1 {{ color: #0078d4; }}
+            table {{ border-collapse: collapse; width: 100%; font-size: 13px; }}
+            th {{ text-align: left; color: #888; border-bottom: 2px solid #333; padding: 6px 12px; }}
+            td {{ padding: 6px 12px; border-bottom: 1px solid #222; }}
+            tr.window td {{ color: #4da6ff; font-weight: bold; padding-top: 16px; }}
+            tr.tab td:first-child {{ padding-left: 28px; }}
+            .note {{ color: #666; margin-top: 20px; }}
+        </style>
+        </head>
+        <body>
+            <h1>Task Manager</h1>
+            <table>
+                <tr><th>Task</th><th>Engine</th><th>PID</th><th>Memory</th><th>CPU</th><th>State</th></tr>
+                {rows_html}
+            </table>
+            <p class="note">Total: {DownloadEntryWidget.format_bytes(ResourceMonitor.total_rss(rows))}. Snapshot taken when this page opened;
+            press Shift+Esc for the live Task Manager to sleep, close or end tabs.</p>
+        </body>
+        </html>
+        """
+
+    @staticmethod
+    def get_stats_page():
+        stats = DB_CONTROLLER.fetch_stats()
+
+        def bar_rows(rows, formatter=str):
+            peak = max((value for _, value in rows), default=0) or 1
+            return "".join(
+                f"<div class='row'><span class='label'>{html.escape(str(label))}</span>"
+                f"<span class='bar'><span style='width:{value / peak * 100:.1f}%'></span></span>"
+                f"<span class='value'>{formatter(value)}</span></div>"
+                for label, value in rows
+            ) or "<p class='empty'>No data yet.</p>"
+
+        def duration(seconds):
+            minutes = int(seconds // 60)
+            return f"{minutes // 60}h {minutes % 60}m" if minutes >= 60 else f"{minutes}m {int(seconds % 60)}s"
+
+        hourly = [(f"{hour:02d}:00", stats["hourly"].get(hour, 0)) for hour in range(24)]
+        return f"""
+        <html>
+        <head><title>Browsing Statistics</title>
+        <style>
+            body {{ background: #121212; color: #ddd; font-family: 'Segoe UI', sans-serif; padding: 40px; max-width: 1000px; margin: auto; }}
+            h1 {{ color: #0078d4; border-bottom: 2px solid #333; padding-bottom: 15px; }}
+            h2 {{ color: #4da6ff; margin-top: 30px; }}
+            .grid {{ display: grid; grid-template-columns: 1fr 1fr; gap: 20px; }}
+            .card {{ background: #1a1a1a; padding: 20px; border-radius: 8px; border: 1px solid #333; }}
+            .row {{ display: flex; align-items: center; gap: 10px; margin: 4px 0; font-size: 13px; }}
+            .label {{ width: 160px; overflow: hidden; text-overflow: ellipsis; white-space: nowrap; color: #aaa; }}
+            .bar {{ flex: 1; background: #222; height: 10px; border-radius: 5px; overflow: hidden; }}
+            .bar span {{ display: block; height: 100%; background: #0078d4; }}
+            .value {{ width: 70px; text-align: right; color: #fff; }}
+            .empty {{ color: #555; }}
+            .note {{ color: #e0a040; }}
+        </style>
+        </head>
+        <body>
+            <h1>Browsing Statistics</h1>
+            {"<p class='note'>Statistics are still being built from older history; totals will grow until that finishes.</p>" if stats["building"] else ""}
+            <div class="grid">
+                <div class="card"><h2>Top Sites</h2>{bar_rows(stats["top_sites"])}</div>
+                <div class="card"><h2>Time per Domain</h2>{bar_rows(stats["top_time"], duration)}</div>
+                <div class="card"><h2>Visits per Day (30 days)</h2>{bar_rows(stats["daily"])}</div>
+                <div class="card"><h2>Visits per Hour</h2>{bar_rows(hourly)}</div>
+                <div class="card"><h2>Engine Usage</h2>{bar_rows(stats["engines"])}</div>
+            </div>
+        </body>
+        </html>
+        """
+
+# --- INTERNAL SCHEME ---
+class InternalSchemeHandler(QWebEngineUrlSchemeHandler):
+    SCHEME = b"z-orbit"
+    ASSET_DIR = os.path.dirname(os.path.abspath(__file__))
+    # host -> (generator, tab title, cacheable); live reports are rendered on every request
+    PAGES = {
+        "snake": (InternalPages.get_snake_game, "Snake Game", True),
+        "calc": (InternalPages.get_calculator, "Scientific Matrix", True),
+        "dependencies": (InternalPages.get_dependencies, "System Dependencies", True),
+        "help": (InternalPages.get_help, "Help & Docs", True),
+        "offline": (InternalPages.get_offline_page, "System Offline", True),
+        "storage": (InternalPages.get_storage_report, "Storage Diagnostics", False),
+        "stats": (InternalPages.get_stats_page, "Browsing Statistics", False),
+        "tasks": (InternalPages.get_tasks_page, "Task Manager", False),
+    }
+    ASSETS = ["icon.ico"] # Served from next to the script as z-orbit://assets/<name>
+
+    def __init__(self):
+        super().__init__()
+        self.cache = {} # host or asset path -> (body, mime type)
+
+    @staticmethod
+    def register_scheme():
+        # Must run before QApplication is created
+        scheme = QWebEngineUrlScheme(InternalSchemeHandler.SCHEME)
+        scheme.setSyntax(QWebEngineUrlScheme.Syntax.Host)
+        scheme.setFlags(QWebEngineUrlScheme.Flag.SecureScheme | QWebEngineUrlScheme.Flag.LocalScheme
+                        | QWebEngineUrlScheme.Flag.LocalAccessAllowed)
+        QWebEngineUrlScheme.registerScheme(scheme)
+
+    def install(self, profile):
+        if profile.urlSchemeHandler(self.SCHEME) is None:
+            profile.installUrlSchemeHandler(self.SCHEME, self)
+
+    def title_for(self, url):
+        page = self.PAGES.get(QUrl(url).host())
+        return page[1] if page else "Z-Orbit Internal"
+
+    def resolve(self, url):
+        host = url.host()
+        if host == "assets":
+            name = url.path().lstrip("/")
+            if name not in self.ASSETS: return None
+            key = "assets/" + name
+            if key not in self.cache:
+                try:
+                    with open(os.path.join(self.ASSET_DIR, name), "rb") as f:
+                        body = f.read()
+                except OSError:
+                    return None
+                self.cache[key] = (body, mimetypes.guess_type(name)[0] or "application/octet-stream")
+            return self.cache[key]
+        if host in self.cache: return self.cache[host]
+        page = self.PAGES.get(host)
+        if not page: return None
+        content = page[0]().replace("<head>", '<head><meta charset="utf-8"><link rel="icon" href="z-orbit://assets/icon.ico">', 1)
+        entry = (content.encode("utf-8"), "text/html")
+        if page[2]: self.cache[host] = entry
+        return entry
+
+    def requestStarted(self, job):
+        entry = self.resolve(job.requestUrl())
+        if entry is None:
+            job.fail(QWebEngineUrlRequestJob.Error.UrlNotFound)
+            return
+        body, mime = entry
+        buffer = QBuffer(job) # Owned by the job so it lives until WebEngine has read it
+        buffer.setData(body)
+        buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+        job.reply(mime.encode(), buffer)
+
+INTERNAL_SCHEME = InternalSchemeHandler()
+
+# --- REQUEST FILTER ---
+class FilterEngine:
+    # EasyList-style network rules compiled so matching cost doesn't grow with the list: plain ||host^ rules
+    # (and hosts-file entries) live in a hashed domain table, and every other rule is filed under one
+    # token from its pattern, so a request only tries the handful of rules sharing a token with its URL
+    FORMAT = 1
+    TOKEN_RE = re.compile(r"[a-z0-9%]{2,}")
+    COMMON_TOKENS = {"http", "https", "www", "com", "net", "org", "js", "html", "php"}
+    DOMAIN_RULE_RE = re.compile(r"^\|\|([a-z0-9.-]+)\^\|?$")
+    HOSTS_RE = re.compile(r"^(?:0\.0\.0\.0|127\.0\.0\.1)\s+([a-z0-9.-]+)\s*$")
+    TYPE_OPTIONS = {"script", "image", "stylesheet", "subdocument", "xmlhttprequest", "media", "font",
+                    "object", "ping", "websocket", "other"}
+    TYPE_ALIASES = {"css": "stylesheet", "frame": "subdocument", "xhr": "xmlhttprequest"}
+    IGNORED_OPTIONS = {"match-case", "important", "all"} # Accepted, but don't change what a rule matches
+    RESOURCE_TYPES = {
+        "ResourceTypeScript": "script", "ResourceTypeImage": "image", "ResourceTypeFavicon": "image",
+        "ResourceTypeStylesheet": "stylesheet", "ResourceTypeSubFrame": "subdocument",
+        "ResourceTypeXhr": "xmlhttprequest", "ResourceTypeMedia": "media", "ResourceTypeFontResource": "font",
+        "ResourceTypeObject": "object", "ResourceTypePluginResource": "object", "ResourceTypePing": "ping",
+        "ResourceTypeCspReport": "ping", "ResourceTypeWebSocket": "websocket",
+    }
+
+    def __init__(self):
+        self.domains = ({}, {}) # (block, allow): host -> [options]
+        self.tokens = ({}, {}) # (block, allow): token -> [(regex source, options)]
+        self.generic = ([], []) # (block, allow): rules with no usable token
+        self.rule_count = 0
+        self.regex_cache = {}
+
+    @classmethod
+    def compile(cls, paths):
+        engine = cls()
+        for path in paths:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    engine.add_rule(line.strip())
+        return engine
+
+    def add_rule(self, line):
+        if not line or line[0] in "![" or "##" in line or "#@#" in line or "#?#" in line or "#$#" in line: return
+        hosts_entry = self.HOSTS_RE.match(line.lower())
+        if hosts_entry:
+            self.domains[0].setdefault(hosts_entry.group(1), []).append(None)
+            self.rule_count += 1
+            return
+        allow = 1 if line.startswith("@@") else 0
+        if allow: line = line[2:]
+        pattern, options = line, None
+        if "$" in line and not line.startswith("/"):
+            pattern, _, option_text = line.rpartition("$")
+            options = self.parse_options(option_text)
+            if options is False: return # Uses an option we can't honour, so it's safer to skip
+        if not pattern.startswith("/"): pattern = pattern.lower()
+        domain_rule = self.DOMAIN_RULE_RE.match(pattern)
+        if domain_rule:
+            self.domains[allow].setdefault(domain_rule.group(1), []).append(options)
+        else:
+            source = self.pattern_to_regex(pattern)
+            if source is None: return
+            token = None if pattern.startswith("/") else self.best_token(pattern, self.tokens[allow]) # Regex rules have no literal tokens to trust
+            if token:
+                self.tokens[allow].setdefault(token, []).append((source, options))
+            else:
+                self.generic[allow].append((source, options))
+        self.rule_count += 1
+
+    def parse_options(self, text):
+        types, excluded_types, third_party, include, exclude = set(), set(), None, set(), set()
+        for option in text.lower().split(","):
+            negated = option.startswith("~")
+            name = option.lstrip("~")
+            name = self.TYPE_ALIASES.get(name, name)
+            if name in self.TYPE_OPTIONS:
+                (excluded_types if negated else types).add(name)
+            elif name in ("third-party", "3p"):
+                third_party = not negated
+            elif name in ("first-party", "1p"):
+                third_party = negated
+            elif name.startswith("domain="):
+                for domain in name[7:].split("|"):
+                    if domain.startswith("~"): exclude.add(domain[1:])
+                    elif domain: include.add(domain)
+            elif name not in self.IGNORED_OPTIONS:
+                return False
+        if excluded_types and not types: types = self.TYPE_OPTIONS - excluded_types
+        if not (types or third_party is not None or include or exclude): return None
+        return (frozenset(types) or None, third_party, frozenset(include) or None, frozenset(exclude) or None)
+
+    @staticmethod
+    def pattern_to_regex(pattern):
+        if len(pattern) > 2 and pattern.startswith("/") and pattern.endswith("/"):
+            try:
+                re.compile(pattern[1:-1])
+            except re.error:
+                return None
+            return pattern[1:-1]
+        prefix = suffix = ""
+        if pattern.startswith("||"):
+            prefix, pattern = r"^[a-z][a-z0-9+.-]*://(?:[^/?#]*\.)?", pattern[2:]
+        elif pattern.startswith("|"):
+            prefix, pattern = "^", pattern[1:]
+        if pattern.endswith("|"):
+            suffix, pattern = "$", pattern[:-1]
+        if not pattern and not prefix: return None # A bare "*" or empty rule would block everything
+        body = "".join(".*" if c == "*" else r"(?:[^a-z0-9_.%-]|$)" if c == "^" else re.escape(c) for c in pattern)
+        return prefix + body + suffix
+
+    def best_token(self, pattern, index):
+        # Only tokens that can't be part of a longer URL token qualify: bounded on both sides by
+        # separators or anchors, never by a wildcard. The least used one keeps buckets short.
+        best = None
+        for match in self.TOKEN_RE.finditer(pattern):
+            token, start, end = match.group(), match.start(), match.end()
+            before = pattern[start - 1] if start else ""
+            after = pattern[end] if end < len(pattern) else ""
+            if before in ("", "*") or after in ("", "*") or token in self.COMMON_TOKENS: continue
+            if best is None or (len(index.get(token, ())), -len(token)) < (len(index.get(best, ())), -len(best)):
+                best = token
+        return best
+
+    @staticmethod
+    def host_suffixes(host):
+        parts = host.split(".")
+        return [".".join(parts[i:]) for i in range(len(parts))]
+
+    @staticmethod
+    def base_domain(host):
+        # Last two labels; a public suffix list would be more exact but isn't worth the dependency here
+        return ".".join(host.split(".")[-2:])
+
+    def options_match(self, options, resource, third_party, source_suffixes):
+        if options is None: return True
+        types, party, include, exclude = options
+        if types and resource not in types: return False
+        if party is not None and party != third_party: return False
+        if exclude and any(domain in exclude for domain in source_suffixes): return False
+        if include and not any(domain in include for domain in source_suffixes): return False
+        return True
+
+    def regex(self, source):
+        compiled = self.regex_cache.get(source)
+        if compiled is None:
+            compiled = self.regex_cache[source] = re.compile(source)
+        return compiled
+
+    def matches(self, kind, url, host_suffixes, tokens, resource, third_party, source_suffixes):
+        for host in host_suffixes:
+            for options in self.domains[kind].get(host, ()):
+                if self.options_match(options, resource, third_party, source_suffixes): return True
+        index = self.tokens[kind]
+        for token in tokens:
+            for source, options in index.get(token, ()):
+                if self.options_match(options, resource, third_party, source_suffixes) and self.regex(source).search(url):
+                    return True
+        for source, options in self.generic[kind]:
+            if self.options_match(options, resource, third_party, source_suffixes) and self.regex(source).search(url):
+                return True
+        return False
+
+    def should_block(self, url, source_host, resource):
+        url = url.lower()
+        host = urlparse(url).hostname or ""
+        source_host = source_host.lower()
+        host_suffixes = self.host_suffixes(host)
+        source_suffixes = self.host_suffixes(source_host) if source_host else []
+        third_party = bool(source_host) and self.base_domain(host) != self.base_domain(source_host)
+        tokens = set(self.TOKEN_RE.findall(url))
+        if not self.matches(0, url, host_suffixes, tokens, resource, third_party, source_suffixes): return False
+        return not self.matches(1, url, host_suffixes, tokens, resource, third_party, source_suffixes)
+
+    def save(self, path, signature):
+        state = {"format": self.FORMAT, "signature": signature, "domains": self.domains, "tokens": self.tokens,
+                 "generic": self.generic, "rule_count": self.rule_count}
+        with open(path + ".tmp", "wb") as f:
+            pickle.dump(state, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, path, signature):
+        # The cache is only trusted when it was built by this format from exactly the same list files.
+        # A damaged or foreign file can fail in any way while unpickling; all of them mean recompiling.
+        try:
+            with open(path, "rb") as f:
+                state = pickle.load(f)
+            if state.get("format") != cls.FORMAT or state.get("signature") != signature: return None
+            engine = cls()
+            engine.domains, engine.tokens, engine.generic = state["domains"], state["tokens"], state["generic"]
+            engine.rule_count = state["rule_count"]
+        except Exception:
+            return None
+        return engine
+
+class FilterCompileWorker(QThread):
+    compiled = pyqtSignal(object, str)
+    compile_failed = pyqtSignal(str)
+
+    def __init__(self, paths, cache_path, force):
+        super().__init__()
+        self.paths = paths
+        self.cache_path = cache_path
+        self.force = force
+
+    def run(self):
+        try:
+            signature = [(os.path.basename(p), os.path.getsize(p), os.path.getmtime(p)) for p in self.paths]
+            engine = None if self.force else FilterEngine.load(self.cache_path, signature)
+            if engine is not None:
+                self.compiled.emit(engine, "cache")
+                return
+            engine = FilterEngine.compile(self.paths)
+        except OSError as error:
+            self.compile_failed.emit(f"Filter lists could not be read: {error}")
+            return
+        try:
+            engine.save(self.cache_path, signature)
+        except OSError:
+            pass # Still usable; the next start just compiles again
+        self.compiled.emit(engine, "lists")
+
+class RequestFilter(QObject):
+    # Owns the compiled engine. Lists are plain text files in AppData/filters and the compiled
+    # index is cached next to them, so startup only recompiles after a list changes
+    status_changed = pyqtSignal()
+
+    def __init__(self):
+        super().__init__()
+        self.engine = None
+        self.worker = None
+        self.pending_force = None # Set when a reload is asked for while a compile is running
+        self.started = False
+        self.status = "Not loaded"
+        SETTINGS.changed.connect(self.on_setting_changed)
+
+    def on_setting_changed(self, key, value):
+        if key == "content_blocking":
+            self.started = True
+            self.reload()
+
+    def filter_dir(self):
+        path = os.path.join(QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation), "filters")
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def list_paths(self):
+        folder = self.filter_dir()
+        return sorted(os.path.join(folder, name) for name in os.listdir(folder) if name.lower().endswith(".txt"))
+
+    def start(self):
+        if self.started: return
+        self.started = True
+        self.reload()
+
+    def reload(self, force=False):
+        if self.worker and self.worker.isRunning():
+            self.pending_force = bool(self.pending_force) or force
+            return
+        if not SETTINGS.value("content_blocking"):
+            self.engine = None
+            self.set_status("Off")
+            return
+        paths = self.list_paths()
+        if not paths:
+            self.engine = None
+            self.set_status("No filter lists installed")
+            return
+        self.set_status("Compiling filter lists...")
+        self.worker = FilterCompileWorker(paths, os.path.join(self.filter_dir(), "compiled.index"), force)
+        self.worker.compiled.connect(self.on_compiled)
+        self.worker.compile_failed.connect(self.on_compile_failed)
+        self.worker.finished.connect(self.on_worker_finished)
+        self.worker.start()
+
+    def on_worker_finished(self):
+        self.worker.wait() # finished arrives just before isRunning() turns false
+        if self.pending_force is None: return
+        force, self.pending_force = self.pending_force, None
+        self.reload(force)
+
+    def on_compiled(self, engine, source):
+        if not SETTINGS.value("content_blocking"): return # Turned off mid-compile; the queued reload reports it
+        self.engine = engine
+        self.set_status(f"{engine.rule_count:,} rules active" + (" (from cache)" if source == "cache" else ""))
+
+    def on_compile_failed(self, reason):
+        self.engine = None
+        self.set_status(reason)
+
+    def set_status(self, text):
+        self.status = text
+        self.status_changed.emit()
+
+    def import_list(self, path):
+        name = os.path.basename(path)
+        if not name.lower().endswith(".txt"): name += ".txt"
+        shutil.copy(path, os.path.join(self.filter_dir(), name))
+        self.reload()
+
+REQUEST_FILTER = RequestFilter()
+
+class PageRequestFilter(QWebEngineUrlRequestInterceptor):
+    # Installed per page rather than on the profile so every tab can count what it blocked
+    blocked_changed = pyqtSignal()
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.view = parent
+        self.blocked = 0 # Ads and trackers
+        self.held_back = 0 # Data saver
+        self.saved_bytes = 0
+        self.image_urls = set() # Every image the page asked for, let through or not
+
+    @staticmethod
+    def image_key(url):
+        return url.adjusted(QUrl.UrlFormattingOption.RemoveFragment).toString()
+
+    def reset(self):
+        self.image_urls = set()
+        if self.blocked or self.held_back:
+            self.blocked = self.held_back = self.saved_bytes = 0
+            self.blocked_changed.emit()
+
+    def interceptRequest(self, info):
+        resource = info.resourceType().name
+        if resource == "ResourceTypeMainFrame":
+            self.reset()
+            return
+        resource = FilterEngine.RESOURCE_TYPES.get(resource, "other")
+        url = info.requestUrl()
+        if resource == "image": self.image_urls.add(self.image_key(url))
+        source_host = HybridSchemeHandler.unwrap(info.firstPartyUrl()).host()
+        if self.view.data_saver_flags and DATA_SAVER.holds_back(self.view.data_saver_flags, resource, url.host(), source_host):
+            info.block(True)
+            self.held_back += 1
+        else:
+            engine = REQUEST_FILTER.engine
+            if engine is None or not engine.should_block(url.toString(), source_host, resource): return
+            info.block(True)
+            self.blocked += 1
+        self.saved_bytes += DataSaver.ESTIMATED_BYTES.get(resource, DataSaver.ESTIMATED_BYTES["other"])
+        self.blocked_changed.emit()
+
+# --- DATA SAVER ---
+class DataSaver(QObject):
+    # Per-site rules live in SQLite but are read once into memory; lookups fall back from a host to its
+    # parent domains and are memoised, so deciding a navigation costs a dictionary hit
+    IMAGES, FONTS, MEDIA, THIRD_PARTY_SCRIPTS, NO_JAVASCRIPT = 1, 2, 4, 8, 16
+    DEFAULT_FLAGS = IMAGES | FONTS | MEDIA | THIRD_PARTY_SCRIPTS
+    LABELS = [(IMAGES, "Images"), (FONTS, "Web Fonts"), (MEDIA, "Audio and Video"),
+              (THIRD_PARTY_SCRIPTS, "Third-Party Scripts"), (NO_JAVASCRIPT, "All JavaScript")]
+    # Typical transfer sizes of what gets held back; blocked requests never report a size
+    ESTIMATED_BYTES = {"image": 30 * 1024, "font": 35 * 1024, "media": 500 * 1024, "script": 25 * 1024,
+                       "stylesheet": 15 * 1024, "subdocument": 40 * 1024, "other": 4 * 1024}
+    rules_changed = pyqtSignal()
+
+    def __init__(self):
+        super().__init__()
+        self.rules = None # host -> flags, loaded on first lookup
+        self.cache = {} # host -> effective flags
+        SETTINGS.changed.connect(self.on_setting_changed)
+
+    def on_setting_changed(self, key, value):
+        if key == "data_saver_default": self.invalidate()
+
+    def flags_for(self, host):
+        flags = self.cache.get(host)
+        if flags is None:
+            if self.rules is None:
+                self.rules = dict(DB_CONTROLLER.fetch_data_saver_rules())
+            flags = next((self.rules[suffix] for suffix in FilterEngine.host_suffixes(host) if suffix in self.rules), None)
+            if flags is None:
+                flags = self.DEFAULT_FLAGS if SETTINGS.value("data_saver_default") else 0
+            self.cache[host] = flags
+        return flags
+
+    def rule_for(self, host):
+        if self.rules is None: self.flags_for(host)
+        return self.rules.get(host)
+
+    def set_rule(self, host, flags):
+        # None removes the site's own rule so the default applies again
+        if self.rules is None: self.flags_for(host)
+        if flags is None:
+            DB_CONTROLLER.delete_data_saver_rule(host)
+            self.rules.pop(host, None)
+        else:
+            DB_CONTROLLER.set_data_saver_rule(host, flags)
+            self.rules[host] = flags
+        self.invalidate()
+
+    def invalidate(self):
+        self.cache.clear()
+        self.rules_changed.emit()
+
+    def holds_back(self, flags, resource, host, source_host):
+        if resource == "image": return bool(flags & self.IMAGES)
+        if resource == "font": return bool(flags & self.FONTS)
+        if resource == "media": return bool(flags & self.MEDIA)
+        if resource == "script" and flags & self.THIRD_PARTY_SCRIPTS:
+            return FilterEngine.base_domain(host) != FilterEngine.base_domain(source_host)
+        return False
+
+    @classmethod
+    def describe(cls, flags):
+        return ", ".join(label for flag, label in cls.LABELS if flags & flag) or "Off"
+
+DATA_SAVER = DataSaver()
+
+# --- LITEORBIT TRANSFORM ---
+class TransformProcess:
+    # One transform process, started from lite_transform.py itself so it never imports the browser or Qt.
+    # Lent to one LiteOrbit thread at a time.
+    def __init__(self):
+        if getattr(sys, "frozen", False):
+            command = [sys.executable, "--lite-transform-worker"]
+        else:
+            command = [sys.executable, lite_transform.__file__]
+        flags = subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, creationflags=flags)
+
+    def call(self, name, *args):
+        lite_transform.write_message(self.process.stdin, (name, args))
+        return lite_transform.read_message(self.process.stdout)
+
+    def kill(self):
+        self.process.kill()
+        self.process.wait()
+
+    def close(self):
+        try:
+            self.process.stdin.close() # The process exits once its input ends
+        except OSError:
+            pass
+
+class LiteTransformPool:
+    # The regex transforms (lite_transform.py) hold the GIL for as long as they run, which janks scrolling
+    # and typing while big pages load. With transform processes enabled, large documents go to a persistent
+    # transform process and the LiteOrbit thread just waits for the result; small ones aren't worth the round trip.
+    MIN_BYTES = 64 * 1024
+    TIMEOUT_S = 20
+
+    def __init__(self):
+        self.available = threading.Condition() # Called from every LiteOrbit thread
+        self.idle = []
+        self.busy = 0
+        self.stopped = False
+
+    def transform(self, function, raw, *args):
+        size = SETTINGS.value("lite_transform_processes")
+        worker = self.acquire(size) if size and len(raw) >= self.MIN_BYTES else None
+        if worker is None:
+            return function(raw, *args)
+        timer = threading.Timer(self.TIMEOUT_S, worker.kill) # A hung process is killed, which ends the read below
+        timer.start()
+        try:
+            ok, result = worker.call(function.__name__, raw, *args)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            # Crashed, killed or shut down meanwhile: drop the process and transform here instead
+            worker.kill()
+            worker = None
+            ok = False
+        finally:
+            timer.cancel()
+            self.release(worker, size)
+        return result if ok else function(raw, *args) # A failing transform raises its error here
+
+    def acquire(self, size):
+        with self.available:
+            while True:
+                if self.stopped: return None
+                while self.idle and len(self.idle) + self.busy > size:
+                    self.idle.pop().close() # The setting was lowered
+                if self.idle or self.busy < size: break
+                if not self.available.wait(self.TIMEOUT_S): return None # Every process is taken; don't queue forever
+            self.busy += 1
+            worker = self.idle.pop() if self.idle else None
+        if worker is None:
+            try:
+                worker = TransformProcess()
+            except OSError:
+                self.release(None, size)
+        return worker
+
+    def release(self, worker, size):
+        with self.available:
+            self.busy -= 1
+            if worker is not None:
+                if self.stopped or len(self.idle) + self.busy >= size: worker.close()
+                else: self.idle.append(worker)
+            self.available.notify()
+
+    def shutdown(self):
+        with self.available:
+            self.stopped = True
+            for worker in self.idle: worker.close()
+            self.idle = []
+            self.available.notify_all()
+
+LITE_TRANSFORM_POOL = LiteTransformPool()
+
 # --- LITEORBIT ENGINE ---
 class MiniJSEngine:
     def __init__(self):
@@ -893,11 +2500,14 @@ class MiniJSEngine:
 class LiteOrbitWorker(QThread):
     content_ready = pyqtSignal(str, str, str)
     error_occurred = pyqtSignal(str)
+    certificate_error = pyqtSignal(str)
+    download_requested = pyqtSignal(str)
 
-    def __init__(self, target_url, user_agent=DEFAULT_USER_AGENT):
+    def __init__(self, target_url, user_agent=DEFAULT_USER_AGENT, hybrid=False):
         super().__init__()
         self.url = target_url
         self.user_agent = user_agent
+        self.hybrid = hybrid
         self.js_engine = MiniJSEngine()
 
     def run(self):
@@ -907,81 +2517,109 @@ class LiteOrbitWorker(QThread):
                 self.content_ready.emit(f"<html><body><h1>Data URI Content</h1><p>{self.url[:50]}...</p></body></html>", self.url, "Data Content")
                 return
 
-            # CHECK OFFLINE STATUS
-            try:
-                socket.create_connection(("8.8.8.8", 53), timeout=3)
-            except OSError:
-                self.content_ready.emit(InternalPages.get_offline_page(), "z-orbit://offline", "System Offline")
-                return
+            # CHECK OFFLINE STATUS (pages served from this machine load without a connection)
+            if urlparse(self.url).hostname not in ("localhost", "127.0.0.1", "::1"):
+                try:
+                    socket.create_connection(("8.8.8.8", 53), timeout=3).close()
+                except OSError:
+                    self.content_ready.emit(InternalPages.get_offline_page(), "z-orbit://offline", "System Offline")
+                    return
 
             ssl_context = ssl.create_default_context()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
+            if not self.hybrid:
+                ssl_context.check_hostname = False
+                ssl_context.verify_mode = ssl.CERT_NONE
+            # Hybrid pages are shown to Chromium under their real https:// URL, so their certificates are checked
 
             request = urllib.request.Request(self.url, headers={'User-Agent': self.user_agent})
             
             with urllib.request.urlopen(request, timeout=15, context=ssl_context) as response:
                 content_type = response.headers.get('Content-Type', '').lower()
                 if 'text/html' not in content_type and 'text/plain' not in content_type:
-                    self.error_occurred.emit(f"LiteOrbit cannot render content type: {content_type}")
+                    # Not a page: hand the link to the download engine instead of failing
+                    self.download_requested.emit(response.geturl())
                     return
 
-                raw_html = response.read().decode('utf-8', errors='ignore')
-                title_search = re.search('<title>(.*?)</title>', raw_html, re.IGNORECASE)
-                page_title = title_search.group(1) if title_search else urlparse(self.url).netloc
-                base_url = self.url
-                
-                # Enhanced Asset Resolver
-                def fix_src(match):
-                    tag = match.group(0)
-                    src_match = re.search(r'src=["\'](.*?)["\']', tag)
-                    if src_match:
-                        original_src = src_match.group(1)
-                        if original_src.startswith('data:'): return tag
-                        full_src = urljoin(base_url, original_src)
-                        return tag.replace(original_src, full_src)
-                    return tag
-
-                processed_html = re.sub(r'<img.*?>', fix_src, raw_html, flags=re.IGNORECASE)
-                processed_html = re.sub(r'<video.*?>', fix_src, processed_html, flags=re.IGNORECASE)
-                processed_html = re.sub(r'<audio.*?>', fix_src, processed_html, flags=re.IGNORECASE)
-
-                # Add Controls to Media
-                processed_html = re.sub(r'<video', '<video controls style="max-width:100%; border-radius:8px;"', processed_html)
-                processed_html = re.sub(r'<audio', '<audio controls style="width:100%;"', processed_html)
-
-                # Convert Buttons
-                processed_html = re.sub(r'<button(.*?)>(.*?)</button>', 
-                                      r'<a href="#" style="background:#0078d4;color:white;padding:6px 12px;border-radius:4px;text-decoration:none;display:inline-block;" \1>\2</a>', 
-                                      processed_html, flags=re.IGNORECASE)
-
-                # CSS Grid/Flex Simulation
-                processed_html = processed_html.replace('<div', '<div class="block-element"')
-
-                # Clean Heavy Scripts
-                processed_html = re.sub(r'<script.*?>.*?</script>', '', processed_html, flags=re.DOTALL | re.IGNORECASE)
-                processed_html = re.sub(r'<style.*?>.*?</style>', '', processed_html, flags=re.DOTALL | re.IGNORECASE)
-                processed_html = re.sub(r'<iframe.*?>.*?</iframe>', '', processed_html, flags=re.DOTALL | re.IGNORECASE)
-
-                lite_css = """
-                <style>
-                    body { font-family: 'Segoe UI', sans-serif; line-height: 1.6; color: #e0e0e0; background-color: #121212; padding: 20px; max-width: 1000px; margin: 0 auto; }
-                    h1, h2, h3 { color: #0078d4; border-bottom: 1px solid #333; padding-bottom: 10px; }
-                    a { color: #4da6ff; text-decoration: none; }
-                    a:hover { text-decoration: underline; color: #80c1ff; }
-                    img { max-width: 100%; border-radius: 4px; border: 1px solid #333; margin: 10px 0; }
-                    pre { background: #1a1a1a; padding: 10px; border-radius: 4px; border: 1px solid #333; overflow-x: auto; }
-                    blockquote { border-left: 4px solid #0078d4; padding-left: 15px; color: #999; }
-                    .block-element { margin-bottom: 10px; }
-                </style>
-                """
-                
-                final_output = lite_css + processed_html
-                self.content_ready.emit(final_output, self.url, page_title)
+                raw = response.read()
+                if self.hybrid:
+                    document, page_title = LITE_TRANSFORM_POOL.transform(transform_hybrid_html, raw, self.url, response.geturl(),
+                                                                         'text/html' not in content_type)
+                    self.content_ready.emit(document, self.url, page_title)
+                    return
+                document, page_title = LITE_TRANSFORM_POOL.transform(transform_lite_html, raw, self.url)
+                self.content_ready.emit(document, self.url, page_title)
 
         except Exception as e:
+            reason = e.reason if isinstance(e, urllib.error.URLError) else e
+            if isinstance(reason, ssl.SSLCertVerificationError):
+                self.certificate_error.emit(reason.verify_message or str(reason))
+                return
             self.error_occurred.emit(str(e))
 
+# --- HYBRID ENGINE ---
+class HybridSchemeHandler(QWebEngineUrlSchemeHandler):
+    # Hybrid tabs are ChromiumViews with JavaScript off. Their pages are fetched and stripped by a
+    # LiteOrbitWorker and served here, so WebEngine only lays out markup and CSS.
+    # lite-orbit:https://example.com/ wraps the page's real address
+    SCHEME = b"lite-orbit"
+    PREFIX = "lite-orbit:"
+
+    def __init__(self):
+        super().__init__()
+        self.jobs = {} # worker -> request job still waiting for it
+
+    @staticmethod
+    def register_scheme():
+        # Must run before QApplication is created
+        scheme = QWebEngineUrlScheme(HybridSchemeHandler.SCHEME)
+        scheme.setSyntax(QWebEngineUrlScheme.Syntax.Path)
+        scheme.setFlags(QWebEngineUrlScheme.Flag.SecureScheme)
+        QWebEngineUrlScheme.registerScheme(scheme)
+
+    def install(self, profile):
+        if profile.urlSchemeHandler(self.SCHEME) is None:
+            profile.installUrlSchemeHandler(self.SCHEME, self)
+
+    @classmethod
+    def wrap(cls, url):
+        return QUrl(cls.PREFIX + url.toString()) if url.scheme() in ("http", "https") else url
+
+    @classmethod
+    def unwrap(cls, url):
+        text = url.toString()
+        return QUrl(text[len(cls.PREFIX):]) if text.startswith(cls.PREFIX) else url
+
+    def requestStarted(self, job):
+        target = self.unwrap(job.requestUrl())
+        if target.scheme() not in ("http", "https") or job.requestMethod() != b"GET":
+            job.fail(QWebEngineUrlRequestJob.Error.RequestDenied)
+            return
+        worker = LiteOrbitWorker(target.toString(), SETTINGS.value("custom_user_agent"), hybrid=True)
+        worker.setParent(self) # Runs to the end even when its job goes away first, then deletes itself
+        self.jobs[worker] = job
+        job.destroyed.connect(lambda: self.jobs.pop(worker, None)) # Tab closed or navigated away first
+        worker.content_ready.connect(lambda content, url, title: self.reply(worker, content))
+        worker.error_occurred.connect(lambda error: self.reply(worker, f"<div style='padding:20px; color:#ff5555;'><h1>Render Failure</h1><p>Reason: {html.escape(error)}</p></div>"))
+        worker.certificate_error.connect(lambda error: self.reply(worker, f"<div style='padding:20px; color:#ff5555;'><h1>Certificate Error</h1><p>The connection to {html.escape(target.host())} is not secure: {html.escape(error)}.</p><p>The page was not loaded.</p></div>"))
+        worker.download_requested.connect(lambda url: self.redirect(worker, url))
+        worker.finished.connect(worker.deleteLater)
+        worker.start()
+
+    def reply(self, worker, content):
+        job = self.jobs.pop(worker, None)
+        if job is None: return
+        buffer = QBuffer(job)
+        buffer.setData(content.encode("utf-8"))
+        buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+        job.reply(b"text/html", buffer)
+
+    def redirect(self, worker, url):
+        # Not a page: WebEngine follows the real URL and hands the response to the download panel
+        job = self.jobs.pop(worker, None)
+        if job is not None: job.redirect(QUrl(url))
+
+HYBRID_SCHEME = HybridSchemeHandler()
+
 class LiteOrbitView(QTextBrowser):
     title_updated = pyqtSignal(str)
     url_updated = pyqtSignal(QUrl)
@@ -994,11 +2632,12 @@ class LiteOrbitView(QTextBrowser):
         self.anchorClicked.connect(self.handle_anchor_click)
         self.current_url = QUrl("about:blank")
         self.zoom_factor_val = 1.0
+        self.engine_tab = None
+        self.last_active = time.monotonic()
+        self.pending_scroll = None
+        self.worker = None
+        self.source_size = 0
         self.setHtml("<h2 style='color:#666; text-align:center; margin-top:100px;'>LiteOrbit Engine Initialized</h2>")
-        
-        # Load user agent from settings
-        settings = QSettings("ZOrbitCorp", "ProMax")
-        self.custom_ua = settings.value("custom_user_agent", DEFAULT_USER_AGENT)
 
     def load_url(self, url):
         self.current_url = url
@@ -1006,18 +2645,46 @@ class LiteOrbitView(QTextBrowser):
         self.load_progress.emit(15)
         self.setHtml(f"<div style='text-align:center; margin-top:50px; color:#888;'><h1>Processing via LiteOrbit...</h1><p>Analyzing: {url.toString()}</p></div>")
         
-        self.worker = LiteOrbitWorker(url.toString(), self.custom_ua)
+        self.release_worker()
+        self.worker = LiteOrbitWorker(url.toString(), SETTINGS.value("custom_user_agent"))
+        # Owned by the application rather than the view: a tab closed mid-fetch must not destroy a running
+        # thread, and the worker deletes itself once done instead of living as long as the tab
+        self.worker.setParent(QApplication.instance())
         self.worker.content_ready.connect(self.on_worker_success)
         self.worker.error_occurred.connect(self.on_worker_error)
+        self.worker.download_requested.connect(self.on_download_requested)
+        self.worker.finished.connect(self.on_worker_finished)
+        self.worker.finished.connect(self.worker.deleteLater)
         self.worker.start()
 
+    def release_worker(self):
+        # A superseded fetch still runs to the end, but its result must not replace the newer page
+        if self.worker is None: return
+        self.worker.content_ready.disconnect(self.on_worker_success)
+        self.worker.error_occurred.disconnect(self.on_worker_error)
+        self.worker.download_requested.disconnect(self.on_download_requested)
+        self.worker = None
+
+    def on_worker_finished(self):
+        if self.sender() is self.worker: self.worker = None
+
     def on_worker_success(self, html_content, url_str, page_title):
         self.setHtml(html_content)
+        self.source_size = len(html_content)
+        if self.pending_scroll:
+            self.horizontalScrollBar().setValue(int(self.pending_scroll[0]))
+            self.verticalScrollBar().setValue(int(self.pending_scroll[1]))
+            self.pending_scroll = None
         self.title_updated.emit(f"Lite: {page_title}")
         self.load_progress.emit(100)
         # Only add history if not incognito
         if not self.main_window.is_incognito:
-            DB_CONTROLLER.add_history_entry(page_title, url_str)
+            DB_CONTROLLER.add_history_entry(page_title, url_str, "LiteOrbit")
+
+    def on_download_requested(self, url_str):
+        self.setHtml(f"<div style='text-align:center; margin-top:50px; color:#888;'><h1>Download Started</h1><p>{html.escape(url_str)}</p></div>")
+        self.load_progress.emit(100)
+        self.main_window.start_segmented_download(url_str)
 
     def on_worker_error(self, error_msg):
         self.setHtml(f"<div style='padding:20px; color:#ff5555;'><h1>Render Failure</h1><p>Reason: {error_msg}</p></div>")
@@ -1033,9 +2700,23 @@ class LiteOrbitView(QTextBrowser):
     def go_forward(self): pass
     def set_zoom(self, factor): pass
     def get_zoom(self): return 1.0
-    def set_content(self, html): self.setHtml(html)
+    def get_scroll(self): return (self.horizontalScrollBar().value(), self.verticalScrollBar().value())
+    def set_scroll(self, x, y): self.pending_scroll = (x, y) if x or y else None
+    def scroll_signal(self): return self.verticalScrollBar().valueChanged
 
 class SecurityManager(QWebEnginePage):
+    def acceptNavigationRequest(self, url, nav_type, is_main_frame):
+        view = self.parent()
+        if is_main_frame and isinstance(view, ChromiumView):
+            # Links on a hybrid page point at the real site; they go back through the LiteOrbit fetch.
+            # Form submissions and redirects load directly, still with JavaScript off
+            if view.hybrid and nav_type == QWebEnginePage.NavigationType.NavigationTypeLinkClicked and url.scheme() in ("http", "https"):
+                QTimer.singleShot(0, lambda: view.load_url(url))
+                return False
+            # Data saver settings have to be in place before the new document starts loading
+            view.apply_data_saver(HybridSchemeHandler.unwrap(url).host())
+        return super().acceptNavigationRequest(url, nav_type, is_main_frame)
+
     def featurePermissionRequested(self, securityOrigin, feature):
         feature_name = "Unknown Resource"
         if feature == QWebEnginePage.Feature.Geolocation: feature_name = "Location"
@@ -1077,26 +2758,1133 @@ class ChromiumView(QWebEngineView):
         settings.setAttribute(QWebEngineSettings.WebAttribute.PlaybackRequiresUserGesture, False)
         
         # Connect Native Signals to Wrapper Signals
-        self.urlChanged.connect(self.url_updated)
+        self.urlChanged.connect(self.on_url_changed)
         self.titleChanged.connect(self.title_updated)
         self.loadProgress.connect(self.load_progress)
 
+        self.engine_tab = None # Set once the view is claimed by a tab
+        self.hybrid = False
+        self.last_active = time.monotonic()
+        self.pending_scroll = None
+        self.clear_warmup_history = False
+        self.loadFinished.connect(self.apply_pending_scroll)
+        self.page().lifecycleStateChanged.connect(self.on_lifecycle_changed)
+        self.data_saver_flags = 0
+        self.request_filter = PageRequestFilter(self)
+        self.page().setUrlRequestInterceptor(self.request_filter)
+        self.loadFinished.connect(self.count_held_back_images)
+
     def createWindow(self, _type):
-        return self.main_window.add_new_tab()
+        return self.main_window.add_popup_tab()
+
+    def on_lifecycle_changed(self, state):
+        if self.engine_tab: self.main_window.on_tab_lifecycle_changed(self.engine_tab)
+
+    def on_url_changed(self, qurl):
+        self.url_updated.emit(HybridSchemeHandler.unwrap(qurl))
+
+    def make_hybrid(self):
+        # For good: the view only ever shows pages pre-fetched through the lite-orbit scheme
+        self.hybrid = True
+        settings = self.settings()
+        settings.setAttribute(QWebEngineSettings.WebAttribute.JavascriptEnabled, False)
+        settings.setAttribute(QWebEngineSettings.WebAttribute.PluginsEnabled, False)
 
     # Wrapper Methods for Polymorphism
-    def load_url(self, url): self.setUrl(url)
+    def load_url(self, url): self.setUrl(HybridSchemeHandler.wrap(url) if self.hybrid else url)
     def reload_page(self): self.reload()
     def go_back(self): self.back()
     def go_forward(self): self.forward()
-    def get_url(self): return self.url()
+    def get_url(self): return HybridSchemeHandler.unwrap(self.url())
     def get_title(self): return self.title()
-    def set_content(self, html): self.setHtml(html)
+    def get_scroll(self):
+        position = self.page().scrollPosition()
+        return (position.x(), position.y())
+    def set_scroll(self, x, y): self.pending_scroll = (x, y) if x or y else None
+    def scroll_signal(self): return self.page().scrollPositionChanged
+
+    def apply_data_saver(self, host):
+        flags = DATA_SAVER.flags_for(host) if host else 0
+        if flags == self.data_saver_flags: return
+        self.data_saver_flags = flags
+        settings = self.settings()
+        settings.setAttribute(QWebEngineSettings.WebAttribute.AutoLoadImages, not flags & DataSaver.IMAGES)
+        settings.setAttribute(QWebEngineSettings.WebAttribute.JavascriptEnabled, not (flags & DataSaver.NO_JAVASCRIPT or self.hybrid))
+
+    def count_held_back_images(self, ok):
+        # With AutoLoadImages off most images are never requested, so they are counted in the page instead.
+        # The application world still runs when the page's own JavaScript is disabled. Lazy and inline
+        # images would not have been fetched anyway.
+        if ok and self.data_saver_flags & DataSaver.IMAGES:
+            self.page().runJavaScript(
+                "[...new Set(Array.from(document.images).filter(i => !i.naturalWidth && i.loading !== 'lazy')"
+                ".map(i => i.currentSrc || i.src).filter(src => /^https?:/.test(src)))]",
+                QWebEngineScript.ScriptWorldId.ApplicationWorld, self.add_held_back_images)
+
+    def add_held_back_images(self, urls):
+        # Images the interceptor saw were either requested (and are just broken) or already counted as held back
+        seen = self.request_filter.image_urls
+        count = len({key for key in (PageRequestFilter.image_key(QUrl(url)) for url in urls or []) if key not in seen})
+        if not count: return
+        self.request_filter.held_back += count
+        self.request_filter.saved_bytes += count * DataSaver.ESTIMATED_BYTES["image"]
+        self.request_filter.blocked_changed.emit()
+
+    def apply_pending_scroll(self, ok):
+        if ok and self.pending_scroll:
+            # The application world also runs on pages with JavaScript disabled
+            self.page().runJavaScript("window.scrollTo(%d, %d);" % self.pending_scroll, QWebEngineScript.ScriptWorldId.ApplicationWorld)
+        self.pending_scroll = None
+        # A claimed spare keeps the about:blank it was warmed with as a back entry until the first real page
+        if self.clear_warmup_history and self.url().toString() != "about:blank":
+            self.clear_warmup_history = False
+            self.history().clear()
+
+# --- SPARE VIEW POOL ---
+class SpareViewPool(QObject):
+    REPLENISH_DELAY_MS = 1000 # Waits for a quiet moment so bursts of new tabs don't compete with warming
+
+    def __init__(self):
+        super().__init__()
+        self.spares = {} # profile -> [ChromiumView]
+        self.wanted = []
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(self.REPLENISH_DELAY_MS)
+        self.timer.timeout.connect(self.replenish)
+        SETTINGS.changed.connect(self.on_setting_changed)
+
+    def on_setting_changed(self, key, value):
+        if key == "spare_tab_count":
+            for profile in self.spares: self.schedule(profile)
+
+    def claim(self, main_window, profile):
+        pool = self.spares.get(profile)
+        if pool:
+            view = pool.pop()
+            view.main_window = main_window
+            view.clear_warmup_history = True
+        else:
+            view = ChromiumView(main_window, profile)
+        self.schedule(profile)
+        return view
+
+    def schedule(self, profile):
+        if profile not in self.wanted: self.wanted.append(profile)
+        self.timer.start()
+
+    def replenish(self):
+        size = SETTINGS.value("spare_tab_count")
+        for profile in self.wanted:
+            pool = self.spares.setdefault(profile, [])
+            while len(pool) < size:
+                # Loading about:blank starts the renderer process, the expensive part of a new tab
+                view = ChromiumView(None, profile)
+                view.setUrl(QUrl("about:blank"))
+                pool.append(view)
+            while len(pool) > size:
+                pool.pop().deleteLater()
+        self.wanted = []
+
+    def discard(self, profile):
+        # Spares hold pages on the profile, so they have to go before an off-the-record profile does
+        for view in self.spares.pop(profile, []):
+            view.deleteLater()
+        if profile in self.wanted: self.wanted.remove(profile)
+
+    def drain(self):
+        for profile in list(self.spares):
+            self.discard(profile)
+
+SPARE_VIEWS = SpareViewPool()
+
+# --- PROFILES ---
+class ProfileManager(QObject):
+    # Regular windows share the default profile and incognito windows share one off-the-record profile,
+    # so a session runs at most one set of private network, cache and storage contexts. Incognito windows
+    # hold the profile while open; the last one to close takes it down with it.
+    def __init__(self):
+        super().__init__()
+        self.default = None
+        self.incognito = None
+        self.incognito_windows = []
+        SETTINGS.changed.connect(self.on_setting_changed)
+
+    def setup(self, profile):
+        profile.setHttpUserAgent(SETTINGS.value("custom_user_agent"))
+        profile.downloadRequested.connect(self.route_download)
+        INTERNAL_SCHEME.install(profile)
+        HYBRID_SCHEME.install(profile)
+        REQUEST_FILTER.start()
+        STARTUP_PROFILE.mark("webengine profile")
+        return profile
+
+    def acquire(self, window):
+        if not window.is_incognito:
+            if self.default is None: self.default = self.setup(QWebEngineProfile.defaultProfile())
+            return self.default
+        if self.incognito is None:
+            self.incognito = self.setup(QWebEngineProfile(""))
+        self.incognito_windows.append(window)
+        return self.incognito
+
+    def release(self, window):
+        if window not in self.incognito_windows: return
+        self.incognito_windows.remove(window)
+        if self.incognito_windows: return
+        profile, self.incognito = self.incognito, None
+        # Spares hold pages on the profile, and the window's own pages go before its last child
+        SPARE_VIEWS.discard(profile)
+        profile.setParent(window)
+
+    def route_download(self, item):
+        # A profile serves several windows; the download belongs to the one whose page started it
+        profile = self.sender()
+        view = item.page().parent() if item.page() is not None else None
+        window = view.main_window if isinstance(view, ChromiumView) else None
+        if window is None:
+            window = next((window for window in reversed(ZOrbitWindow.open_windows) if window.profile is profile), None)
+        if window is None:
+            item.cancel()
+            return
+        window.initiate_download(item)
+
+    def on_setting_changed(self, key, value):
+        if key == "custom_user_agent":
+            for profile in (self.default, self.incognito):
+                if profile is not None: profile.setHttpUserAgent(value)
+
+PROFILES = ProfileManager()
+
+# --- ENGINE TAB ---
+class EngineTab(QStackedWidget):
+    # The widget behind every browser tab. Engine views are created on first use and share the tab's URL,
+    # so switching engines is a stack flip; a restored tab has no views at all until it is first shown
+    url_updated = pyqtSignal(QUrl)
+    title_updated = pyqtSignal(str)
+    load_progress = pyqtSignal(int)
+    scroll_changed = pyqtSignal()
+
+    def __init__(self, main_window, url, engine, title="", scroll=(0, 0)):
+        super().__init__()
+        self.main_window = main_window
+        self.url = url
+        self.title = title
+        self.titles = {} # engine -> last title it reported
+        self.engine = engine
+        self.views = {} # engine -> view, only for engines created so far
+        self.scroll = scroll
+        self.pinned = False
+        self.last_active = time.monotonic()
+        self.session_id = None
+        self.session_url = url
+
+    def current_view(self):
+        return self.views.get(self.engine)
+
+    def create_view(self, engine):
+        if engine == "LiteOrbit":
+            view = LiteOrbitView(self.main_window)
+        else:
+            view = SPARE_VIEWS.claim(self.main_window, self.main_window.get_profile())
+            if engine == "Hybrid": view.make_hybrid()
+            view.request_filter.blocked_changed.connect(lambda: self.main_window.update_shield(self))
+        view.engine_tab = self
+        view.url_updated.connect(lambda q: self.on_view_url(view, q))
+        view.title_updated.connect(lambda t: self.on_view_title(engine, view, t))
+        view.load_progress.connect(lambda p: view is self.current_view() and self.load_progress.emit(p))
+        view.scroll_signal().connect(lambda *args: view is self.current_view() and self.scroll_changed.emit())
+        self.views[engine] = view
+        self.addWidget(view)
+        return view
+
+    def show_engine(self, engine, url=None):
+        # Navigates when given a URL; otherwise an engine already showing the tab's URL is just brought forward
+        if url is not None: self.url = url.toString()
+        if self.url.startswith("z-orbit://"): engine = "Chromium" # Internal pages are only served to WebEngine
+        previous = self.current_view()
+        view = self.views.get(engine)
+        if view is not None and view is previous:
+            if url is not None: view.load_url(url)
+            return
+        scroll = self.get_scroll()
+        if previous: previous.last_active = time.monotonic()
+        self.engine = engine
+        if view is None:
+            view = self.create_view(engine)
+            stale = self.url != "about:blank"
+        else:
+            stale = view.get_url().toString() != self.url
+        if stale:
+            view.set_scroll(*scroll)
+            view.load_url(QUrl(self.url))
+        self.setCurrentWidget(view)
+        self.activate()
+        # The URL is shared, so only the title can differ between engines
+        self.title = self.titles.get(engine) or self.title or self.url
+        self.title_updated.emit(self.title)
+        self.main_window.on_tab_lifecycle_changed(self)
+
+    def activate(self):
+        if not self.views:
+            self.show_engine(self.engine)
+            return
+        view = self.current_view()
+        view.last_active = time.monotonic()
+        if isinstance(view, ChromiumView) and view.page().lifecycleState() != QWebEnginePage.LifecycleState.Active:
+            view.page().setLifecycleState(QWebEnginePage.LifecycleState.Active) # Discarded pages reload here
+
+    def stamp(self, now):
+        self.last_active = now
+        if self.current_view(): self.current_view().last_active = now
+
+    def request_filter(self):
+        view = self.current_view()
+        return view.request_filter if isinstance(view, ChromiumView) else None
+
+    def web_views(self):
+        # Chromium and Hybrid views, each with its own page and renderer
+        return [view for view in self.views.values() if isinstance(view, ChromiumView)]
+
+    def is_sleeping(self):
+        view = self.current_view()
+        return isinstance(view, ChromiumView) and view.page().lifecycleState() != QWebEnginePage.LifecycleState.Active
+
+    def drop_idle_engines(self):
+        # Frees every engine the tab isn't showing; flipping back to one reloads it
+        dropped = [self.views.pop(engine) for engine in list(self.views) if engine != self.engine]
+        for view in dropped:
+            self.removeWidget(view)
+            view.deleteLater()
+        return dropped
+
+    def on_view_url(self, view, qurl):
+        if view is not self.current_view(): return
+        self.url = qurl.toString()
+        self.url_updated.emit(qurl)
+
+    def on_view_title(self, engine, view, title):
+        self.titles[engine] = title
+        if view is not self.current_view(): return
+        self.title = title
+        self.title_updated.emit(title)
+
+    def load_url(self, url):
+        if self.views:
+            self.current_view().load_url(url)
+        else:
+            self.url = url.toString()
+
+    def reload_page(self):
+        if self.views: self.current_view().reload_page()
+    def go_back(self):
+        if self.views: self.current_view().go_back()
+    def go_forward(self):
+        if self.views: self.current_view().go_forward()
+    def get_url(self): return QUrl(self.url)
+    def get_title(self): return self.title
+    def get_scroll(self): return self.current_view().get_scroll() if self.views else self.scroll
+    def set_scroll(self, x, y):
+        self.scroll = (x, y)
+        if self.views: self.current_view().set_scroll(x, y)
+    def scroll_signal(self): return self.scroll_changed
+
+# --- TAB LIFECYCLE ---
+class ProcessProbe:
+    @staticmethod
+    def rss_bytes(pid):
+        if not pid: return 0
+        if psutil:
+            try:
+                return psutil.Process(pid).memory_info().rss
+            except psutil.Error:
+                return 0
+        if sys.platform.startswith("linux"):
+            try:
+                with open(f"/proc/{pid}/status") as status:
+                    for line in status:
+                        if line.startswith("VmRSS:"):
+                            return int(line.split()[1]) * 1024
+            except OSError:
+                pass
+            return 0
+        if sys.platform == "win32":
+            return ProcessProbe.windows_rss(pid)
+        return 0
+
+    @staticmethod
+    def cpu_seconds(pid):
+        # Total user + system CPU time consumed by the process so far
+        if not pid: return 0.0
+        if psutil:
+            try:
+                times = psutil.Process(pid).cpu_times()
+                return times.user + times.system
+            except psutil.Error:
+                return 0.0
+        if sys.platform.startswith("linux"):
+            try:
+                with open(f"/proc/{pid}/stat") as stat:
+                    fields = stat.read().rpartition(")")[2].split()
+                return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+            except (OSError, IndexError, ValueError):
+                return 0.0
+        if sys.platform == "win32":
+            return ProcessProbe.windows_cpu(pid)
+        return 0.0
+
+    @staticmethod
+    def windows_cpu(pid):
+        import ctypes
+        from ctypes import wintypes
+        kernel32 = ctypes.windll.kernel32
+        kernel32.OpenProcess.restype = wintypes.HANDLE
+        handle = kernel32.OpenProcess(0x1000, False, pid) # QUERY_LIMITED_INFORMATION
+        if not handle: return 0.0
+        try:
+            creation, exited, kernel, user = (wintypes.FILETIME() for _ in range(4))
+            if not kernel32.GetProcessTimes(handle, ctypes.byref(creation), ctypes.byref(exited), ctypes.byref(kernel), ctypes.byref(user)):
+                return 0.0
+            # FILETIME counts 100 ns intervals
+            return sum((t.dwHighDateTime << 32 | t.dwLowDateTime) for t in (kernel, user)) / 1e7
+        finally:
+            kernel32.CloseHandle(handle)
+
+    @staticmethod
+    def windows_rss(pid):
+        import ctypes
+        from ctypes import wintypes
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+                (name, ctypes.c_size_t) for name in ("PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage",
+                    "QuotaPagedPoolUsage", "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage")]
+        kernel32 = ctypes.windll.kernel32
+        kernel32.OpenProcess.restype = wintypes.HANDLE
+        handle = kernel32.OpenProcess(0x1000 | 0x0010, False, pid) # QUERY_LIMITED_INFORMATION | VM_READ
+        if not handle: return 0
+        try:
+            counters = ProcessMemoryCounters()
+            counters.cb = ctypes.sizeof(counters)
+            if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+                return counters.WorkingSetSize
+            return 0
+        finally:
+            kernel32.CloseHandle(handle)
+
+class TabLifecycleManager(QObject):
+    SWEEP_INTERVAL_MS = 30 * 1000
+    STATES = [QWebEnginePage.LifecycleState.Active, QWebEnginePage.LifecycleState.Frozen, QWebEnginePage.LifecycleState.Discarded]
+
+    def __init__(self):
+        super().__init__()
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.SWEEP_INTERVAL_MS)
+        self.timer.timeout.connect(self.sweep)
+
+    def start(self):
+        self.timer.start()
+
+    def chromium_tabs(self):
+        # Yields (view, is_foreground) for every WebEngine view across all browser windows,
+        # including ones kept behind whatever engine the tab is currently showing
+        for window in ZOrbitWindow.open_windows:
+            current = window.tab_manager.currentWidget()
+            for index in range(window.tab_manager.count()):
+                tab = window.tab_manager.widget(index)
+                for view in tab.web_views():
+                    yield view, tab is current and view is tab.current_view()
+
+    def settle(self, view, state, force=False):
+        # Only ever moves a tab towards lower resource use, and never below what WebEngine
+        # recommends unless asked explicitly, so unsaved form input and unload handlers survive
+        page = view.page()
+        target = self.STATES.index(state)
+        if not force:
+            target = min(target, self.STATES.index(page.recommendedState()))
+        if target <= self.STATES.index(page.lifecycleState()): return False
+        page.setLifecycleState(self.STATES[target])
+        return True
+
+    def sweep(self):
+        freeze_after = SETTINGS.value("tab_freeze_minutes") * 60
+        discard_after = SETTINGS.value("tab_discard_minutes") * 60
+        memory_limit = SETTINGS.value("tab_memory_limit_mb") * 1024 * 1024
+        now = time.monotonic()
+        tabs = list(self.chromium_tabs())
+        candidates = [view for view, foreground in tabs if not foreground and not view.page().recentlyAudible()
+                      and not (view.engine_tab.pinned and view is view.engine_tab.current_view())]
+        for view in candidates:
+            idle = now - view.last_active
+            if discard_after and idle >= discard_after:
+                self.settle(view, QWebEnginePage.LifecycleState.Discarded)
+            elif freeze_after and idle >= freeze_after:
+                self.settle(view, QWebEnginePage.LifecycleState.Frozen)
+        if memory_limit:
+            self.relieve_memory_pressure(tabs, candidates, memory_limit)
+
+    @staticmethod
+    def engine_tabs():
+        for window in ZOrbitWindow.open_windows:
+            for index in range(window.tab_manager.count()):
+                yield window.tab_manager.widget(index)
+
+    def relieve_memory_pressure(self, tabs, candidates, memory_limit):
+        # Renderer processes are shared between same-site tabs, so each pid is measured once
+        # and its cost split evenly across the tabs using it
+        views_by_pid = {}
+        for view, foreground in tabs:
+            pid = view.page().renderProcessPid()
+            if pid: views_by_pid.setdefault(pid, []).append(view)
+        rss = {pid: ProcessProbe.rss_bytes(pid) for pid in views_by_pid}
+        total = ProcessProbe.rss_bytes(os.getpid()) + sum(rss.values())
+        if total > memory_limit:
+            SPARE_VIEWS.drain() # Warm spares are the cheapest thing to give up
+        # Then the engines tabs aren't showing, least recently used tabs first
+        dropped = set()
+        for tab in sorted(self.engine_tabs(), key=lambda t: t.last_active):
+            if total <= memory_limit: break
+            for view in tab.drop_idle_engines():
+                dropped.add(view)
+                pid = view.page().renderProcessPid() if isinstance(view, ChromiumView) else 0
+                if pid in rss: total -= rss[pid] / len(views_by_pid[pid])
+        for view in sorted((v for v in candidates if v not in dropped), key=lambda v: v.last_active):
+            if total <= memory_limit: break
+            pid = view.page().renderProcessPid()
+            if pid and self.settle(view, QWebEnginePage.LifecycleState.Discarded):
+                total -= rss[pid] / len(views_by_pid[pid])
+
+TAB_LIFECYCLE = TabLifecycleManager()
+
+# --- SESSION JOURNAL ---
+class SessionJournal(QObject):
+    FLUSH_DELAY_MS = 1000
+
+    def __init__(self):
+        super().__init__()
+        # Every write, including new tabs, is batched into the next flush, so opening
+        # the first window never waits on the database
+        self.new_tabs = set()
+        self.dirty_tabs = set()
+        self.dirty_windows = set()
+        self.closed_tabs = []
+        self.reset_pending = False
+        self.window_ids = None
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(self.FLUSH_DELAY_MS)
+        self.flush_timer.timeout.connect(self.flush)
+
+    def load(self, restore):
+        # Saved tabs grouped per window, or a clean journal when the session isn't restored
+        if not restore:
+            self.reset_pending = True
+            return []
+        windows = {}
+        for row in DB_CONTROLLER.fetch_session():
+            windows.setdefault(row[1], []).append(row)
+        return list(windows.values())
+
+    def new_window_id(self):
+        if self.window_ids is None:
+            self.window_ids = itertools.count(DB_CONTROLLER.max_session_window() + 1)
+        return next(self.window_ids)
+
+    def watch(self, view):
+        view.url_updated.connect(lambda q: self.touch(view))
+        view.title_updated.connect(lambda t: self.touch(view))
+        view.scroll_signal().connect(lambda *args: self.touch(view))
+
+    def schedule(self):
+        # Throttled rather than debounced, so continuous scrolling still gets written out
+        if not self.flush_timer.isActive(): self.flush_timer.start()
+
+    def touch(self, view):
+        if view.session_id is None and view not in self.new_tabs: return
+        self.dirty_tabs.add(view)
+        self.schedule()
+
+    def touch_window(self, window):
+        if window.is_incognito: return
+        self.dirty_windows.add(window)
+        self.schedule()
+
+    def open_tab(self, window, view, url):
+        if window.is_incognito: return
+        view.session_url = url
+        self.new_tabs.add(view)
+        self.dirty_tabs.add(view)
+        self.touch_window(window)
+
+    def close_tab(self, window, view):
+        self.new_tabs.discard(view)
+        self.dirty_tabs.discard(view)
+        if view.session_id is not None:
+            self.closed_tabs.append(view.session_id)
+            view.session_id = None
+        self.touch_window(window)
+
+    def close_window(self, window):
+        self.new_tabs = {view for view in self.new_tabs if view.main_window is not window}
+        self.dirty_tabs = {view for view in self.dirty_tabs if view.main_window is not window}
+        self.dirty_windows.discard(window)
+        if window.session_window_id is not None:
+            DB_CONTROLLER.delete_session_window(window.session_window_id)
+
+    def flush(self):
+        self.flush_timer.stop()
+        if self.reset_pending:
+            self.reset_pending = False
+            DB_CONTROLLER.clear_session()
+        if self.new_tabs:
+            pending, rows = list(self.new_tabs), []
+            for view in pending:
+                window = view.main_window
+                if window.session_window_id is None:
+                    window.session_window_id = self.new_window_id()
+                rows.append((window.session_window_id, window.tab_manager.indexOf(view), view.session_url, "", view.engine))
+            for view, tab_id in zip(pending, DB_CONTROLLER.insert_session_tabs(rows)):
+                view.session_id = tab_id
+            self.new_tabs.clear()
+        tabs = []
+        for view in self.dirty_tabs:
+            if view.session_id is None: continue
+            url = view.get_url().toString()
+            if url and url != "about:blank": view.session_url = url # A spare still shows its warm-up page until the first commit
+            tab_manager = view.main_window.tab_manager
+            title = tab_manager.tabToolTip(tab_manager.indexOf(view)) or view.get_title()
+            scroll_x, scroll_y = view.get_scroll()
+            tabs.append((view.session_url, title, view.engine, scroll_x, scroll_y, view.session_id))
+        layout = []
+        for window in self.dirty_windows:
+            current = window.tab_manager.currentIndex()
+            for index in range(window.tab_manager.count()):
+                view = window.tab_manager.widget(index)
+                if view.session_id is not None:
+                    layout.append((index, int(index == current), int(view.pinned), view.session_id))
+        closed = self.closed_tabs
+        self.dirty_tabs.clear()
+        self.dirty_windows.clear()
+        self.closed_tabs = []
+        if tabs or layout or closed:
+            DB_CONTROLLER.update_session(tabs, layout, closed)
+
+SESSION_JOURNAL = SessionJournal()
+
+# --- SEGMENTED DOWNLOAD ENGINE ---
+class BandwidthLimiter:
+    # Token bucket shared by worker threads; a rate of 0 means unlimited
+    def __init__(self, rate=0):
+        self.rate = rate
+        self.allowance = 0.0
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def set_rate(self, rate):
+        with self.lock:
+            self.rate = rate
+            self.allowance = 0.0
+            self.last = time.monotonic()
+
+    def consume(self, amount, should_stop=lambda: False):
+        with self.lock:
+            if self.rate <= 0: return
+            now = time.monotonic()
+            self.allowance = min(self.rate, self.allowance + (now - self.last) * self.rate)
+            self.last = now
+            self.allowance -= amount
+            delay = -self.allowance / self.rate if self.allowance < 0 else 0
+        # Sleep off the debt in short steps so a pause or cancel is never stuck behind it
+        deadline = time.monotonic() + delay
+        while not should_stop() and time.monotonic() < deadline:
+            time.sleep(min(0.1, deadline - time.monotonic()))
+
+DOWNLOAD_BANDWIDTH = BandwidthLimiter(SETTINGS.value("download_rate_global_kb") * 1024)
+SETTINGS.changed.connect(lambda key, value: DOWNLOAD_BANDWIDTH.set_rate(value * 1024) if key == "download_rate_global_kb" else None)
+
+class DownloadProbeWorker(QThread):
+    probe_finished = pyqtSignal(int, bool, str, str, str) # total, accepts_ranges, filename, expected_digest, resolved_url
+    probe_failed = pyqtSignal(str)
+
+    def __init__(self, url, user_agent):
+        super().__init__()
+        self.url = url
+        self.user_agent = user_agent
+
+    def run(self):
+        try:
+            # A one-byte range request reveals both the size and whether ranges are honoured
+            request = urllib.request.Request(self.url, headers={'User-Agent': self.user_agent, 'Range': 'bytes=0-0'})
+            with urllib.request.urlopen(request, timeout=15, context=ssl.create_default_context()) as response:
+                accepts_ranges = response.status == 206
+                total = -1
+                if accepts_ranges:
+                    content_range = response.headers.get('Content-Range', '')
+                    if '/' in content_range and content_range.rsplit('/', 1)[1].isdigit():
+                        total = int(content_range.rsplit('/', 1)[1])
+                    else:
+                        accepts_ranges = False
+                elif response.headers.get('Content-Length', '').isdigit():
+                    total = int(response.headers['Content-Length'])
+                self.probe_finished.emit(total, accepts_ranges, self.filename_from(response), self.digest_from(response.headers), response.geturl())
+        except Exception as e:
+            self.probe_failed.emit(str(e))
+
+    def filename_from(self, response):
+        disposition = response.headers.get('Content-Disposition', '')
+        match = re.search(r"filename\*=(?:UTF-8'')?([^;]+)", disposition, re.IGNORECASE) or re.search(r'filename="?([^";]+)"?', disposition, re.IGNORECASE)
+        name = unquote(match.group(1).strip()) if match else unquote(os.path.basename(urlparse(response.geturl()).path))
+        return re.sub(r'[<>:"/\\|?*]', '_', name).strip() or "download"
+
+    @staticmethod
+    def digest_from(headers):
+        # RFC 3230 "Digest: SHA-256=<b64>" or RFC 9530 "Repr-Digest: sha-256=:<b64>:"
+        for header in ('Repr-Digest', 'Digest'):
+            match = re.search(r'sha-256=:?([A-Za-z0-9+/=]+):?', headers.get(header, ''), re.IGNORECASE)
+            if match:
+                try:
+                    return base64.b64decode(match.group(1)).hex()
+                except ValueError:
+                    pass
+        return ""
+
+class DownloadSegmentWorker(QThread):
+    def __init__(self, download, segment):
+        super().__init__()
+        self.download = download
+        self.segment = segment
+        self.stop_requested = False
+        self.ranges_refused = False
+        self.error = ""
+
+    def run(self):
+        segment = self.segment
+        download = self.download
+        headers = {'User-Agent': download.user_agent}
+        with download.lock:
+            # Without range support every (re)start streams the body from byte 0 again
+            if not download.accepts_ranges: segment["received"] = 0
+            offset = segment["start"] + segment["received"]
+        if download.accepts_ranges:
+            headers['Range'] = f"bytes={offset}-{segment['end']}"
+        try:
+            request = urllib.request.Request(download.resolved_url, headers=headers)
+            with urllib.request.urlopen(request, timeout=30, context=ssl.create_default_context()) as response, open(download.part_path(), "r+b") as target:
+                if download.accepts_ranges and response.status != 206:
+                    self.ranges_refused = True # A full 200 body must not be written at a segment offset
+                    return
+                target.seek(offset)
+                while not self.stop_requested:
+                    remaining = download.read_size()
+                    if segment["end"] is not None:
+                        remaining = min(remaining, segment["end"] - segment["start"] + 1 - segment["received"])
+                        if remaining <= 0: break
+                    chunk = response.read(remaining)
+                    if not chunk:
+                        if segment["end"] is None: segment["done"] = True
+                        break
+                    target.write(chunk)
+                    with download.lock:
+                        segment["received"] += len(chunk)
+                    download.throttle(len(chunk), lambda: self.stop_requested)
+        except Exception as e:
+            self.error = str(e)
+
+class ChecksumWorker(QThread):
+    checksum_ready = pyqtSignal(str)
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+
+    def run(self):
+        digest = hashlib.sha256()
+        try:
+            with open(self.path, "rb") as source:
+                for block in iter(lambda: source.read(1024 * 1024), b""):
+                    digest.update(block)
+            self.checksum_ready.emit(digest.hexdigest())
+        except OSError:
+            self.checksum_ready.emit("")
+
+class SegmentedDownload(QObject):
+    # Mirrors the parts of QWebEngineDownloadRequest that DownloadEntryWidget uses,
+    # so the dock treats both kinds of download the same way.
+    receivedBytesChanged = pyqtSignal()
+    stateChanged = pyqtSignal(object)
+
+    MAX_SEGMENT_RETRIES = 3
+    PERSIST_EVERY_TICKS = 4
+
+    def __init__(self, url, directory, file_name="", user_agent=DEFAULT_USER_AGENT, persistent=True):
+        super().__init__()
+        self.persistent = persistent # Incognito downloads never reach download_jobs on disk
+        self.segment_count = max(1, SETTINGS.value("download_segments"))
+        self.limiter = BandwidthLimiter(SETTINGS.value("download_rate_per_item_kb") * 1024)
+        self.source_url = url
+        self.resolved_url = url
+        self.directory = directory
+        self.file_name = file_name
+        self.user_agent = user_agent
+        self.job_id = None
+        self.total = -1
+        self.accepts_ranges = False
+        self.expected_digest = ""
+        self.checksum = ""
+        self.error_text = ""
+        self.segments = []
+        self.workers = []
+        self.lock = threading.Lock()
+        self.paused = False
+        self.cancelled = False
+        self.failed = False
+        self.dispose_requested = False
+        self.current_state = QWebEngineDownloadRequest.DownloadState.DownloadRequested
+        self.probe_worker = None
+        self.checksum_worker = None
+        self.ticks = 0
+        self.progress_timer = QTimer(self)
+        self.progress_timer.setInterval(250)
+        self.progress_timer.timeout.connect(self.on_progress_tick)
+
+    @classmethod
+    def from_job(cls, job, segments):
+        job_id, url, directory, file_name, total, accepts_ranges, expected_digest = job
+        download = cls(url, directory, file_name, SETTINGS.value("custom_user_agent"))
+        download.job_id = job_id
+        download.total = total
+        download.accepts_ranges = bool(accepts_ranges)
+        download.expected_digest = expected_digest or ""
+        download.segments = [{"start": start, "end": end, "received": received, "retries": 0} for start, end, received in segments]
+        if not download.accepts_ranges or not os.path.exists(download.part_path()):
+            # Without range support (or the partial file) the only option is starting over
+            for segment in download.segments: segment["received"] = 0
+        return download
+
+    # QWebEngineDownloadRequest-compatible surface
+    def downloadFileName(self): return self.file_name or os.path.basename(urlparse(self.source_url).path) or "download"
+    def downloadDirectory(self): return self.directory
+    def setDownloadDirectory(self, directory): self.directory = directory
+    def url(self): return QUrl(self.source_url)
+    def totalBytes(self): return self.total
+    def state(self): return self.current_state
+    def isPaused(self): return self.paused
+    def isFinished(self): return self.current_state in (QWebEngineDownloadRequest.DownloadState.DownloadCompleted, QWebEngineDownloadRequest.DownloadState.DownloadCancelled, QWebEngineDownloadRequest.DownloadState.DownloadInterrupted)
+    def interruptReasonString(self): return self.error_text
+
+    def receivedBytes(self):
+        with self.lock:
+            return sum(segment["received"] for segment in self.segments)
+
+    def part_path(self):
+        return os.path.join(self.directory, self.downloadFileName() + ".part")
+
+    def throttle(self, amount, should_stop):
+        self.limiter.consume(amount, should_stop)
+        DOWNLOAD_BANDWIDTH.consume(amount, should_stop)
+
+    def read_size(self):
+        # Smaller reads under a rate limit keep the flow smooth instead of bursty
+        rates = [rate for rate in (self.limiter.rate, DOWNLOAD_BANDWIDTH.rate) if rate > 0]
+        if not rates: return DOWNLOAD_CHUNK_SIZE
+        return max(4096, min(DOWNLOAD_CHUNK_SIZE, min(rates) // 8))
+
+    def set_state(self, state):
+        self.current_state = state
+        self.stateChanged.emit(state)
+
+    def accept(self):
+        if self.job_id is not None:
+            self.open_part_file()
+            self.set_state(QWebEngineDownloadRequest.DownloadState.DownloadInProgress)
+            self.start_workers()
+            return
+        self.probe_worker = DownloadProbeWorker(self.source_url, self.user_agent)
+        self.probe_worker.probe_finished.connect(self.on_probe_finished)
+        self.probe_worker.probe_failed.connect(self.fail)
+        self.probe_worker.finished.connect(self.on_thread_finished)
+        self.probe_worker.start()
+
+    def on_probe_finished(self, total, accepts_ranges, file_name, expected_digest, resolved_url):
+        if self.cancelled: return
+        self.total = total
+        self.accepts_ranges = accepts_ranges and total > 0
+        self.expected_digest = expected_digest
+        self.resolved_url = resolved_url or self.source_url
+        self.file_name = self.unique_file_name(self.file_name or file_name)
+
+        count = self.segment_count if self.accepts_ranges and total >= SEGMENTED_DOWNLOAD_THRESHOLD else 1
+        if total > 0:
+            size = -(-total // count)
+            self.segments = [{"start": start, "end": min(start + size, total) - 1, "received": 0, "retries": 0} for start in range(0, total, size)]
+        else:
+            self.segments = [{"start": 0, "end": None, "received": 0, "retries": 0}]
+
+        try:
+            self.open_part_file(preallocate=True)
+        except OSError as e:
+            self.fail(str(e))
+            return
+        if self.persistent:
+            self.job_id = DB_CONTROLLER.create_download_job(self.source_url, self.directory, self.file_name, total, self.accepts_ranges, expected_digest, self.segments)
+        self.set_state(QWebEngineDownloadRequest.DownloadState.DownloadInProgress)
+        self.start_workers()
+
+    def unique_file_name(self, name):
+        base, ext = os.path.splitext(name or "download")
+        candidate, n = base + ext, 1
+        while os.path.exists(os.path.join(self.directory, candidate)) or os.path.exists(os.path.join(self.directory, candidate + ".part")):
+            candidate = f"{base} ({n}){ext}"
+            n += 1
+        return candidate
+
+    def open_part_file(self, preallocate=False):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.part_path()
+        if preallocate or not os.path.exists(path) or not self.accepts_ranges:
+            with open(path, "wb") as part:
+                if self.total > 0: part.truncate(self.total)
+
+    def segment_complete(self, segment):
+        if segment["end"] is None: return segment.get("done", False)
+        return segment["received"] >= segment["end"] - segment["start"] + 1
+
+    def start_workers(self):
+        if self.paused or self.cancelled or self.failed: return
+        running = {worker.segment["start"] for worker in self.workers}
+        for segment in self.segments:
+            if segment["start"] in running or self.segment_complete(segment): continue
+            worker = DownloadSegmentWorker(self, segment)
+            worker.finished.connect(lambda w=worker: self.on_worker_finished(w))
+            self.workers.append(worker)
+            worker.start()
+        self.progress_timer.start()
+
+    def on_worker_finished(self, worker):
+        if worker in self.workers: self.workers.remove(worker)
+        worker.deleteLater()
+        segment = worker.segment
+
+        if self.cancelled:
+            if not self.workers: self.discard_partial()
+        if self.cancelled or self.dispose_requested:
+            self.dispose_when_idle()
+            return
+        if self.failed: return # Stopped by fail(), which already gave up the download
+        if worker.ranges_refused and self.accepts_ranges:
+            self.drop_range_support()
+        if not any(seg is segment for seg in self.segments):
+            # Segment was replaced by drop_range_support; restart once every old stream has stopped
+            if not self.workers: self.persist_progress("paused") if self.paused else self.start_workers()
+            return
+        if self.paused:
+            if not self.workers: self.persist_progress("paused")
+            return
+        if worker.stop_requested:
+            # Stopped by a pause that was already undone; pick the segment straight back up
+            self.start_workers()
+            return
+
+        if not self.segment_complete(segment):
+            segment["retries"] += 1
+            if segment["retries"] > self.MAX_SEGMENT_RETRIES:
+                self.fail(worker.error or "Connection closed early")
+                return
+            QTimer.singleShot(1000 * segment["retries"], self.start_workers)
+            return
+
+        if all(self.segment_complete(seg) for seg in self.segments) and not self.workers:
+            self.finalize()
+
+    def drop_range_support(self):
+        # The server ignored Range after all, so fall back to one stream from byte 0
+        self.accepts_ranges = False
+        for worker in self.workers: worker.stop_requested = True
+        with self.lock:
+            self.segments = [{"start": 0, "end": self.total - 1 if self.total > 0 else None, "received": 0, "retries": 0}]
+        if self.job_id is not None:
+            DB_CONTROLLER.reset_download_job(self.job_id, False, self.segments)
+
+    def on_progress_tick(self):
+        self.receivedBytesChanged.emit()
+        self.ticks += 1
+        if self.ticks % self.PERSIST_EVERY_TICKS == 0:
+            self.persist_progress()
+
+    def persist_progress(self, state=None):
+        if self.job_id is None: return
+        with self.lock:
+            snapshot = [dict(segment) for segment in self.segments]
+        DB_CONTROLLER.update_download_job(self.job_id, snapshot, state)
+
+    def finalize(self):
+        self.progress_timer.stop()
+        self.receivedBytesChanged.emit()
+        self.persist_progress("verifying")
+        final_name = self.unique_file_name(self.downloadFileName()) if os.path.exists(os.path.join(self.directory, self.downloadFileName())) else self.downloadFileName()
+        final_path = os.path.join(self.directory, final_name)
+        try:
+            os.replace(self.part_path(), final_path)
+        except OSError as e:
+            self.fail(str(e))
+            return
+        self.file_name = final_name
+        if self.total < 0: self.total = self.receivedBytes()
+        self.checksum_worker = ChecksumWorker(final_path)
+        self.checksum_worker.checksum_ready.connect(self.on_checksum_ready)
+        self.checksum_worker.finished.connect(self.on_thread_finished)
+        self.checksum_worker.start()
+
+    def on_checksum_ready(self, checksum):
+        self.checksum = checksum
+        if self.expected_digest and checksum != self.expected_digest:
+            if self.job_id is not None:
+                DB_CONTROLLER.update_download_job(self.job_id, state="failed", checksum=checksum, filename=self.file_name)
+            self.failed = True
+            self.error_text = "Checksum mismatch"
+            self.set_state(QWebEngineDownloadRequest.DownloadState.DownloadInterrupted)
+            return
+        if self.job_id is not None:
+            DB_CONTROLLER.update_download_job(self.job_id, state="completed", checksum=checksum, filename=self.file_name)
+        self.set_state(QWebEngineDownloadRequest.DownloadState.DownloadCompleted)
+
+    def fail(self, reason):
+        self.failed = True
+        self.progress_timer.stop()
+        self.error_text = reason
+        for worker in self.workers: worker.stop_requested = True
+        self.persist_progress("paused") # Kept resumable: a later restart may succeed
+        self.set_state(QWebEngineDownloadRequest.DownloadState.DownloadInterrupted)
+
+    def pause(self):
+        if self.paused or self.isFinished(): return
+        self.paused = True
+        self.progress_timer.stop()
+        for worker in self.workers: worker.stop_requested = True
+        if not self.workers: self.persist_progress("paused")
+
+    def resume(self):
+        if not self.paused: return
+        self.paused = False
+        if self.segments: # Probed already, whether or not it has a saved job
+            self.persist_progress("in_progress")
+            self.start_workers()
+        elif self.probe_worker is None:
+            self.accept() # Paused while still queued, before it ever started
+
+    def cancel(self):
+        self.cancelled = True
+        self.progress_timer.stop()
+        for worker in self.workers: worker.stop_requested = True
+        if not self.workers: self.discard_partial()
+        self.set_state(QWebEngineDownloadRequest.DownloadState.DownloadCancelled)
+
+    def dispose(self):
+        # Segment, probe and checksum threads have no parent and may still be blocked in urlopen;
+        # the download, which holds the last reference to them, goes once all of them have stopped
+        self.dispose_requested = True
+        self.dispose_when_idle()
+
+    def dispose_when_idle(self):
+        if not self.dispose_requested or self.workers: return
+        if any(thread is not None and thread.isRunning() for thread in (self.probe_worker, self.checksum_worker)): return
+        self.deleteLater()
+
+    def on_thread_finished(self):
+        self.sender().wait() # finished arrives just before isRunning() turns false
+        self.dispose_when_idle()
+
+    def discard_partial(self):
+        if os.path.exists(self.part_path()):
+            try:
+                os.remove(self.part_path())
+            except OSError:
+                pass
+        if self.job_id is not None:
+            DB_CONTROLLER.delete_download_job(self.job_id)
+            self.job_id = None
+
+class DownloadScheduler(QObject):
+    # Hands out a fixed number of transfer slots; everything else waits in a
+    # priority queue (FIFO within a priority) until a slot frees up. One instance
+    # serves every window, so the cap applies to the whole browser.
+    queue_changed = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.active = []
+        self.queue = [] # heap of (-priority, sequence, item, start_action)
+        self.sequence = itertools.count()
+        SETTINGS.changed.connect(self.on_setting_changed)
+
+    def on_setting_changed(self, key, value):
+        if key == "max_concurrent_downloads": self.fill_slots()
+
+    def max_concurrent(self):
+        return max(1, SETTINGS.value("max_concurrent_downloads"))
+
+    def has_free_slot(self):
+        return len(self.active) < self.max_concurrent() and not self.queue
+
+    def submit(self, item, start_action, priority=0):
+        heapq.heappush(self.queue, (-priority, next(self.sequence), item, start_action))
+        self.fill_slots()
+
+    def fill_slots(self):
+        while self.queue and len(self.active) < self.max_concurrent():
+            _, _, item, start_action = heapq.heappop(self.queue)
+            if item.isFinished(): continue
+            self.active.append(item)
+            start_action()
+        self.queue_changed.emit()
+
+    def is_queued(self, item):
+        return any(entry[2] is item for entry in self.queue)
+
+    def withdraw(self, item):
+        self.queue = [entry for entry in self.queue if entry[2] is not item]
+        heapq.heapify(self.queue)
+
+    def release(self, item):
+        self.withdraw(item)
+        if item in self.active:
+            self.active.remove(item)
+        self.fill_slots()
+
+    def pause(self, item):
+        item.pause()
+        self.release(item)
+
+    def resume(self, item):
+        # A resumed download goes ahead of fresh arrivals but still respects the cap
+        self.submit(item, item.resume, priority=1)
+
+    def prioritize(self, item):
+        for entry in self.queue:
+            if entry[2] is item:
+                self.withdraw(item)
+                self.submit(item, entry[3], priority=2)
+                return
+
+    def on_state_changed(self, item):
+        if item.isFinished():
+            self.release(item)
+
+    def forget(self, items):
+        # A closed window's downloads give back their slots and leave the queue
+        for item in items:
+            self.withdraw(item)
+            if item in self.active: self.active.remove(item)
+        self.fill_slots()
+
+DOWNLOAD_SCHEDULER = DownloadScheduler()
 
 class DownloadEntryWidget(QFrame):
-    def __init__(self, download_item: QWebEngineDownloadRequest, parent=None):
+    retired = pyqtSignal(object)
+
+    def __init__(self, download_item: QWebEngineDownloadRequest, scheduler=None, parent=None):
         super().__init__(parent)
         self.download_item = download_item
+        self.scheduler = scheduler
         self.setFrameShape(QFrame.Shape.StyledPanel)
         self.setStyleSheet("background: #1a1a1a; border-radius: 6px; margin-bottom: 6px; border: 1px solid #333;")
         self.layout = QVBoxLayout(self)
@@ -1121,6 +3909,13 @@ class DownloadEntryWidget(QFrame):
         self.status_label.setStyleSheet("color: #aaa; font-size: 11px; border: none;")
         control_row.addWidget(self.status_label)
         control_row.addStretch()
+
+        self.priority_btn = QPushButton("⤒")
+        self.priority_btn.setFixedSize(26, 26)
+        self.priority_btn.setToolTip("Download Next")
+        self.priority_btn.clicked.connect(lambda: self.scheduler.prioritize(self.download_item))
+        self.priority_btn.hide()
+        control_row.addWidget(self.priority_btn)
         
         self.pause_btn = QPushButton("⏸")
         self.pause_btn.setFixedSize(26, 26)
@@ -1134,9 +3929,31 @@ class DownloadEntryWidget(QFrame):
         control_row.addWidget(self.cancel_btn)
         
         self.layout.addLayout(control_row)
-        self.download_item.receivedBytesChanged.connect(self.update_status)
+        # receivedBytesChanged can fire thousands of times a second; it only flags the
+        # entry and DownloadPanel repaints flagged entries at a fixed rate
+        self.download_item.receivedBytesChanged.connect(self.mark_dirty)
         self.download_item.stateChanged.connect(self.on_state_change)
         self.is_paused = False
+        self.dirty = True
+        self.samples = deque()
+        self.speed = 0.0
+
+    def mark_dirty(self):
+        self.dirty = True
+
+    def is_active(self):
+        if self.scheduler and self.scheduler.is_queued(self.download_item): return False # Waiting for a slot, nothing to refresh
+        return not self.download_item.isFinished() and not self.download_item.isPaused() and not self.is_paused
+
+    def sample_speed(self, now):
+        received = self.download_item.receivedBytes()
+        self.samples.append((now, received))
+        while len(self.samples) > 2 and now - self.samples[0][0] > DOWNLOAD_SPEED_WINDOW:
+            self.samples.popleft()
+        first_time, first_bytes = self.samples[0]
+        window_speed = (received - first_bytes) / (now - first_time) if now > first_time else 0.0
+        self.speed = window_speed if not self.speed else 0.3 * window_speed + 0.7 * self.speed
+        return self.speed
 
     def update_status(self):
         total_bytes = self.download_item.totalBytes()
@@ -1145,58 +3962,289 @@ class DownloadEntryWidget(QFrame):
             percentage = int((received_bytes / total_bytes) * 100)
             self.progress_bar.setValue(percentage)
             self.size_label.setText(f"{self.format_bytes(received_bytes)} / {self.format_bytes(total_bytes)}")
-        
-    def format_bytes(self, size):
+        else:
+            self.size_label.setText(self.format_bytes(received_bytes))
+        self.dirty = False
+        if self.is_active() and self.download_item.state() == QWebEngineDownloadRequest.DownloadState.DownloadInProgress and self.status_label.text() != "Queued":
+            status = f"{self.format_bytes(self.speed)}/s"
+            if total_bytes > 0 and self.speed > 1:
+                status += f" • {self.format_duration((total_bytes - received_bytes) / self.speed)} left"
+            self.status_label.setText(status)
+
+    @staticmethod
+    def format_bytes(size):
         for unit in ['B', 'KB', 'MB', 'GB']:
             if size < 1024: return f"{size:.1f}{unit}"
             size /= 1024
         return f"{size:.1f}TB"
 
+    @staticmethod
+    def format_duration(seconds):
+        seconds = int(seconds)
+        if seconds >= 3600: return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+        if seconds >= 60: return f"{seconds // 60}m {seconds % 60:02d}s"
+        return f"{seconds}s"
+
     def toggle_pause(self):
         if self.is_paused:
-            self.download_item.resume()
+            if self.scheduler: self.scheduler.resume(self.download_item)
+            else: self.download_item.resume()
             self.pause_btn.setText("⏸")
             self.status_label.setText("Resumed")
+            self.samples.clear()
+            self.speed = 0.0
         else:
-            self.download_item.pause()
+            if self.scheduler: self.scheduler.pause(self.download_item)
+            else: self.download_item.pause()
             self.pause_btn.setText("▶")
             self.status_label.setText("Paused")
         self.is_paused = not self.is_paused
+        self.refresh_queue_state()
+
+    def refresh_queue_state(self):
+        queued = bool(self.scheduler) and self.scheduler.is_queued(self.download_item)
+        self.priority_btn.setVisible(queued)
+        if queued:
+            self.status_label.setText("Queued")
+        elif self.status_label.text() == "Queued":
+            self.status_label.setText("Downloading...")
 
     def cancel_download(self):
         self.download_item.cancel()
+        if self.scheduler: self.scheduler.release(self.download_item)
         self.status_label.setText("Cancelled")
         self.status_label.setStyleSheet("color: #ff5555; border: none;")
         self.pause_btn.setDisabled(True)
+        self.retired.emit(self)
 
     def on_state_change(self, state):
+        if state == QWebEngineDownloadRequest.DownloadState.DownloadInProgress:
+            self.name_label.setText(self.download_item.downloadFileName())
+            self.status_label.setText("Downloading...")
+        elif state == QWebEngineDownloadRequest.DownloadState.DownloadInterrupted:
+            self.status_label.setText(f"Failed: {self.download_item.interruptReasonString()}")
+            self.status_label.setStyleSheet("color: #ff5555; border: none;")
+            self.pause_btn.hide()
+            self.retired.emit(self)
         if state == QWebEngineDownloadRequest.DownloadState.DownloadCompleted:
             self.progress_bar.setValue(100)
             self.status_label.setText("Complete")
             self.status_label.setStyleSheet("color: #4caf50; border: none;")
+            self.name_label.setText(self.download_item.downloadFileName())
+            checksum = getattr(self.download_item, "checksum", "")
+            if checksum: self.status_label.setToolTip(f"SHA-256: {checksum}")
             self.pause_btn.hide()
             self.cancel_btn.hide()
-            DB_CONTROLLER.record_download(self.download_item.downloadFileName(), self.download_item.downloadDirectory(), "unknown", self.download_item.totalBytes())
+            self.retired.emit(self)
+
+class DownloadHistoryModel(QAbstractListModel):
+    PAGE_SIZE = 100
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows = []
+        self.query = ""
+        self.exhausted = False
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid(): return None
+        record_id, filename, path, url, size, timestamp = self.rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            source = DatabaseController.domain_of(url) or "local"
+            return f"{filename}\n{DownloadEntryWidget.format_bytes(size or 0)} • {source} • {str(timestamp)[:16]}"
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return f"{os.path.join(path, filename)}\n{url}"
+        if role == Qt.ItemDataRole.UserRole:
+            return self.rows[index.row()]
+        return None
+
+    # Rows are pulled from the downloads table a page at a time as the view scrolls
+    def canFetchMore(self, parent):
+        return not parent.isValid() and not self.exhausted
+
+    def fetchMore(self, parent):
+        if parent.isValid(): return
+        page = DB_CONTROLLER.fetch_downloads(self.query, self.PAGE_SIZE, self.rows[-1][0] if self.rows else None)
+        self.exhausted = len(page) < self.PAGE_SIZE
+        if not page: return
+        self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(page) - 1)
+        self.rows.extend(page)
+        self.endInsertRows()
+
+    def set_query(self, query):
+        self.beginResetModel()
+        self.query = query
+        self.rows = []
+        self.exhausted = False
+        self.endResetModel()
+
+    def reload(self):
+        self.set_query(self.query)
+
+    def prepend(self, row):
+        needle = self.query.lower()
+        if needle and needle not in row[1].lower() and needle not in row[3].lower(): return
+        self.beginInsertRows(QModelIndex(), 0, 0)
+        self.rows.insert(0, row)
+        self.endInsertRows()
+
+    def remove(self, row_number):
+        self.beginRemoveRows(QModelIndex(), row_number, row_number)
+        del self.rows[row_number]
+        self.endRemoveRows()
 
 class DownloadPanel(QDockWidget):
+    RETIRE_DELAY_MS = 1500
+    FAILED_RETIRE_DELAY_MS = 10000 # Long enough to read why
+
     def __init__(self, parent=None):
         super().__init__("Downloads", parent)
+        self.incognito = getattr(parent, "is_incognito", False) # Incognito downloads are never recorded
         self.setAllowedAreas(Qt.DockWidgetArea.RightDockWidgetArea | Qt.DockWidgetArea.BottomDockWidgetArea)
+        panel = QWidget()
+        panel.setStyleSheet("background: #121212;")
+        panel_layout = QVBoxLayout(panel)
+        panel_layout.setContentsMargins(0, 0, 0, 0)
+        panel_layout.setSpacing(0)
+
+        # Only downloads still in flight get a full DownloadEntryWidget
         self.main_container = QWidget()
         self.layout_box = QVBoxLayout(self.main_container)
         self.layout_box.setAlignment(Qt.AlignmentFlag.AlignTop)
         self.layout_box.setContentsMargins(10, 10, 10, 10)
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setWidget(self.main_container)
-        scroll_area.setStyleSheet("border: none; background: #121212;")
-        self.setWidget(scroll_area)
+        self.active_area = QScrollArea()
+        self.active_area.setWidgetResizable(True)
+        self.active_area.setWidget(self.main_container)
+        self.active_area.setStyleSheet("border: none; background: #121212;")
+        self.active_area.hide()
+        panel_layout.addWidget(self.active_area, 1)
+
+        history_header = QHBoxLayout()
+        history_header.setContentsMargins(10, 8, 10, 4)
+        history_header.addWidget(QLabel("<b>Recent</b>"))
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search downloads...")
+        self.search_input.setClearButtonEnabled(True)
+        history_header.addWidget(self.search_input, 1)
+        clear_btn = QPushButton("Clear")
+        clear_btn.clicked.connect(self.clear_history)
+        history_header.addWidget(clear_btn)
+        panel_layout.addLayout(history_header)
+
+        # Finished downloads live in a paged model over the downloads table
+        self.history_model = DownloadHistoryModel(self)
+        self.history_view = QListView()
+        self.history_view.setModel(self.history_model)
+        self.history_view.setUniformItemSizes(True)
+        self.history_view.setStyleSheet("QListView { border: none; background: #121212; } QListView::item { padding: 6px 10px; border-bottom: 1px solid #222; }")
+        self.history_view.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.history_view.customContextMenuRequested.connect(self.show_history_menu)
+        self.history_view.doubleClicked.connect(lambda index: self.open_record(index.data(Qt.ItemDataRole.UserRole)))
+        panel_layout.addWidget(self.history_view, 2)
+
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(200)
+        self.search_timer.timeout.connect(lambda: self.history_model.set_query(self.search_input.text().strip()))
+        self.search_input.textChanged.connect(lambda: self.search_timer.start())
+        # Other windows may have finished downloads while this dock was hidden
+        self.visibilityChanged.connect(lambda visible: visible and self.history_model.reload())
+
+        self.setWidget(panel)
         self.setMinimumWidth(320)
-
-    def register_download(self, item):
-        entry_widget = DownloadEntryWidget(item)
+        self.entries = []
+        self.scheduler = DOWNLOAD_SCHEDULER
+        self.scheduler.queue_changed.connect(self.refresh_queue_states) # A bound slot is dropped with the window
+        entries = self.entries
+        self.destroyed.connect(lambda: DOWNLOAD_SCHEDULER.forget([entry.download_item for entry in entries]))
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(DOWNLOAD_UI_REFRESH_MS)
+        self.refresh_timer.timeout.connect(self.refresh_progress)
+
+    def register_download(self, item, start_action):
+        entry_widget = DownloadEntryWidget(item, self.scheduler)
+        entry_widget.retired.connect(self.retire_entry)
+        self.entries.append(entry_widget)
         self.layout_box.insertWidget(0, entry_widget)
+        self.active_area.show()
+        item.stateChanged.connect(lambda state, i=item: self.scheduler.on_state_changed(i))
         self.show()
+        self.scheduler.submit(item, start_action)
+        self.refresh_timer.start()
+
+    def refresh_progress(self):
+        now = time.monotonic()
+        total_speed = 0.0
+        active = 0
+        for entry in self.entries:
+            if entry.is_active():
+                total_speed += entry.sample_speed(now)
+                active += 1
+                entry.update_status()
+            elif entry.dirty:
+                entry.update_status()
+        if active:
+            self.setWindowTitle(f"Downloads — {active} active • {DownloadEntryWidget.format_bytes(total_speed)}/s")
+        else:
+            self.setWindowTitle("Downloads")
+            self.refresh_timer.stop()
+
+    def refresh_queue_states(self):
+        for entry in self.entries:
+            entry.refresh_queue_state()
+        if not self.refresh_timer.isActive(): self.refresh_timer.start()
+
+    def retire_entry(self, entry):
+        item = entry.download_item
+        if item.state() == QWebEngineDownloadRequest.DownloadState.DownloadCompleted and not self.incognito:
+            filename, directory, url = item.downloadFileName(), item.downloadDirectory(), item.url().toString()
+            size = max(item.totalBytes(), item.receivedBytes())
+            record_id = DB_CONTROLLER.record_download(filename, directory, url, size)
+            self.history_model.prepend((record_id, filename, directory, url, size, datetime.now()))
+        failed = item.state() == QWebEngineDownloadRequest.DownloadState.DownloadInterrupted
+        QTimer.singleShot(self.FAILED_RETIRE_DELAY_MS if failed else self.RETIRE_DELAY_MS, lambda: self.drop_entry(entry))
+
+    def drop_entry(self, entry):
+        if entry not in self.entries: return
+        self.entries.remove(entry)
+        self.layout_box.removeWidget(entry)
+        entry.deleteLater()
+        if entry.download_item.parent() is self: entry.download_item.dispose() # Only SegmentedDownloads are ours
+        self.active_area.setVisible(bool(self.entries))
+
+    def open_record(self, record):
+        if record: QDesktopServices.openUrl(QUrl.fromLocalFile(os.path.join(record[2], record[1])))
+
+    def show_history_menu(self, pos):
+        index = self.history_view.indexAt(pos)
+        if not index.isValid(): return
+        record = index.data(Qt.ItemDataRole.UserRole)
+        menu = QMenu(self)
+        menu.addAction("Open File", lambda: self.open_record(record))
+        menu.addAction("Show in Folder", lambda: QDesktopServices.openUrl(QUrl.fromLocalFile(record[2])))
+        menu.addAction("Copy Link Address", lambda: QApplication.clipboard().setText(record[3]))
+        menu.addSeparator()
+        menu.addAction("Remove from List", lambda: self.remove_record(index.row()))
+        menu.exec(self.history_view.viewport().mapToGlobal(pos))
+
+    def remove_record(self, row_number):
+        DB_CONTROLLER.delete_download_record(self.history_model.rows[row_number][0])
+        self.history_model.remove(row_number)
+
+    def clear_history(self):
+        if QMessageBox.question(self, "Clear Downloads", "Remove all finished downloads from the list? Files on disk are kept.") == QMessageBox.StandardButton.Yes:
+            DB_CONTROLLER.clear_downloads()
+            self.history_model.reload()
+
+    def restore_interrupted_downloads(self):
+        # Segmented downloads left unfinished by a previous run (or crash) carry on from their saved offsets
+        for job, segments in DB_CONTROLLER.fetch_resumable_downloads():
+            download = SegmentedDownload.from_job(job, segments)
+            download.setParent(self)
+            self.register_download(download, download.accept)
 
 class HistoryDialog(QDialog):
     def __init__(self, parent=None):
@@ -1255,7 +4303,7 @@ class BookmarksManagerDialog(QDialog):
         self.load_data()
         
     def load_data(self):
-        records = DB_CONTROLLER.fetch_bookmarks()
+        records = BOOKMARK_STORE.all()
         self.bm_table.setRowCount(len(records))
         for i, (title, url) in enumerate(records):
             self.bm_table.setItem(i, 0, QTableWidgetItem(title))
@@ -1266,16 +4314,15 @@ class BookmarksManagerDialog(QDialog):
             self.bm_table.setCellWidget(i, 2, del_btn)
 
     def delete_entry(self, url):
-        DB_CONTROLLER.delete_bookmark(url)
+        BOOKMARK_STORE.remove(url)
         self.load_data()
-        self.parent().refresh_bookmarks_bar()
 
 class PreferencesDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Z-Orbit Preferences")
         self.resize(850, 650)
-        self.settings_store = QSettings("ZOrbitCorp", "ProMax")
+        self.settings_store = SETTINGS
         main_layout = QHBoxLayout(self)
         self.nav_list = QListWidget()
         self.nav_list.setFixedWidth(220)
@@ -1294,21 +4341,31 @@ class PreferencesDialog(QDialog):
         layout_gen = QVBoxLayout(tab_general)
         group_startup = QGroupBox("Startup & Navigation")
         form_startup = QFormLayout()
-        self.homepage_input = QLineEdit(self.settings_store.value("home_page", DEFAULT_HOME))
+        self.homepage_input = QLineEdit(self.settings_store.value("home_page"))
         self.homepage_input.textChanged.connect(lambda t: self.settings_store.setValue("home_page", t))
         form_startup.addRow("Home Page URL:", self.homepage_input)
         self.newtab_behavior = QComboBox()
         self.newtab_behavior.addItems(["Home Page", "Blank Page"])
-        self.newtab_behavior.setCurrentText(self.settings_store.value("new_tab_behavior", "Home Page"))
+        self.newtab_behavior.setCurrentText(self.settings_store.value("new_tab_behavior"))
         self.newtab_behavior.currentTextChanged.connect(lambda t: self.settings_store.setValue("new_tab_behavior", t))
         form_startup.addRow("New Tab Loads:", self.newtab_behavior)
+        self.startup_behavior = QComboBox()
+        self.startup_behavior.addItems(["Restore Previous Session", "Home Page"])
+        self.startup_behavior.setCurrentText(self.settings_store.value("startup_behavior"))
+        self.startup_behavior.currentTextChanged.connect(lambda t: self.settings_store.setValue("startup_behavior", t))
+        form_startup.addRow("On Startup:", self.startup_behavior)
+        self.default_engine = QComboBox()
+        self.default_engine.addItems(ENGINES)
+        self.default_engine.setCurrentText(self.settings_store.value("default_engine"))
+        self.default_engine.currentTextChanged.connect(lambda t: self.settings_store.setValue("default_engine", t))
+        form_startup.addRow("Default Engine:", self.default_engine)
         group_startup.setLayout(form_startup)
         layout_gen.addWidget(group_startup)
         
         group_search = QGroupBox("Search Engine")
         self.engine_combo = QComboBox()
         self.engine_combo.addItems(["Google", "Bing", "DuckDuckGo", "Ecosia", "Brave", "Yandex", "Yahoo"])
-        self.engine_combo.setCurrentText(self.settings_store.value("search_engine", "Google"))
+        self.engine_combo.setCurrentText(self.settings_store.value("search_engine"))
         self.engine_combo.currentTextChanged.connect(self.update_search_engine)
         vbox_search = QVBoxLayout()
         vbox_search.addWidget(self.engine_combo)
@@ -1323,12 +4380,12 @@ class PreferencesDialog(QDialog):
         group_ui = QGroupBox("User Interface Elements")
         vbox_ui = QVBoxLayout()
         chk_bookmarks = QCheckBox("Show Bookmarks Toolbar")
-        chk_bookmarks.setChecked(self.settings_store.value("show_bookmarks", True, type=bool))
+        chk_bookmarks.setChecked(self.settings_store.value("show_bookmarks"))
         chk_bookmarks.toggled.connect(self.toggle_bookmarks_setting)
         vbox_ui.addWidget(chk_bookmarks)
         
         chk_home = QCheckBox("Show Home Button in Toolbar")
-        chk_home.setChecked(self.settings_store.value("show_home_button", True, type=bool))
+        chk_home.setChecked(self.settings_store.value("show_home_button"))
         chk_home.toggled.connect(self.toggle_home_button_setting)
         vbox_ui.addWidget(chk_home)
         
@@ -1343,7 +4400,7 @@ class PreferencesDialog(QDialog):
         group_dl = QGroupBox("Download Location")
         vbox_dl = QVBoxLayout()
         hbox_dl_path = QHBoxLayout()
-        current_path = self.settings_store.value("download_path", QStandardPaths.writableLocation(QStandardPaths.StandardLocation.DownloadLocation))
+        current_path = self.settings_store.download_path()
         self.path_display = QLineEdit(current_path)
         self.path_display.setReadOnly(True)
         hbox_dl_path.addWidget(self.path_display)
@@ -1353,6 +4410,42 @@ class PreferencesDialog(QDialog):
         vbox_dl.addLayout(hbox_dl_path)
         group_dl.setLayout(vbox_dl)
         layout_dl.addWidget(group_dl)
+
+        group_engine = QGroupBox("Download Engine")
+        form_engine = QFormLayout()
+        chk_segmented = QCheckBox("Accelerate large downloads with parallel segments")
+        chk_segmented.setChecked(self.settings_store.value("segmented_downloads"))
+        chk_segmented.toggled.connect(lambda c: self.settings_store.setValue("segmented_downloads", c))
+        form_engine.addRow(chk_segmented)
+        self.segment_spin = QSpinBox()
+        self.segment_spin.setRange(1, 16)
+        self.segment_spin.setValue(self.settings_store.value("download_segments"))
+        self.segment_spin.valueChanged.connect(lambda v: self.settings_store.setValue("download_segments", v))
+        form_engine.addRow("Connections per Download:", self.segment_spin)
+        self.concurrent_spin = QSpinBox()
+        self.concurrent_spin.setRange(1, 10)
+        self.concurrent_spin.setValue(self.settings_store.value("max_concurrent_downloads"))
+        self.concurrent_spin.valueChanged.connect(self.update_download_concurrency)
+        form_engine.addRow("Simultaneous Downloads:", self.concurrent_spin)
+        self.global_rate_spin = QSpinBox()
+        self.global_rate_spin.setRange(0, 1000000)
+        self.global_rate_spin.setSingleStep(100)
+        self.global_rate_spin.setSpecialValueText("Unlimited")
+        self.global_rate_spin.setSuffix(" KB/s")
+        self.global_rate_spin.setValue(self.settings_store.value("download_rate_global_kb"))
+        self.global_rate_spin.valueChanged.connect(self.update_global_download_rate)
+        form_engine.addRow("Total Bandwidth Limit:", self.global_rate_spin)
+        self.item_rate_spin = QSpinBox()
+        self.item_rate_spin.setRange(0, 1000000)
+        self.item_rate_spin.setSingleStep(100)
+        self.item_rate_spin.setSpecialValueText("Unlimited")
+        self.item_rate_spin.setSuffix(" KB/s")
+        self.item_rate_spin.setValue(self.settings_store.value("download_rate_per_item_kb"))
+        self.item_rate_spin.valueChanged.connect(lambda v: self.settings_store.setValue("download_rate_per_item_kb", v))
+        self.item_rate_spin.setToolTip("Applies to accelerated downloads started after the change.")
+        form_engine.addRow("Per-Download Limit:", self.item_rate_spin)
+        group_engine.setLayout(form_engine)
+        layout_dl.addWidget(group_engine)
         layout_dl.addStretch()
         self.content_stack.addWidget(tab_dl)
         
@@ -1363,7 +4456,7 @@ class PreferencesDialog(QDialog):
         vbox_priv = QVBoxLayout()
         
         chk_cookies = QCheckBox("Block Third-Party Cookies")
-        chk_cookies.setChecked(self.settings_store.value("block_3rd_party_cookies", False, type=bool))
+        chk_cookies.setChecked(self.settings_store.value("block_3rd_party_cookies"))
         chk_cookies.toggled.connect(self.update_cookie_policy)
         vbox_priv.addWidget(chk_cookies)
         
@@ -1374,6 +4467,76 @@ class PreferencesDialog(QDialog):
         vbox_priv.addWidget(btn_cleanup)
         group_priv.setLayout(vbox_priv)
         layout_priv.addWidget(group_priv)
+
+        group_filter = QGroupBox("Content Blocking")
+        vbox_filter = QVBoxLayout()
+        chk_filter = QCheckBox("Block Ads && Trackers (Chromium)")
+        chk_filter.setChecked(self.settings_store.value("content_blocking"))
+        chk_filter.toggled.connect(self.update_content_blocking)
+        vbox_filter.addWidget(chk_filter)
+        self.filter_status = QLabel(REQUEST_FILTER.status)
+        REQUEST_FILTER.status_changed.connect(self.refresh_filter_status)
+        vbox_filter.addWidget(self.filter_status)
+        hbox_filter = QHBoxLayout()
+        btn_import_list = QPushButton("Import Filter List...")
+        btn_import_list.clicked.connect(self.import_filter_list)
+        btn_filter_folder = QPushButton("Open Filter Folder")
+        btn_filter_folder.clicked.connect(lambda: QDesktopServices.openUrl(QUrl.fromLocalFile(REQUEST_FILTER.filter_dir())))
+        btn_recompile = QPushButton("Recompile")
+        btn_recompile.clicked.connect(lambda: REQUEST_FILTER.reload(force=True))
+        hbox_filter.addWidget(btn_import_list)
+        hbox_filter.addWidget(btn_filter_folder)
+        hbox_filter.addWidget(btn_recompile)
+        vbox_filter.addLayout(hbox_filter)
+        vbox_filter.addWidget(QLabel("EasyList-style lists and hosts files (.txt) in the filter folder are used."))
+        group_filter.setLayout(vbox_filter)
+        layout_priv.addWidget(group_filter)
+
+        group_saver = QGroupBox("Data Saver (Chromium)")
+        vbox_saver = QVBoxLayout()
+        chk_saver = QCheckBox("Use Data Saver on All Sites (images, fonts, media, third-party scripts)")
+        chk_saver.setChecked(self.settings_store.value("data_saver_default"))
+        chk_saver.toggled.connect(self.update_data_saver_default)
+        vbox_saver.addWidget(chk_saver)
+        vbox_saver.addWidget(QLabel("Per-site rules (set from the 🛡 button in the status bar):"))
+        self.saver_rules_list = QListWidget()
+        self.saver_rules_list.setMaximumHeight(110)
+        vbox_saver.addWidget(self.saver_rules_list)
+        btn_remove_rule = QPushButton("Remove Site Rule")
+        btn_remove_rule.clicked.connect(self.remove_data_saver_rule)
+        vbox_saver.addWidget(btn_remove_rule)
+        group_saver.setLayout(vbox_saver)
+        layout_priv.addWidget(group_saver)
+        self.refresh_data_saver_rules()
+
+        group_retention = QGroupBox("History Retention")
+        form_retention = QFormLayout()
+        self.retention_age = QSpinBox()
+        self.retention_age.setRange(0, 3650)
+        self.retention_age.setSpecialValueText("Forever")
+        self.retention_age.setSuffix(" days")
+        self.retention_age.setValue(self.settings_store.value("history_max_age_days"))
+        self.retention_age.valueChanged.connect(lambda v: self.settings_store.setValue("history_max_age_days", v))
+        form_retention.addRow("Keep History For:", self.retention_age)
+        self.retention_rows = QSpinBox()
+        self.retention_rows.setRange(0, 10000000)
+        self.retention_rows.setSingleStep(1000)
+        self.retention_rows.setSpecialValueText("Unlimited")
+        self.retention_rows.setValue(self.settings_store.value("history_max_rows"))
+        self.retention_rows.valueChanged.connect(lambda v: self.settings_store.setValue("history_max_rows", v))
+        form_retention.addRow("Max History Entries:", self.retention_rows)
+        self.retention_size = QSpinBox()
+        self.retention_size.setRange(0, 100000)
+        self.retention_size.setSpecialValueText("Unlimited")
+        self.retention_size.setSuffix(" MB")
+        self.retention_size.setValue(self.settings_store.value("history_max_db_mb"))
+        self.retention_size.valueChanged.connect(lambda v: self.settings_store.setValue("history_max_db_mb", v))
+        form_retention.addRow("Database Size Budget:", self.retention_size)
+        btn_retention = QPushButton("Apply Retention Now")
+        btn_retention.clicked.connect(RETENTION_JOB.run_now)
+        form_retention.addRow(btn_retention)
+        group_retention.setLayout(form_retention)
+        layout_priv.addWidget(group_retention)
         layout_priv.addStretch()
         self.content_stack.addWidget(tab_priv)
 
@@ -1389,7 +4552,7 @@ class PreferencesDialog(QDialog):
         self.ua_combo.addItem("Mozilla/5.0 (Linux; Android 14; Pixel 8) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Mobile Safari/537.36", "Google Pixel 8")
         self.ua_combo.addItem("Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:120.0) Gecko/20100101 Firefox/120.0", "Mac OS X (Firefox)")
         
-        current_ua = self.settings_store.value("custom_user_agent", DEFAULT_USER_AGENT)
+        current_ua = self.settings_store.value("custom_user_agent")
         index = self.ua_combo.findText(current_ua)
         if index == -1: self.ua_combo.setCurrentIndex(0)
         else: self.ua_combo.setCurrentIndex(index)
@@ -1402,9 +4565,9 @@ class PreferencesDialog(QDialog):
 
         group_proxy = QGroupBox("Network Proxy")
         form_proxy = QFormLayout()
-        self.proxy_host = QLineEdit(self.settings_store.value("proxy_host", ""))
+        self.proxy_host = QLineEdit(self.settings_store.value("proxy_host"))
         self.proxy_host.setPlaceholderText("e.g., 127.0.0.1 or my.proxy.com")
-        self.proxy_port = QLineEdit(self.settings_store.value("proxy_port", ""))
+        self.proxy_port = QLineEdit(self.settings_store.value("proxy_port"))
         self.proxy_port.setPlaceholderText("e.g., 8080")
         
         btn_apply_proxy = QPushButton("Apply Proxy")
@@ -1416,6 +4579,53 @@ class PreferencesDialog(QDialog):
         group_proxy.setLayout(form_proxy)
         layout_adv.addWidget(group_proxy)
 
+        group_tabs = QGroupBox("Tab Sleeping")
+        form_tabs = QFormLayout()
+        self.freeze_spin = QSpinBox()
+        self.freeze_spin.setRange(0, 1440)
+        self.freeze_spin.setSpecialValueText("Never")
+        self.freeze_spin.setSuffix(" min")
+        self.freeze_spin.setValue(self.settings_store.value("tab_freeze_minutes"))
+        self.freeze_spin.valueChanged.connect(lambda v: self.settings_store.setValue("tab_freeze_minutes", v))
+        form_tabs.addRow("Freeze Background Tabs After:", self.freeze_spin)
+        self.discard_spin = QSpinBox()
+        self.discard_spin.setRange(0, 1440)
+        self.discard_spin.setSpecialValueText("Never")
+        self.discard_spin.setSuffix(" min")
+        self.discard_spin.setValue(self.settings_store.value("tab_discard_minutes"))
+        self.discard_spin.valueChanged.connect(lambda v: self.settings_store.setValue("tab_discard_minutes", v))
+        form_tabs.addRow("Unload Background Tabs After:", self.discard_spin)
+        self.memory_spin = QSpinBox()
+        self.memory_spin.setRange(0, 262144)
+        self.memory_spin.setSingleStep(512)
+        self.memory_spin.setSpecialValueText("No Limit")
+        self.memory_spin.setSuffix(" MB")
+        self.memory_spin.setValue(self.settings_store.value("tab_memory_limit_mb"))
+        self.memory_spin.valueChanged.connect(lambda v: self.settings_store.setValue("tab_memory_limit_mb", v))
+        form_tabs.addRow("Unload Tabs Above:", self.memory_spin)
+        self.spare_spin = QSpinBox()
+        self.spare_spin.setRange(0, 4)
+        self.spare_spin.setSpecialValueText("Off")
+        self.spare_spin.setValue(self.settings_store.value("spare_tab_count"))
+        self.spare_spin.valueChanged.connect(lambda v: self.settings_store.setValue("spare_tab_count", v))
+        form_tabs.addRow("Pre-warmed New Tabs:", self.spare_spin)
+        form_tabs.addRow(QLabel("Pinned tabs and tabs playing audio are never put to sleep."))
+        group_tabs.setLayout(form_tabs)
+        layout_adv.addWidget(group_tabs)
+
+        group_lite = QGroupBox("LiteOrbit Processing")
+        form_lite = QFormLayout()
+        self.transform_spin = QSpinBox()
+        self.transform_spin.setRange(0, 8)
+        self.transform_spin.setSpecialValueText("Off")
+        self.transform_spin.setValue(self.settings_store.value("lite_transform_processes"))
+        self.transform_spin.setToolTip("Each process loads its own copy of the browser's Python code and Qt libraries.")
+        self.transform_spin.valueChanged.connect(lambda v: self.settings_store.setValue("lite_transform_processes", v))
+        form_lite.addRow("Transform Processes:", self.transform_spin)
+        form_lite.addRow(QLabel("Large LiteOrbit and Hybrid pages are processed outside the browser,\nso heavy pages never stall scrolling or typing."))
+        group_lite.setLayout(form_lite)
+        layout_adv.addWidget(group_lite)
+
         layout_adv.addStretch()
         self.content_stack.addWidget(tab_adv)
         
@@ -1430,7 +4640,7 @@ class PreferencesDialog(QDialog):
             <p><strong>Engine Architecture:</strong> Dual-Core (Blink/Chromium + LiteOrbit)</p>
             <p><strong>LiteOrbit:</strong> Text-Optimized Renderer with MiniJS</p>
             <p><strong>Security:</strong> Sandboxed Process & Encrypted SQL Storage</p>
-            <p><strong>Internal Pages:</strong> z-orbit://snake, z-orbit://calc, z-orbit://internals, z-orbit://dependencies</p>
+            <p><strong>Internal Pages:</strong> z-orbit://snake, z-orbit://calc, z-orbit://internals, z-orbit://dependencies, z-orbit://storage, z-orbit://stats, z-orbit://tasks</p>
             <br>
             <p style="color: #666;">© 2026 githubuser331. made for lightness.</p>
         </div>
@@ -1471,13 +4681,48 @@ class PreferencesDialog(QDialog):
             DB_CONTROLLER.wipe_history()
             QMessageBox.information(self, "Cleanup Complete", "System has been purged.")
 
+    # Open windows, the download scheduler, the request filter and the data saver follow SETTINGS.changed
     def toggle_bookmarks_setting(self, checked):
         self.settings_store.setValue("show_bookmarks", checked)
-        if self.parent(): self.parent().apply_settings()
 
     def toggle_home_button_setting(self, checked):
         self.settings_store.setValue("show_home_button", checked)
-        if self.parent(): self.parent().apply_settings()
+
+    def update_download_concurrency(self, value):
+        self.settings_store.setValue("max_concurrent_downloads", value)
+
+    def update_global_download_rate(self, value):
+        self.settings_store.setValue("download_rate_global_kb", value)
+
+    def update_content_blocking(self, checked):
+        self.settings_store.setValue("content_blocking", checked)
+
+    def update_data_saver_default(self, checked):
+        self.settings_store.setValue("data_saver_default", checked)
+
+    def refresh_data_saver_rules(self):
+        self.saver_rules_list.clear()
+        for host, flags in sorted(DB_CONTROLLER.fetch_data_saver_rules()):
+            item = QListWidgetItem(f"{host} — {DataSaver.describe(flags)}")
+            item.setData(Qt.ItemDataRole.UserRole, host)
+            self.saver_rules_list.addItem(item)
+
+    def remove_data_saver_rule(self):
+        item = self.saver_rules_list.currentItem()
+        if item is None: return
+        DATA_SAVER.set_rule(item.data(Qt.ItemDataRole.UserRole), None)
+        self.refresh_data_saver_rules()
+
+    def refresh_filter_status(self):
+        self.filter_status.setText(REQUEST_FILTER.status)
+
+    def import_filter_list(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Import Filter List", "", "Filter Lists (*.txt);;All Files (*)")
+        if not path: return
+        try:
+            REQUEST_FILTER.import_list(path)
+        except OSError as error:
+            QMessageBox.warning(self, "Import Filter List", f"Could not import the list: {error}")
 
     def update_cookie_policy(self, checked):
         self.settings_store.setValue("block_3rd_party_cookies", checked)
@@ -1489,34 +4734,240 @@ class PreferencesDialog(QDialog):
         self.settings_store.setValue("proxy_port", port)
         QMessageBox.information(self, "Proxy Updated", "Restart Z-Orbit for network changes to take full effect.")
 
+# --- RESOURCE MONITOR ---
+class ResourceMonitor:
+    def __init__(self):
+        self.cpu_samples = {} # pid -> (monotonic time, cpu seconds) from the previous snapshot
+
+    def cpu_percent(self, pid, now):
+        cpu = ProcessProbe.cpu_seconds(pid)
+        previous = self.cpu_samples.get(pid)
+        self.cpu_samples[pid] = (now, cpu)
+        if not previous or now <= previous[0]: return None
+        return max(0.0, (cpu - previous[1]) / (now - previous[0]) * 100)
+
+    def snapshot(self):
+        # One row per window and tab. Each process is measured once however many tabs share it,
+        # and CPU is the usage since the previous snapshot (None on the first one)
+        now = time.monotonic()
+        processes = {}
+        def measure(pid):
+            if pid and pid not in processes:
+                processes[pid] = (ProcessProbe.rss_bytes(pid), self.cpu_percent(pid, now))
+            return processes.get(pid, (0, None))
+
+        rss, cpu = measure(os.getpid())
+        rows = [{"kind": "browser", "title": f"{APP_NAME} Browser Process", "engine": "—", "pid": os.getpid(),
+                 "rss": rss, "cpu": cpu, "state": f"{threading.active_count()} threads", "window": None, "view": None}]
+        for number, window in enumerate(ZOrbitWindow.open_windows, 1):
+            tab_manager = window.tab_manager
+            rows.append({"kind": "window", "title": f"Window {number}" + (" (Incognito)" if window.is_incognito else ""), "engine": "",
+                         "pid": 0, "rss": 0, "cpu": None, "state": f"{tab_manager.count()} tabs", "window": window, "view": None})
+            for index in range(tab_manager.count()):
+                view = tab_manager.widget(index)
+                row = {"kind": "tab", "title": tab_manager.tabToolTip(index) or tab_manager.tabText(index), "pid": 0, "rss": 0,
+                       "cpu": None, "window": window, "view": view}
+                states = {}
+                # The engine on screen first; others are kept alive for instant switching
+                for engine, engine_view in sorted(view.views.items(), key=lambda item: item[0] != view.engine):
+                    if isinstance(engine_view, LiteOrbitView):
+                        worker_state = "Fetching" if engine_view.worker and engine_view.worker.isRunning() else "Idle"
+                        states[engine] = f"Worker {worker_state} • {DownloadEntryWidget.format_bytes(engine_view.source_size)} document"
+                        continue
+                    page = engine_view.page()
+                    if not row["pid"]:
+                        row["pid"] = page.renderProcessPid()
+                        row["rss"], row["cpu"] = measure(row["pid"])
+                    states[engine] = page.lifecycleState().name + (" • Audible" if page.recentlyAudible() else "")
+                    if engine_view.request_filter.blocked: states[engine] += f" • {engine_view.request_filter.blocked} blocked"
+                    if engine_view.data_saver_flags: states[engine] += " • Data Saver"
+                if states:
+                    engines = list(states)
+                    row["engine"] = " + ".join(engines)
+                    row["state"] = states[engines[0]]
+                else:
+                    row["engine"] = "—"
+                    row["state"] = "Not Loaded"
+                if view.pinned: row["state"] += " • Pinned"
+                rows.append(row)
+
+        sharing = {}
+        for row in rows:
+            if row["kind"] == "tab" and row["pid"]: sharing[row["pid"]] = sharing.get(row["pid"], 0) + 1
+        for row in rows:
+            row["shared"] = sharing.get(row["pid"], 0) if row["kind"] == "tab" else 0
+        self.cpu_samples = {pid: sample for pid, sample in self.cpu_samples.items() if pid in processes}
+        return rows
+
+    @staticmethod
+    def total_rss(rows):
+        return sum({row["pid"]: row["rss"] for row in rows if row["pid"]}.values())
+
+RESOURCE_MONITOR = ResourceMonitor()
+
+class TaskManagerDialog(QDialog):
+    REFRESH_MS = 2000
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Task Manager")
+        self.resize(860, 480)
+        layout = QVBoxLayout(self)
+        self.task_table = QTableWidget()
+        self.task_table.setColumnCount(6)
+        self.task_table.setHorizontalHeaderLabels(["Task", "Engine", "PID", "Memory", "CPU", "State"])
+        self.task_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.task_table.verticalHeader().hide()
+        self.task_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.task_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.task_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.task_table.cellDoubleClicked.connect(lambda row, column: self.switch_to_tab())
+        layout.addWidget(self.task_table)
+
+        control_row = QHBoxLayout()
+        self.summary_label = QLabel()
+        control_row.addWidget(self.summary_label)
+        control_row.addStretch()
+        for label, handler in [("Switch To", self.switch_to_tab), ("Sleep Tab", self.sleep_tab),
+                               ("Close Tab", self.close_tab), ("End Process", self.end_process)]:
+            btn = QPushButton(label)
+            btn.clicked.connect(handler)
+            control_row.addWidget(btn)
+        layout.addLayout(control_row)
+
+        self.rows = []
+        # Only samples while the dialog is on screen
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(self.REFRESH_MS)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        self.refresh()
+        self.refresh_timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+    def selected_task(self):
+        index = self.task_table.currentRow()
+        return self.rows[index] if 0 <= index < len(self.rows) else None
+
+    def refresh(self):
+        selected = self.selected_task()
+        self.rows = RESOURCE_MONITOR.snapshot()
+        self.task_table.setRowCount(len(self.rows))
+        for row_number, row in enumerate(self.rows):
+            memory = DownloadEntryWidget.format_bytes(row["rss"]) if row["rss"] else "—"
+            if row["shared"] > 1: memory += f" (shared ×{row['shared']})"
+            title = row["title"] if row["kind"] != "tab" else "    " + row["title"]
+            values = [title, row["engine"], str(row["pid"] or "—"), memory, "—" if row["cpu"] is None else f"{row['cpu']:.1f}%", row["state"]]
+            # Items are reused between refreshes so a tick only updates text
+            for column, value in enumerate(values):
+                item = self.task_table.item(row_number, column)
+                if item is None:
+                    item = QTableWidgetItem()
+                    self.task_table.setItem(row_number, column, item)
+                item.setText(value)
+            if selected and row["kind"] == selected["kind"] and row["view"] is selected["view"] and row["window"] is selected["window"]:
+                self.task_table.selectRow(row_number)
+        tabs = sum(1 for row in self.rows if row["kind"] == "tab")
+        windows = sum(1 for row in self.rows if row["kind"] == "window")
+        self.summary_label.setText(f"{tabs} tabs in {windows} windows • {DownloadEntryWidget.format_bytes(ResourceMonitor.total_rss(self.rows))} total")
+
+    def switch_to_tab(self):
+        task = self.selected_task()
+        if not task or not task["window"]: return
+        if task["view"] is not None: task["window"].tab_manager.setCurrentWidget(task["view"])
+        task["window"].raise_()
+        task["window"].activateWindow()
+
+    def sleep_tab(self):
+        task = self.selected_task()
+        if task and task["view"] is not None and task["view"].web_views():
+            on_screen = task["window"].get_active_browser().current_view()
+            views = [view for view in task["view"].web_views() if view is not on_screen]
+            if not views:
+                QMessageBox.information(self, "Task Manager", "The tab currently on screen can't be put to sleep.")
+                return
+            for view in views:
+                TAB_LIFECYCLE.settle(view, QWebEnginePage.LifecycleState.Discarded, force=True)
+            self.refresh()
+
+    def close_tab(self):
+        task = self.selected_task()
+        if task and task["view"] is not None:
+            task["window"].remove_tab(task["window"].tab_manager.indexOf(task["view"]))
+            self.refresh()
+
+    def end_process(self):
+        task = self.selected_task()
+        if not task or task["kind"] != "tab" or not task["pid"]: return
+        if task["shared"] > 1 and QMessageBox.question(self, "End Process",
+                f"This process also renders {task['shared'] - 1} other tab(s). End it anyway?") != QMessageBox.StandardButton.Yes:
+            return
+        try:
+            os.kill(task["pid"], getattr(signal, "SIGKILL", signal.SIGTERM))
+        except OSError as error:
+            QMessageBox.warning(self, "End Process", f"Could not end process {task['pid']}: {error}")
+        self.refresh()
+
 class ZOrbitWindow(QMainWindow):
-    def __init__(self, incognito=False):
+    downloads_restored = False
+    open_windows = [] # Every browser window that hasn't been closed, in creation order
+
+    def __init__(self, incognito=False, session=None, urls=None, engine=None):
         super().__init__()
         self.is_incognito = incognito
-        self.settings_manager = QSettings("ZOrbitCorp", "ProMax")
+        # Closed windows are destroyed along with their tabs instead of lingering until garbage collection
+        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        ZOrbitWindow.open_windows.append(self)
+        # Tabs are opened from the event loop so the window shell paints before any engine starts.
+        # Queued first, so the deferred bookmark and download database reads run after them.
+        QTimer.singleShot(0, lambda: self.open_initial_tabs(session, urls, engine))
+        self.settings_manager = SETTINGS
         self.download_dock = DownloadPanel(self)
         self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.download_dock)
         self.download_dock.hide()
         
-        # Setup Profile (Regular or OTR/Incognito)
-        if self.is_incognito:
-            self.profile = QWebEngineProfile("") # Off-the-record
-        else:
-            self.profile = QWebEngineProfile.defaultProfile()
-            
-        # Apply User Agent from settings
-        custom_ua = self.settings_manager.value("custom_user_agent", DEFAULT_USER_AGENT)
-        self.profile.setHttpUserAgent(custom_ua)
-
-        self.profile.downloadRequested.connect(self.initiate_download)
+        self.profile = None # Created by get_profile() when the first Chromium view needs it
+        if not self.is_incognito and not ZOrbitWindow.downloads_restored:
+            ZOrbitWindow.downloads_restored = True
+            QTimer.singleShot(0, self.download_dock.restore_interrupted_downloads)
+        self.bookmark_actions = {} # url -> QAction currently on the bar
+        self.bookmarks_bar_built = False
+        self.dwell_domain = None
+        self.dwell_started = 0.0
+        self.active_tab = None
+        self.session_window_id = session[0][1] if session else None # Assigned on the first journal flush
         self.build_interface()
-        self.add_new_tab(self.get_start_url())
-
+        BOOKMARK_STORE.bookmark_added.connect(self.on_bookmark_added)
+        BOOKMARK_STORE.bookmark_removed.connect(self.on_bookmark_removed)
+        BOOKMARK_STORE.bookmarks_reset.connect(self.refresh_bookmarks_bar)
         # Additional IDE window reference
         self.ide_window = None
+        self.transfer_worker = None
+        self.task_manager = None
+        STARTUP_PROFILE.mark("window shell")
+
+    def open_initial_tabs(self, session, urls, engine):
+        STARTUP_PROFILE.mark("event loop start")
+        if session:
+            self.restore_session_tabs(session)
+        else:
+            for url in urls or [self.get_start_url()]:
+                self.add_new_tab(url, engine)
+        STARTUP_PROFILE.mark("first tab")
+        QTimer.singleShot(0, STARTUP_PROFILE.report) # After the deferred database work queued behind us
+
+    def get_profile(self):
+        if self.profile is None:
+            self.profile = PROFILES.acquire(self) # Shared with the other windows of the same kind
+        return self.profile
 
     def get_start_url(self):
-        return self.settings_manager.value("home_page", DEFAULT_HOME)
+        return self.settings_manager.value("home_page")
 
     def build_interface(self):
         self.setWindowTitle(APP_NAME + (" (Incognito)" if self.is_incognito else ""))
@@ -1544,7 +4995,10 @@ class ZOrbitWindow(QMainWindow):
         separator.setFixedWidth(12)
         self.nav_toolbar.addWidget(separator)
         self.engine_selector = QComboBox()
-        self.engine_selector.addItems(["Chromium (Pro)", "LiteOrbit (Text)"])
+        self.engine_selector.addItems(["Chromium (Pro)", "LiteOrbit (Text)", "Hybrid (Lite + CSS)"])
+        default_engine = self.settings_manager.value("default_engine")
+        if default_engine in ENGINES:
+            self.engine_selector.setCurrentIndex(ENGINES.index(default_engine)) # A LiteOrbit start page never initializes WebEngine
         self.engine_selector.setToolTip("Switch Core Rendering Engine")
         self.engine_selector.setFixedWidth(140)
         self.engine_selector.currentIndexChanged.connect(self.change_engine_core)
@@ -1563,6 +5017,18 @@ class ZOrbitWindow(QMainWindow):
         self.bookmarks_toolbar = QToolBar()
         self.bookmarks_toolbar.setMinimumHeight(30)
         self.bookmarks_toolbar.setStyleSheet("background: #141414; border-bottom: 1px solid #333;")
+        self.bookmarks_separator = self.bookmarks_toolbar.addSeparator()
+        self.bookmarks_overflow_menu = QMenu(self)
+        self.bookmarks_overflow_menu.aboutToShow.connect(self.populate_bookmarks_overflow)
+        self.bookmarks_overflow_btn = QToolButton()
+        self.bookmarks_overflow_btn.setText("»")
+        self.bookmarks_overflow_btn.setToolTip("More Bookmarks")
+        self.bookmarks_overflow_btn.setPopupMode(QToolButton.ToolButtonPopupMode.InstantPopup)
+        self.bookmarks_overflow_btn.setMenu(self.bookmarks_overflow_menu)
+        self.bookmarks_overflow_action = self.bookmarks_toolbar.addWidget(self.bookmarks_overflow_btn)
+        manage_action = QAction("📝 Manage", self)
+        manage_action.triggered.connect(self.launch_bookmarks_manager)
+        self.bookmarks_toolbar.addAction(manage_action)
         main_layout.addWidget(self.bookmarks_toolbar)
         
         self.apply_settings() # Initial application of UI settings
@@ -1573,6 +5039,9 @@ class ZOrbitWindow(QMainWindow):
         self.tab_manager.setMovable(True)
         self.tab_manager.tabCloseRequested.connect(self.remove_tab)
         self.tab_manager.currentChanged.connect(self.on_tab_switch)
+        self.tab_manager.tabBar().setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.tab_manager.tabBar().customContextMenuRequested.connect(self.show_tab_menu)
+        self.tab_manager.tabBar().tabMoved.connect(lambda *args: SESSION_JOURNAL.touch_window(self))
         new_tab_btn = QToolButton()
         new_tab_btn.setText("＋")
         new_tab_btn.setFixedSize(32, 32)
@@ -1585,6 +5054,17 @@ class ZOrbitWindow(QMainWindow):
         self.loading_progress.setFixedSize(160, 8)
         self.app_status.addPermanentWidget(self.loading_progress)
         self.loading_progress.hide()
+        self.shield_button = QToolButton()
+        self.shield_button.setAutoRaise(True)
+        self.shield_button.setToolTip("Blocked ads and trackers, and the data saver for this site")
+        self.shield_button.setPopupMode(QToolButton.ToolButtonPopupMode.InstantPopup)
+        self.shield_menu = QMenu(self)
+        self.shield_menu.aboutToShow.connect(self.build_shield_menu)
+        self.shield_button.setMenu(self.shield_menu)
+        self.app_status.addPermanentWidget(self.shield_button)
+        self.shield_button.hide()
+        DATA_SAVER.rules_changed.connect(self.on_data_saver_rules_changed) # A bound slot is dropped with the window
+        SETTINGS.changed.connect(self.on_setting_changed)
         self.initialize_shortcuts()
 
     def create_nav_button(self, icon, tooltip, func):
@@ -1605,22 +5085,28 @@ class ZOrbitWindow(QMainWindow):
         QShortcut(QKeySequence("F11"), self, self.toggle_fullscreen_mode)
         QShortcut(QKeySequence("F6"), self, lambda: self.omnibox.setFocus())
         QShortcut(QKeySequence("Ctrl+Shift+N"), self, self.launch_incognito)
+        QShortcut(QKeySequence("Shift+Esc"), self, self.launch_task_manager)
+
+    def on_setting_changed(self, key, value):
+        if key in ("show_bookmarks", "show_home_button"):
+            self.apply_settings()
 
     def apply_settings(self):
-        if self.settings_manager.value("show_bookmarks", True, type=bool):
+        if self.settings_manager.value("show_bookmarks"):
             self.bookmarks_toolbar.show()
-            self.refresh_bookmarks_bar()
+            if not self.bookmarks_bar_built:
+                QTimer.singleShot(0, self.refresh_bookmarks_bar) # Reads the database, so not before first paint
         else:
             self.bookmarks_toolbar.hide()
             
-        if self.settings_manager.value("show_home_button", True, type=bool):
+        if self.settings_manager.value("show_home_button"):
             self.btn_home.show()
         else:
             self.btn_home.hide()
 
-    def add_new_tab(self, url=None):
+    def add_new_tab(self, url=None, engine=None):
         if not url:
-            behavior = self.settings_manager.value("new_tab_behavior", "Home Page")
+            behavior = self.settings_manager.value("new_tab_behavior")
             url = self.get_start_url() if behavior == "Home Page" else "about:blank"
 
         # Special Protocol Handling
@@ -1631,59 +5117,59 @@ class ZOrbitWindow(QMainWindow):
             self.ide_window.activateWindow()
             return None
 
-        # Content Generators
+        browser_widget, title = self.create_tab_view(url, engine)
+        index = self.tab_manager.addTab(browser_widget, title)
+        self.tab_manager.setCurrentIndex(index)
         if url.startswith("z-orbit://"):
-            content = ""
-            title = "Z-Orbit Internal"
-            if url == "z-orbit://snake":
-                content = InternalPages.get_snake_game()
-                title = "Snake Game"
-            elif url == "z-orbit://calc":
-                content = InternalPages.get_calculator()
-                title = "Scientific Matrix"
-            elif url == "z-orbit://dependencies":
-                content = InternalPages.get_dependencies()
-                title = "System Dependencies"
-            elif url == "z-orbit://help":
-                content = InternalPages.get_help()
-                title = "Help & Docs"
-            elif url == "z-orbit://offline":
-                content = InternalPages.get_offline_page()
-                title = "System Offline"
-            
-            browser_widget = ChromiumView(self, self.profile)
-            browser_widget.url_updated.connect(lambda q: self.update_address_bar(q, browser_widget))
-            browser_widget.title_updated.connect(lambda t: self.update_tab_title(t, browser_widget))
-            browser_widget.load_progress.connect(self.update_progress_bar)
-            
-            browser_widget.set_content(content)
-            self.update_tab_title(title, browser_widget)
-            
-            index = self.tab_manager.addTab(browser_widget, title)
-            self.tab_manager.setCurrentIndex(index)
             self.omnibox.setText(url)
-            return browser_widget
+        SESSION_JOURNAL.open_tab(self, browser_widget, url)
+        return browser_widget
 
-        current_engine_mode = self.engine_selector.currentText()
-        if "LiteOrbit" in current_engine_mode:
-            browser_widget = LiteOrbitView(self)
-        else:
-            browser_widget = ChromiumView(self, self.profile)
-            
+    def add_popup_tab(self):
+        # Popups always need a Chromium page for WebEngine to load into, whatever the selected engine
+        browser_widget = EngineTab(self, "about:blank", "Chromium")
+        self.connect_tab_view(browser_widget)
+        browser_widget.show_engine("Chromium")
+        index = self.tab_manager.addTab(browser_widget, "New Tab")
+        self.tab_manager.setCurrentIndex(index)
+        SESSION_JOURNAL.open_tab(self, browser_widget, "about:blank")
+        return browser_widget.current_view()
+
+    def create_tab_view(self, url, engine=None):
+        if engine is None:
+            engine = self.selected_engine()
+        browser_widget = EngineTab(self, url, engine)
+        self.connect_tab_view(browser_widget)
+        browser_widget.show_engine(engine)
+        return browser_widget, INTERNAL_SCHEME.title_for(url) if url.startswith("z-orbit://") else "New Tab"
+
+    def connect_tab_view(self, browser_widget):
         browser_widget.url_updated.connect(lambda q: self.update_address_bar(q, browser_widget))
         browser_widget.title_updated.connect(lambda t: self.update_tab_title(t, browser_widget))
         browser_widget.load_progress.connect(self.update_progress_bar)
-        
-        if url != "about:blank":
-            browser_widget.load_url(QUrl(url))
-        
-        index = self.tab_manager.addTab(browser_widget, "New Tab")
-        self.tab_manager.setCurrentIndex(index)
-        return browser_widget
+        SESSION_JOURNAL.watch(browser_widget)
+
+    def restore_session_tabs(self, rows):
+        # Every tab but the active one is left without an engine until it is first shown
+        active_index = 0
+        self.tab_manager.blockSignals(True)
+        for tab_id, window_id, url, title, engine, scroll_x, scroll_y, active, pinned in rows:
+            browser_widget = EngineTab(self, url, engine, title, (scroll_x, scroll_y))
+            browser_widget.session_id = tab_id
+            browser_widget.pinned = bool(pinned)
+            browser_widget.last_active = 0.0
+            self.connect_tab_view(browser_widget)
+            index = self.tab_manager.addTab(browser_widget, "")
+            self.update_tab_title(title or url, browser_widget)
+            if active: active_index = index
+        self.tab_manager.setCurrentIndex(active_index)
+        self.tab_manager.blockSignals(False)
+        self.on_tab_switch(active_index)
 
     def remove_tab(self, index):
         if self.tab_manager.count() > 1:
             widget = self.tab_manager.widget(index)
+            SESSION_JOURNAL.close_tab(self, widget)
             widget.deleteLater()
             self.tab_manager.removeTab(index)
         else:
@@ -1704,7 +5190,7 @@ class ZOrbitWindow(QMainWindow):
             return
 
         if "." not in input_text or " " in input_text:
-            engine_pref = self.settings_manager.value("search_engine", "Google")
+            engine_pref = self.settings_manager.value("search_engine")
             search_urls = {
                 "Google": "https://www.google.com/search?q=",
                 "Bing": "https://www.bing.com/search?q=",
@@ -1724,22 +5210,14 @@ class ZOrbitWindow(QMainWindow):
 
     def change_engine_core(self):
         current_browser = self.get_active_browser()
-        if current_browser:
-            url = current_browser.get_url()
-            self.load_in_correct_engine(url)
+        if current_browser is not None:
+            engine = self.selected_engine()
+            current_browser.show_engine(engine)
+            self.sync_engine_selector()
 
     def load_in_correct_engine(self, url):
-        current_browser = self.get_active_browser()
-        selected_mode = self.engine_selector.currentText()
-        is_lite_instance = isinstance(current_browser, LiteOrbitView)
-        wants_lite = "LiteOrbit" in selected_mode
-        
-        if is_lite_instance != wants_lite:
-            idx = self.tab_manager.currentIndex()
-            self.remove_tab(idx)
-            self.add_new_tab(url.toString())
-        else:
-            current_browser.load_url(url)
+        engine = self.selected_engine()
+        self.get_active_browser().show_engine(engine, url)
 
     def navigate_back(self): self.get_active_browser().go_back()
     def navigate_forward(self): self.get_active_browser().go_forward()
@@ -1751,8 +5229,6 @@ class ZOrbitWindow(QMainWindow):
             if qurl.toString() == "about:blank": return
             
             url_str = qurl.toString()
-            if url_str.startswith("data:") or "html" in url_str: return
-                
             self.omnibox.setText(url_str)
             if self.is_incognito:
                 self.omnibox.setStyleSheet("border: 1px solid #9b59b6; border-radius: 6px; padding: 8px; color: #fff;")
@@ -1764,18 +5240,80 @@ class ZOrbitWindow(QMainWindow):
                 self.omnibox.setStyleSheet("border: 1px solid #444; border-radius: 6px; padding: 8px;")
             
             if qurl.scheme().startswith("http") and not self.is_incognito:
-                DB_CONTROLLER.add_history_entry(sender_widget.get_title(), url_str)
+                DB_CONTROLLER.add_history_entry(sender_widget.get_title(), url_str, sender_widget.engine)
+            self.update_dwell_tracking()
+            self.update_shield(sender_widget)
+
+    def update_dwell_tracking(self):
+        # Credits foreground time to the active tab's domain for z-orbit://stats
+        now = time.monotonic()
+        if self.dwell_domain:
+            DB_CONTROLLER.add_domain_time(self.dwell_domain, now - self.dwell_started)
+        self.dwell_domain = None
+        self.dwell_started = now
+        if self.is_incognito or not self.isActiveWindow(): return
+        browser = self.get_active_browser()
+        if browser is not None:
+            url = browser.get_url().toString()
+            if url.startswith("http"):
+                self.dwell_domain = DatabaseController.domain_of(url)
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.Type.ActivationChange:
+            self.update_dwell_tracking()
+        super().changeEvent(event)
+
+    def closeEvent(self, event):
+        self.update_dwell_tracking()
+        self.dwell_domain = None
+        # Closing one of several windows drops it from the session; the last window is kept for restore
+        others = [w for w in ZOrbitWindow.open_windows if w is not self and not w.is_incognito]
+        if others:
+            SESSION_JOURNAL.close_window(self)
+        else:
+            SESSION_JOURNAL.flush()
+        if self in ZOrbitWindow.open_windows:
+            ZOrbitWindow.open_windows.remove(self)
+        PROFILES.release(self)
+        super().closeEvent(event)
 
     def update_tab_title(self, title, sender_widget):
         idx = self.tab_manager.indexOf(sender_widget)
         if idx != -1:
             display_title = title[:20]
             if self.is_incognito: display_title = "🕵 " + display_title
+            if sender_widget.pinned: display_title = "📌 " + display_title
             self.tab_manager.setTabText(idx, display_title)
             self.tab_manager.setTabToolTip(idx, title)
             if sender_widget == self.get_active_browser():
                 self.setWindowTitle(f"{title} - {APP_NAME}" + (" (Incognito)" if self.is_incognito else ""))
 
+    def on_tab_lifecycle_changed(self, tab):
+        idx = self.tab_manager.indexOf(tab)
+        if idx != -1:
+            # Sleeping tabs are dimmed; an invalid colour restores the default
+            self.tab_manager.tabBar().setTabTextColor(idx, QColor("#666") if tab.is_sleeping() else QColor())
+
+    def show_tab_menu(self, pos):
+        idx = self.tab_manager.tabBar().tabAt(pos)
+        if idx == -1: return
+        view = self.tab_manager.widget(idx)
+        menu = QMenu(self)
+        menu.addAction("Unpin Tab" if view.pinned else "Pin Tab", lambda: self.toggle_tab_pin(view))
+        sleepable = [web_view for web_view in view.web_views() if web_view is not self.get_active_browser().current_view()
+                     and web_view.page().lifecycleState() != QWebEnginePage.LifecycleState.Discarded]
+        discard_action = menu.addAction("Sleep Tab", lambda: [TAB_LIFECYCLE.settle(web_view, QWebEnginePage.LifecycleState.Discarded, force=True)
+                                                              for web_view in sleepable])
+        discard_action.setEnabled(bool(sleepable))
+        menu.addSeparator()
+        menu.addAction("Close Tab", lambda: self.remove_tab(self.tab_manager.indexOf(view)))
+        menu.exec(self.tab_manager.tabBar().mapToGlobal(pos))
+
+    def toggle_tab_pin(self, view):
+        view.pinned = not view.pinned
+        SESSION_JOURNAL.touch_window(self)
+        self.update_tab_title(self.tab_manager.tabToolTip(self.tab_manager.indexOf(view)) or view.get_title() or "New Tab", view)
+
     def update_progress_bar(self, progress):
         self.loading_progress.setValue(progress)
         if progress == 100:
@@ -1786,25 +5324,97 @@ class ZOrbitWindow(QMainWindow):
             self.app_status.showMessage(f"Loading... {progress}%")
 
     def on_tab_switch(self, idx):
-        if self.get_active_browser():
-            current_url = self.get_active_browser().get_url().toString()
-            if not current_url.startswith("data:"):
-                self.omnibox.setText(current_url)
+        SESSION_JOURNAL.touch_window(self)
+        self.update_dwell_tracking()
+        # last_active marks when a tab was last in the foreground, for TabLifecycleManager
+        now = time.monotonic()
+        if self.active_tab is not None: self.active_tab.stamp(now)
+        self.active_tab = self.get_active_browser()
+        if self.active_tab is not None:
+            self.active_tab.activate()
+            self.active_tab.stamp(now)
+        if self.get_active_browser() is not None:
+            self.omnibox.setText(self.get_active_browser().get_url().toString())
             
             self.setWindowTitle(f"{self.get_active_browser().get_title()} - {APP_NAME}" + (" (Incognito)" if self.is_incognito else ""))
-            self.engine_selector.blockSignals(True)
-            if isinstance(self.get_active_browser(), LiteOrbitView):
-                self.engine_selector.setCurrentIndex(1)
-            else:
-                self.engine_selector.setCurrentIndex(0)
-            self.engine_selector.blockSignals(False)
+            self.sync_engine_selector()
+            self.update_shield(self.get_active_browser())
+
+    def update_shield(self, tab):
+        if tab is None or tab is not self.get_active_browser(): return
+        stats = tab.request_filter()
+        if stats is None or not tab.get_url().scheme().startswith("http"):
+            self.shield_button.hide()
+            return
+        parts = []
+        if stats.blocked: parts.append(f"{stats.blocked} blocked")
+        if stats.held_back: parts.append(f"{stats.held_back} held back")
+        if stats.saved_bytes: parts.append(f"~{DownloadEntryWidget.format_bytes(stats.saved_bytes)} saved")
+        saver = " ⚡" if DATA_SAVER.flags_for(tab.get_url().host()) else ""
+        self.shield_button.setText("🛡" + saver + (" " + " • ".join(parts) if parts else ""))
+        self.shield_button.show()
+
+    def build_shield_menu(self):
+        self.shield_menu.clear()
+        tab = self.get_active_browser()
+        host = tab.get_url().host() if tab is not None else ""
+        if not host: return
+        flags = DATA_SAVER.flags_for(host)
+        own_rule = DATA_SAVER.rule_for(host) is not None
+        self.shield_menu.addSection(f"Data Saver for {host}")
+        for flag, label in DataSaver.LABELS:
+            action = self.shield_menu.addAction(f"Block {label}")
+            action.setCheckable(True)
+            action.setChecked(bool(flags & flag))
+            action.setEnabled(not self.is_incognito) # Site rules are stored on disk and would record the host
+            action.toggled.connect(lambda checked, flag=flag: self.set_data_saver_rule(host, flags ^ flag))
+        self.shield_menu.addSeparator()
+        default_action = self.shield_menu.addAction("Use Default for This Site", lambda: self.set_data_saver_rule(host, None))
+        default_action.setEnabled(own_rule and not self.is_incognito)
+        if self.is_incognito: self.shield_menu.addAction("Site rules cannot be changed in Incognito").setEnabled(False)
+
+    def on_data_saver_rules_changed(self):
+        self.update_shield(self.get_active_browser())
+
+    def set_data_saver_rule(self, host, flags):
+        if self.is_incognito: return
+        DATA_SAVER.set_rule(host, flags)
+        tab = self.get_active_browser()
+        if tab is not None and tab.get_url().host() == host:
+            tab.reload_page() # Settings are applied again when the reload navigates
+
+    def selected_engine(self):
+        return ENGINES[self.engine_selector.currentIndex()]
+
+    def sync_engine_selector(self):
+        self.engine_selector.blockSignals(True)
+        self.engine_selector.setCurrentIndex(ENGINES.index(self.get_active_browser().engine))
+        self.engine_selector.blockSignals(False)
 
     def initiate_download(self, item):
-        self.download_dock.show()
-        self.download_dock.register_download(item)
-        saved_path = self.settings_manager.value("download_path", QStandardPaths.writableLocation(QStandardPaths.StandardLocation.DownloadLocation))
+        # Large plain HTTP(S) files go through the parallel, resumable engine instead
+        if (item.url().scheme() in ("http", "https") and item.totalBytes() >= SEGMENTED_DOWNLOAD_THRESHOLD
+                and not item.isSavePageDownload() and self.settings_manager.value("segmented_downloads")):
+            item.cancel()
+            self.start_segmented_download(item.url().toString(), item.downloadFileName())
+            return
+        saved_path = self.settings_manager.download_path()
         item.setDownloadDirectory(saved_path)
+        # WebEngine only allows accepting inside this handler, so a download without
+        # a free slot is accepted paused and resumed by the scheduler later
         item.accept()
+        if not self.download_dock.scheduler.has_free_slot():
+            item.pause()
+        self.download_dock.show()
+        self.download_dock.register_download(item, item.resume)
+
+    def start_segmented_download(self, url, file_name=""):
+        saved_path = self.settings_manager.download_path()
+        download = SegmentedDownload(url, saved_path, file_name, self.settings_manager.value("custom_user_agent"),
+                                     persistent=not self.is_incognito)
+        download.setParent(self.download_dock)
+        self.download_dock.show()
+        self.download_dock.register_download(download, download.accept)
 
     def toggle_download_dock(self):
         if self.download_dock.isVisible():
@@ -1818,32 +5428,72 @@ class ZOrbitWindow(QMainWindow):
             return
             
         curr = self.get_active_browser()
-        if curr:
-            if DB_CONTROLLER.save_bookmark(curr.get_title(), curr.get_url().toString()):
-                self.refresh_bookmarks_bar()
+        if curr is not None:
+            if BOOKMARK_STORE.add(curr.get_title(), curr.get_url().toString()):
                 self.app_status.showMessage("Bookmark Saved!", 2000)
             else:
                 self.app_status.showMessage("Bookmark already exists.", 2000)
 
     def refresh_bookmarks_bar(self):
-        self.bookmarks_toolbar.clear()
-        if not self.settings_manager.value("show_bookmarks", True, type=bool):
-            self.bookmarks_toolbar.hide()
+        # Full rebuild, only needed on first show and after a bulk reload of the store
+        for action in self.bookmark_actions.values():
+            self.bookmarks_toolbar.removeAction(action)
+            action.deleteLater()
+        self.bookmark_actions = {}
+        for title, url in BOOKMARK_STORE.all()[:BOOKMARK_BAR_LIMIT]:
+            self.insert_bookmark_action(title, url)
+        self.bookmarks_bar_built = True
+        self.update_bookmarks_overflow()
+
+    def create_bookmark_action(self, title, url, parent):
+        action = QAction(title, parent)
+        action.setToolTip(f"{title}\n{url}")
+        action.triggered.connect(lambda chk, u=url: self.add_new_tab(u))
+        return action
+
+    def insert_bookmark_action(self, title, url):
+        action = self.create_bookmark_action(title, url, self)
+        self.bookmarks_toolbar.insertAction(self.bookmarks_separator, action)
+        self.bookmark_actions[url] = action
+
+    def on_bookmark_added(self, title, url):
+        if not self.bookmarks_bar_built: return
+        if len(self.bookmark_actions) < BOOKMARK_BAR_LIMIT:
+            self.insert_bookmark_action(title, url)
+        self.update_bookmarks_overflow()
+
+    def on_bookmark_removed(self, url):
+        if not self.bookmarks_bar_built: return
+        action = self.bookmark_actions.pop(url, None)
+        if action:
+            self.bookmarks_toolbar.removeAction(action)
+            action.deleteLater()
+            # Promote the first overflow entry so the bar stays full
+            for title, other_url in BOOKMARK_STORE.all():
+                if other_url not in self.bookmark_actions:
+                    self.insert_bookmark_action(title, other_url)
+                    break
+        self.update_bookmarks_overflow()
+
+    def update_bookmarks_overflow(self):
+        overflow_count = BOOKMARK_STORE.count() - len(self.bookmark_actions)
+        self.bookmarks_overflow_btn.setText(f"» {overflow_count}")
+        self.bookmarks_overflow_action.setVisible(overflow_count > 0)
+
+    def populate_bookmarks_overflow(self):
+        # Built on demand each time it opens, so overflow entries cost nothing until viewed
+        menu = self.bookmarks_overflow_menu
+        menu.clear()
+        overflow = [(t, u) for t, u in BOOKMARK_STORE.all() if u not in self.bookmark_actions]
+        if len(overflow) <= BOOKMARK_FOLDER_SIZE:
+            for title, url in overflow:
+                menu.addAction(self.create_bookmark_action(title, url, menu))
             return
-        else:
-            self.bookmarks_toolbar.show()
-        bookmarks = DB_CONTROLLER.fetch_bookmarks()
-        
-        for title, url in bookmarks:
-            action = QAction(title, self) 
-            action.setToolTip(f"{title}\n{url}")
-            action.triggered.connect(lambda chk, u=url: self.add_new_tab(u))
-            self.bookmarks_toolbar.addAction(action)
-            
-        self.bookmarks_toolbar.addSeparator()
-        manage_action = QAction("📝 Manage", self)
-        manage_action.triggered.connect(self.launch_bookmarks_manager)
-        self.bookmarks_toolbar.addAction(manage_action)
+        for start in range(0, len(overflow), BOOKMARK_FOLDER_SIZE):
+            chunk = overflow[start:start + BOOKMARK_FOLDER_SIZE]
+            folder = menu.addMenu(f"📁 {chunk[0][0][:15]} … {chunk[-1][0][:15]}")
+            for title, url in chunk:
+                folder.addAction(self.create_bookmark_action(title, url, folder))
 
     def launch_history(self):
         if self.is_incognito: return
@@ -1852,17 +5502,65 @@ class ZOrbitWindow(QMainWindow):
     def launch_settings(self):
         SettingsDialog = PreferencesDialog(self)
         SettingsDialog.exec()
-        self.apply_settings()
+
+    def launch_task_manager(self):
+        if not self.task_manager:
+            self.task_manager = TaskManagerDialog(self)
+        self.task_manager.show()
+        self.task_manager.raise_()
 
     def launch_bookmarks_manager(self):
         BookmarksManagerDialog(self).exec()
 
+    def launch_data_import(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Import Bookmarks & History", "", "Bookmark/History Files (*.html *.htm *.json *.csv)")
+        if path: self.start_data_transfer("import", path)
+
+    def launch_data_export(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export Bookmarks & History", "zorbit_export.json", "JSON (*.json);;CSV (*.csv);;Netscape Bookmarks (*.html)")
+        if path: self.start_data_transfer("export", path)
+
+    def start_data_transfer(self, mode, path):
+        if self.transfer_worker and self.transfer_worker.isRunning():
+            self.app_status.showMessage("A transfer is already running.", 3000)
+            return
+        verb = "Importing" if mode == "import" else "Exporting"
+        self.transfer_worker = DataTransferWorker(mode, path)
+        self.transfer_worker.progress_changed.connect(lambda n: self.app_status.showMessage(f"{verb}... {n:,} rows"))
+        self.transfer_worker.transfer_finished.connect(lambda msg: self.on_data_transfer_finished(mode, msg))
+        self.transfer_worker.transfer_failed.connect(lambda err: QMessageBox.warning(self, "Transfer Failed", err))
+        self.transfer_worker.start()
+
+    def on_data_transfer_finished(self, mode, message):
+        if mode == "import":
+            BOOKMARK_STORE.reload()
+        self.app_status.showMessage(message, 5000)
+
     def launch_incognito(self):
-        self.incognito_window = ZOrbitWindow(incognito=True)
-        self.incognito_window.show()
+        ZOrbitWindow(incognito=True).show() # Kept alive by open_windows until closed
+
+    @staticmethod
+    def open_launch(launch):
+        # Command line URLs open as tabs of the most recent window; without any, or for
+        # incognito, the launch gets a window of its own
+        engine = "LiteOrbit" if launch["lite"] else None
+        window = None
+        if launch["urls"] and not launch["incognito"]:
+            window = next((window for window in reversed(ZOrbitWindow.open_windows) if not window.is_incognito), None)
+        if window is None:
+            ZOrbitWindow(incognito=launch["incognito"], urls=launch["urls"], engine=engine).show()
+            return
+        for url in launch["urls"]:
+            window.add_new_tab(url, engine)
+        window.setWindowState(window.windowState() & ~Qt.WindowState.WindowMinimized)
+        window.raise_()
+        window.activateWindow()
 
     def reboot_application(self):
-        os.execv(sys.executable, ['python'] + sys.argv)
+        SESSION_JOURNAL.flush()
+        SETTINGS.flush() # exec skips aboutToQuit, so a pending debounced write would be lost
+        arguments = sys.argv if "--restore-session" in sys.argv else sys.argv + ["--restore-session"]
+        os.execv(sys.executable, ['python'] + arguments)
 
     def trigger_main_menu(self):
         menu = QMenu(self)
@@ -1873,6 +5571,9 @@ class ZOrbitWindow(QMainWindow):
         menu.addAction("History", self.launch_history)
         menu.addAction("Bookmarks Manager", self.launch_bookmarks_manager)
         menu.addAction("Downloads", self.toggle_download_dock)
+        menu.addAction("Task Manager", self.launch_task_manager)
+        menu.addAction("Import Bookmarks && History...", self.launch_data_import)
+        menu.addAction("Export Bookmarks && History...", self.launch_data_export)
         menu.addAction("Settings", self.launch_settings)
         menu.addSeparator()
         menu.addAction("🔄 Restart App", self.reboot_application)
@@ -1887,9 +5588,77 @@ class ZOrbitWindow(QMainWindow):
             self.showFullScreen()
             self.nav_toolbar.hide()
 
+# --- INSTANCE SERVER ---
+class InstanceListener(QObject):
+    # Receives the launches forward_launch() sends: one JSON line per connection, answered with "ok"
+    launch_received = pyqtSignal(dict)
+
+    def __init__(self):
+        super().__init__()
+        self.server = QLocalServer(self)
+        self.server.newConnection.connect(self.accept_connections)
+
+    def listen(self):
+        if self.server.listen(INSTANCE_NAME): return
+        probe = QLocalSocket()
+        probe.connectToServer(INSTANCE_NAME)
+        if probe.waitForConnected(INSTANCE_TIMEOUT_MS):
+            # Another instance came up while this one was starting; it keeps the name
+            probe.disconnectFromServer()
+            return
+        # Left behind by an instance that crashed
+        QLocalServer.removeServer(INSTANCE_NAME)
+        self.server.listen(INSTANCE_NAME)
+
+    def accept_connections(self):
+        while self.server.hasPendingConnections():
+            connection = self.server.nextPendingConnection()
+            connection.readyRead.connect(self.read_launch)
+            connection.disconnected.connect(connection.deleteLater)
+
+    def read_launch(self):
+        connection = self.sender()
+        if not connection.canReadLine(): return
+        try:
+            launch = json.loads(connection.readLine().data())
+        except ValueError:
+            connection.disconnectFromServer()
+            return
+        connection.write(b"ok\n")
+        connection.flush()
+        self.launch_received.emit(launch)
+
+class InstanceServer(QThread):
+    # Runs the listener on its own event loop, so a second launch is answered even while this
+    # instance is still restoring its session. The launch itself is queued to the GUI thread
+    # and opens once its event loop runs, after the windows exist.
+    launch_received = pyqtSignal(dict)
+
+    def run(self):
+        listener = InstanceListener()
+        listener.launch_received.connect(self.launch_received)
+        listener.listen()
+        self.exec()
+        listener.server.close()
+
+    def stop(self):
+        self.quit()
+        self.wait()
+
+INSTANCE_SERVER = InstanceServer()
+
+STARTUP_PROFILE.mark("module setup")
+
 if __name__ == "__main__":
     os.environ["QT_AUTO_SCREEN_SCALE_FACTOR"] = "1"
+    InternalSchemeHandler.register_scheme()
+    HybridSchemeHandler.register_scheme()
     application = QApplication(sys.argv)
+    if "--new-instance" not in sys.argv:
+        # Listening before the session loads keeps the window in which a second launch misses us short
+        INSTANCE_SERVER.launch_received.connect(ZOrbitWindow.open_launch)
+        INSTANCE_SERVER.start()
+        application.aboutToQuit.connect(INSTANCE_SERVER.stop)
     application.setApplicationName(APP_NAME)
     application.setOrganizationName("Z-Orbit Corp")
     application.setStyle("Fusion")
@@ -1897,6 +5666,20 @@ if __name__ == "__main__":
     app_font.setPointSize(10)
     app_font.setFamily("Segoe UI")
     QApplication.setFont(app_font)
-    main_window = ZOrbitWindow()
-    main_window.show()
+    STARTUP_PROFILE.mark("qapplication")
+    launch = parse_launch(sys.argv)
+    restore_session = ("--restore-session" in sys.argv
+                       or SETTINGS.value("startup_behavior") == "Restore Previous Session")
+    sessions = SESSION_JOURNAL.load(restore_session)
+    for session in sessions:
+        main_window = ZOrbitWindow(session=session)
+        main_window.show()
+    if launch["urls"] or launch["incognito"] or not sessions:
+        ZOrbitWindow.open_launch(launch)
+    RETENTION_JOB.start()
+    STATS_BACKFILL.start()
+    TAB_LIFECYCLE.start()
+    application.aboutToQuit.connect(STATS_BACKFILL.stop)
+    application.aboutToQuit.connect(LITE_TRANSFORM_POOL.shutdown)
+    application.aboutToQuit.connect(SETTINGS.flush)
     sys.exit(application.exec())
\ No newline at end of file